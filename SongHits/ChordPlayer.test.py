@@ -0,0 +1,181 @@
+import asyncio
+import selectors
+import unittest
+
+import song
+from playback import ChordPlayer
+
+class VirtualClockSelector(selectors.DefaultSelector):
+    """Selector that moves the clock of its loop instead of waiting"""
+    def __init__(self, loop: 'VirtualClockLoop'):
+        super().__init__()
+        self.loop = loop
+
+    def select(self, timeout: float=None):
+        events = super().select(0)
+
+        if len(events) == 0 and timeout is not None and timeout > 0:
+            self.loop.now += timeout
+
+        return events
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock only moves when the loop would sleep
+
+    Tests using it do not depend on how fast (or loaded) the machine is.
+    """
+    def __init__(self):
+        self.now = 0.0
+        super().__init__(selector=VirtualClockSelector(self))
+
+    def time(self) -> float:
+        return self.now
+
+class ChordPlayerTestCase(unittest.TestCase):
+    def setUp(self):
+        # 10 beats per second, so each chord of 1 beat lasts 0.1 s
+        self.song_obj = song.Song('Test Song', 'Nobody')
+        self.song_obj.bpm = 600
+        self.song_obj._load_lyrics([
+            {'tag': 'Verse', 'text': '1 1\nLa la\n1 2\nOh oh\n', 'chords': 'C G Am F'},
+        ])
+        self.played = []
+        self.loop = VirtualClockLoop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def make_player(self, **kwargs) -> ChordPlayer:
+        return ChordPlayer(self.song_obj, on_chord=self.on_chord, **kwargs)
+
+    def on_chord(self, idx: int, chord_name: str):
+        self.played += [(idx, chord_name, self.loop.time())]
+
+    def run_player(self, player: ChordPlayer, control=None, autoplay: bool=True):
+        async def runner():
+            task = asyncio.create_task(player.run(autoplay=autoplay))
+
+            if control is not None:
+                await control(player)
+
+            await task
+
+        self.loop.run_until_complete(runner())
+
+    def assertTimes(self, expected: list[float]):
+        self.assertEqual(len(self.played), len(expected))
+        for (_, _, t), expected_t in zip(self.played, expected):
+            self.assertAlmostEqual(t, expected_t)
+
+class ChordPlayer_RunTest(ChordPlayerTestCase):
+    def test_basic(self):
+        player = self.make_player()
+        self.run_player(player)
+
+        self.assertEqual([(x, y) for x, y, _ in self.played], [(0, 'C'), (1, 'G'), (2, 'Am'), (3, 'F')])
+        self.assertTimes([0.0, 0.1, 0.2, 0.3])
+        self.assertFalse(player.is_playing)
+        self.assertAlmostEqual(player.position, 5.0)
+        self.assertAlmostEqual(player.max_lateness, 0.0)
+
+    def test_drift(self):
+        def blocking_chord(idx: int, chord_name: str):
+            self.on_chord(idx, chord_name)
+            if idx == 0:
+                # Block the event loop for most of the first chord
+                self.loop.now += 0.08
+            elif idx == 1:
+                # Block it past the start of the next chord
+                self.loop.now += 0.15
+
+        self.run_player(ChordPlayer(self.song_obj, on_chord=blocking_chord))
+
+        # The late chord is played right away and the next one is on time
+        self.assertTimes([0.0, 0.1, 0.25, 0.3])
+
+    def test_tempoScale(self):
+        player = self.make_player(tempo_scale=2.0)
+        self.run_player(player)
+
+        self.assertTimes([0.0, 0.05, 0.1, 0.15])
+
+        with self.assertRaises(ValueError):
+            player.set_tempo_scale(0)
+
+    def test_tempoChange(self):
+        async def control(player: ChordPlayer):
+            await asyncio.sleep(0.15)
+            player.set_tempo_scale(0.5)
+
+        self.run_player(self.make_player(), control)
+
+        # The position at 0.15 s (1.5 beats) is kept, then beats last 0.2 s
+        self.assertTimes([0.0, 0.1, 0.25, 0.45])
+
+    def test_lyricsOrder(self):
+        self.song_obj._load_lyrics([
+            {'tag': 'Verse', 'text': '1 1\nLa la\n', 'chords': 'C G'},
+            {'tag': 'Chorus', 'text': '1\nOh\n', 'chords': 'F'},
+        ])
+        self.song_obj.lyrics_order = ['Chorus', 'Verse', 'Chorus']
+        self.run_player(self.make_player())
+
+        self.assertEqual([(x, y) for x, y, _ in self.played], [(0, 'F'), (1, 'C'), (2, 'G'), (3, 'F')])
+        self.assertTimes([0.0, 0.1, 0.2, 0.3])
+
+class ChordPlayer_ControlTest(ChordPlayerTestCase):
+    def test_pause(self):
+        async def control(player: ChordPlayer):
+            await asyncio.sleep(0.05)
+            player.pause()
+            await asyncio.sleep(0.2)
+            self.assertEqual(len(self.played), 1)
+            player.play()
+
+        self.run_player(self.make_player(), control)
+
+        self.assertTimes([0.0, 0.3, 0.4, 0.5])
+
+    def test_seek(self):
+        async def control(player: ChordPlayer):
+            await asyncio.sleep(0.05)
+            player.seek(3)
+
+        self.run_player(self.make_player(), control)
+
+        self.assertEqual([x for x, _, _ in self.played], [0, 3])
+        self.assertTimes([0.0, 0.05])
+
+    def test_seekTime(self):
+        async def control(player: ChordPlayer):
+            await asyncio.sleep(0.05)
+            player.seek_time(0.25)
+
+        self.run_player(self.make_player(), control)
+
+        self.assertEqual([x for x, _, _ in self.played], [0, 2, 3])
+        self.assertTimes([0.0, 0.05, 0.15])
+
+    def test_stop(self):
+        async def control(player: ChordPlayer):
+            await asyncio.sleep(0.15)
+            player.stop()
+
+        self.run_player(self.make_player(), control)
+
+        self.assertEqual([x for x, _, _ in self.played], [0, 1])
+
+    def test_noAutoplay(self):
+        async def control(player: ChordPlayer):
+            await asyncio.sleep(0.1)
+            self.assertEqual(self.played, [])
+            player.seek(2)
+            player.play()
+
+        self.run_player(self.make_player(), control, autoplay=False)
+
+        self.assertEqual([x for x, _, _ in self.played], [2, 3])
+        self.assertTimes([0.1, 0.2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -451,5 +451,23 @@ class ChordedInstrument_ChordNotesTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.ci_std.get_chord_notes('Cmaj7b9')
 
+class ChordedInstrument_NoteIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.ci_std = uke.ChordedInstrument()
+
+    def test_basic(self):
+        self.assertEqual(self.ci_std.get_note_index('A'), 0)
+        self.assertEqual(self.ci_std.get_note_index('C'), 3)
+        self.assertEqual(self.ci_std.get_note_index('G#'), 11)
+        self.assertEqual(self.ci_std.get_note_index('Ab'), 11)
+        self.assertEqual(self.ci_std.get_note_index('B#'), 3)
+
+    def test_raises(self):
+        with self.assertRaises(ValueError):
+            self.ci_std.get_note_index('H')
+
+        with self.assertRaises(ValueError):
+            self.ci_std.get_note_index('Am')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -34,6 +34,18 @@ class ChordedLyricSegment_InitTest(unittest.TestCase):
         self.assertEqual(obj_a.text, ['Pahiwatig', 'Sana \'di magbago ang pagtingin', 'Pahiwatig', 'Sana \'di magbago ang pagtingin'])
         self.assertEqual(obj_a.chords, ['A', 'E', 'C#m', 'B', 'A', 'E', 'C#m', 'B'])
 
+    def test_chordAnnotations(self):
+        text_in = textwrap.dedent("""\
+           2      2      4
+        Suiran wo hen ai ni
+        8
+        Wo mei fenfa gaosu ni
+        """)
+
+        obj_a = song.ChordedLyricSegment('Verse', text_in, chords='Db Eb Fm Db')
+        self.assertEqual(obj_a.chord_annotations, ['   2      2      4', '8'])
+        self.assertFalse(hasattr(obj_a, '__dict__'))
+
 
 class ChordedLyricSegment_LenTest(unittest.TestCase):
     def test_basic(self):
@@ -168,6 +180,48 @@ class ChordedLyricSegment_StrTest(unittest.TestCase):
         self.assertEqual(str(obj_a), text_out)
 
 
+    def test_longChords(self):
+        text_in = textwrap.dedent("""\
+            4                    4
+        The love that we came to know
+                     4     4   4
+        They call it Xanadu
+        """)
+
+        text_out = textwrap.dedent("""\
+        [Verse I]
+            G#7                  C#m
+        The love that we came to know
+                     Edim  F#m B7
+        They call it Xanadu
+        """).rstrip('\r\n')
+
+        obj_a = song.ChordedLyricSegment('Verse I', text_in, chords='G#7 C#m\nEdim F#m B7')
+        self.assertEqual(str(obj_a), text_out)
+
+    def test_overlappingChords(self):
+        text_in = textwrap.dedent("""\
+        4 4
+        La la
+        """)
+
+        obj_a = song.ChordedLyricSegment('Verse', text_in, chords='C#m7 Bsus')
+        self.assertEqual(str(obj_a), '[Verse]\nC#m7 Bsus\nLa la')
+
+
+    def test_stanzaBreak(self):
+        text_in = textwrap.dedent("""\
+        4
+        La la
+
+
+        4
+        Oh oh
+        """)
+
+        obj_a = song.ChordedLyricSegment('Verse', text_in, chords='C G')
+        self.assertEqual(list(obj_a.entries()), [('La la', [('C', 0, 4)]), ('', []), ('Oh oh', [('G', 0, 4)])])
+
 class ChordedLyricSegment_EntriesTest(unittest.TestCase):
     def test_singleLinePt1(self):
         text_in = textwrap.dedent("""\
@@ -0,0 +1,395 @@
+import unittest
+import unittest.mock
+import tempfile
+import textwrap
+import os
+from pathlib import Path
+
+import song
+
+CHORD_FILES = Path(__file__).resolve().parent.parent / 'ChordFiles'
+
+class Song_HeaderTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_song(self, text: str) -> str:
+        file_path = os.path.join(self.tmp_dir.name, 'song.crd.yaml')
+        with open(file_path, 'w', encoding='utf-8') as fh:
+            fh.write(textwrap.dedent(text))
+
+        return file_path
+
+    def test_basic(self):
+        obj_a = song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml')
+
+        self.assertEqual(obj_a.title, 'Xanadu')
+        self.assertEqual(obj_a.artist, 'Electric Light Orchestra')
+        self.assertEqual(obj_a.bpm, 128)
+        self.assertEqual(obj_a.global_semitones, 0)
+        self.assertEqual(obj_a.time_sig, (4, 4))
+        self.assertEqual(str(obj_a), '"Xanadu" - by Electric Light Orchestra')
+
+    def test_anyKeyOrder(self):
+        file_path = self.write_song("""\
+        time_signature: [3, 4]
+        semitones: -2
+        artist: 'Someone''s Band'
+        bpm: 90
+        title: "Waltz: Part 1"
+        lyrics:
+          - tag: Verse
+            chords: C
+            text: |2
+              4
+              La la la
+        """)
+
+        obj_a = song.Song.from_filename(file_path)
+
+        self.assertEqual(obj_a.title, 'Waltz: Part 1')
+        self.assertEqual(obj_a.artist, 'Someone\'s Band')
+        self.assertEqual(obj_a.bpm, 90)
+        self.assertEqual(obj_a.global_semitones, -2)
+        self.assertEqual(obj_a.time_sig, (3, 4))
+
+    def test_stopsAtLyrics(self):
+        file_path = self.write_song("""\
+        title: Broken
+        artist: Nobody
+        lyrics:
+          - tag: [this is not: valid yaml
+        """)
+
+        header = song.Song.read_header(file_path)
+
+        self.assertEqual(header['title'], 'Broken')
+        self.assertEqual(header['artist'], 'Nobody')
+        self.assertIn('lyrics_offset', header)
+
+    def test_lyricsOrder(self):
+        obj_a = song.Song.from_filename(CHORD_FILES / 'baby_now_that_ive_found_you.crd.yaml')
+
+        self.assertEqual(obj_a.lyrics_order, ['Chorus', 'Verse', 'Refrain', 'Instrumental I', 'Verse', 'Refrain', 'Chorus'])
+
+    def test_loadLyrics(self):
+        obj_a = song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml')
+        obj_a.load_lyrics()
+
+        self.assertEqual(obj_a.segments, ['Verse I', 'Refrain', 'Chorus'])
+        self.assertEqual(obj_a.chords[0].split(), ['E', 'A', 'Am', 'E', 'G#7', 'C#m', 'Edim', 'F#m', 'B7', 'E', 'A', 'Am', 'E', 'G#7', 'C#m', 'Edim', 'F#m', 'B7'])
+
+class Song_LazyLyricsTest(unittest.TestCase):
+    def setUp(self):
+        self.old_size = song.Song.LYRICS_CACHE_SIZE
+        song.Song._lyrics_lru.clear()
+
+    def tearDown(self):
+        song.Song.LYRICS_CACHE_SIZE = self.old_size
+        song.Song._lyrics_lru.clear()
+
+    def test_headerOnly(self):
+        header = song.Song.read_header(CHORD_FILES / 'xanadu.crd.yaml')
+        obj_a = song.Song.from_header(header, CHORD_FILES / 'xanadu.crd.yaml')
+
+        self.assertEqual(str(obj_a), '"Xanadu" - by Electric Light Orchestra')
+        self.assertFalse(obj_a.is_lyrics_loaded())
+
+        self.assertEqual(obj_a.segments, ['Verse I', 'Refrain', 'Chorus'])
+        self.assertTrue(obj_a.is_lyrics_loaded())
+
+    def test_evicted(self):
+        song.Song.LYRICS_CACHE_SIZE = 2
+        songs = [song.Song.from_filename(x) for x in sorted(CHORD_FILES.glob('*.crd.yaml'))]
+
+        for obj_a in songs:
+            obj_a.lyrics
+
+        self.assertEqual([x.is_lyrics_loaded() for x in songs], [False, False, False, True, True])
+        self.assertEqual(songs[0].segments, ['Chorus', 'Verse', 'Refrain', 'Instrumental I'])
+        self.assertEqual(len(song.Song._lyrics_lru), 2)
+
+    def test_noFile(self):
+        obj_a = song.Song('Untitled', 'Nobody')
+        self.assertEqual(obj_a.lyrics, [])
+
+        obj_a._load_lyrics([{'tag': 'Verse', 'text': '4\nLa la la\n', 'chords': 'C'}])
+        self.assertEqual(obj_a.segments, ['Verse'])
+        self.assertEqual(obj_a.chords, ['C'])
+
+class Song_EntriesTest(unittest.TestCase):
+    def test_memoized(self):
+        obj_a = song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml')
+        entries = obj_a.entries()
+
+        self.assertEqual([x.name for x in entries], ['Verse I', 'Refrain', 'Chorus'])
+        self.assertIs(obj_a.entries(), entries)
+        self.assertEqual(list(entries[1].entries())[0], ('A million lights are dancing', [('E', 0, 4), ('G#m', 10, 4)]))
+
+    def test_invalidate(self):
+        obj_a = song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml')
+        entries = obj_a.entries()
+
+        obj_a.invalidate_entries()
+        self.assertIsNot(obj_a.entries(), entries)
+
+        entries = obj_a.entries()
+        obj_a.load_lyrics()
+        self.assertIsNot(obj_a.entries(), entries)
+
+    def test_noFile(self):
+        obj_a = song.Song('Untitled', 'Nobody')
+        obj_a._load_lyrics([{'tag': 'Verse', 'text': '4\nLa la la\n', 'chords': 'C'}])
+        entries = obj_a.entries()
+
+        self.assertIs(obj_a.entries(), entries)
+        self.assertEqual(entries[0].chords, ['C'])
+
+class Song_LayoutTest(unittest.TestCase):
+    def setUp(self):
+        self.song_obj = song.Song('Test Song', 'Nobody')
+        self.song_obj._load_lyrics([
+            {'tag': 'Verse', 'text': '4   4\nLa la\n  4\nLa la la\n', 'chords': 'C G\nAm'},
+            {'tag': 'Chorus', 'text': '4 4 4\nOh oh oh\n', 'chords': 'F C G'},
+        ])
+
+    def test_rows(self):
+        layout = self.song_obj.layout()
+
+        self.assertEqual(list(layout.segment_rows), [0, 6])
+        self.assertEqual(list(layout.chord_rows), [1, 3, 7])
+        self.assertEqual(list(layout.lyric_rows), [2, 4, 8])
+        self.assertEqual(len(layout), 9)
+        self.assertEqual([layout.segment_of_line(x) for x in range(3)], [0, 0, 1])
+        self.assertIs(self.song_obj.layout(), layout)
+
+    def test_numTotalLines(self):
+        self.assertEqual(self.song_obj.num_total_lines(), 3)
+        self.assertEqual(self.song_obj.num_total_lines(include_chords=True), 6)
+        self.assertEqual(self.song_obj.num_total_lines(include_title=True, include_sep=True), 6)
+        self.assertEqual(self.song_obj.num_total_lines(include_chords=True, include_title=True, include_sep=True), 9)
+
+    def test_file(self):
+        obj_a = song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml')
+        layout = obj_a.layout()
+
+        self.assertEqual(obj_a.num_total_lines(include_chords=True, include_title=True, include_sep=True), len(layout))
+        self.assertEqual(list(layout.segment_rows), [0, 14, 24])
+
+class Song_RenderTest(unittest.TestCase):
+    def test_basic(self):
+        obj_a = song.Song('Test Song', 'Nobody')
+        obj_a._load_lyrics([
+            {'tag': 'Verse', 'text': '4   4\nLa la\n', 'chords': 'C G'},
+            {'tag': 'Chorus', 'text': '4 4\nOh oh\n', 'chords': 'F C'},
+        ])
+
+        self.assertEqual(list(obj_a.render_lines()), [
+            '"Test Song" - by Nobody',
+            '',
+            '[Verse]',
+            'C   G',
+            'La la',
+            '',
+            '[Chorus]',
+            'F C',
+            'Oh oh',
+        ])
+
+    def test_sameAsStr(self):
+        obj_a = song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml')
+        lines = list(obj_a.render_lines())
+
+        self.assertEqual(lines[0], str(obj_a))
+        self.assertEqual('\n'.join(lines[2:]), '\n\n'.join('\n'.join(x.render_lines()) for x in obj_a.entries()))
+        self.assertEqual('\n'.join(obj_a.entries()[0].render_lines()).strip(), str(obj_a.entries()[0]))
+
+class Song_TransposedTest(unittest.TestCase):
+    def setUp(self):
+        self.song_obj = song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml')
+
+    def test_basic(self):
+        obj_a = self.song_obj.transposed(2)
+
+        self.assertEqual(str(obj_a), str(self.song_obj))
+        self.assertEqual(obj_a.entries()[0].chords[:4], ['F#', 'B', 'Bm', 'F#'])
+        self.assertEqual(self.song_obj.entries()[0].chords[:4], ['E', 'A', 'Am', 'E'])
+        self.assertEqual(obj_a.segments, self.song_obj.segments)
+        self.assertEqual(obj_a.num_total_lines(include_chords=True), self.song_obj.num_total_lines(include_chords=True))
+
+    def test_sharesBuffers(self):
+        obj_a = self.song_obj.transposed(-3)
+        segment, orig_segment = obj_a.entries()[1], self.song_obj.entries()[1]
+
+        self.assertIs(segment.text, orig_segment.text)
+        self.assertIs(segment._chord_cols, orig_segment._chord_cols)
+        self.assertIs(obj_a.entries(), obj_a.entries())
+        self.assertEqual([x[1] for x in segment.entries()][0], [('C#', 0, 4), ('Fm', 10, 4)])
+
+    def test_chained(self):
+        obj_a = self.song_obj.transposed(5).transposed(7)
+
+        self.assertIs(obj_a.song, self.song_obj)
+        self.assertEqual(obj_a.entries()[0].chords, self.song_obj.entries()[0].chords)
+
+    def test_invalidate(self):
+        obj_a = self.song_obj.transposed(1)
+        entries = obj_a.entries()
+
+        self.song_obj.invalidate_entries()
+        self.assertIsNot(obj_a.entries(), entries)
+        self.assertEqual([x.chords for x in obj_a.entries()], [x.chords for x in entries])
+
+class Song_YamlBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.old_backend = song.yaml_backend()
+        song.Song._lyrics_lru.clear()
+
+    def tearDown(self):
+        song.set_yaml_backend(self.old_backend)
+        song.Song._lyrics_lru.clear()
+
+    def test_default(self):
+        self.assertIn(song.yaml_backend(), song.YAML_LOADERS)
+        self.assertEqual(song.yaml_backend(), next(iter(song.YAML_LOADERS)))
+        self.assertIn('python', song.YAML_LOADERS)
+
+    def test_sameResult(self):
+        results = []
+        for backend in song.YAML_LOADERS:
+            song.set_yaml_backend(backend)
+            obj_a = song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml')
+            results += [(obj_a.lyrics, obj_a.segments, obj_a.chords)]
+
+        self.assertTrue(all(x == results[0] for x in results))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            song.set_yaml_backend('no such backend')
+
+        self.assertEqual(song.yaml_backend(), self.old_backend)
+
+class Song_CompactTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        song.Song._lyrics_lru.clear()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        song.Song._lyrics_lru.clear()
+
+    def test_sameAsYaml(self):
+        for file_path in sorted(CHORD_FILES.glob('*.crd.yaml')):
+            compact_path = song.convert_to_compact(file_path, os.path.join(self.tmp_dir.name, 'song.crd.jsonl'))
+            obj_a = song.Song.from_filename(file_path)
+            obj_b = song.Song.from_filename(compact_path)
+
+            self.assertEqual(str(obj_b), str(obj_a))
+            self.assertEqual((obj_b.bpm, obj_b.global_semitones, obj_b.time_sig), (obj_a.bpm, obj_a.global_semitones, obj_a.time_sig))
+            self.assertEqual(obj_b.lyrics_order, obj_a.lyrics_order)
+            self.assertEqual((obj_b.lyrics, obj_b.segments, obj_b.chords), (obj_a.lyrics, obj_a.segments, obj_a.chords))
+
+    def test_noYaml(self):
+        compact_path = song.convert_to_compact(CHORD_FILES / 'xanadu.crd.yaml', os.path.join(self.tmp_dir.name, 'xanadu.crd.jsonl'))
+        obj_a = song.Song.from_filename(compact_path)
+
+        with unittest.mock.patch.object(song, 'load_yaml', side_effect=AssertionError('parsed')):
+            self.assertEqual(obj_a.segments, ['Verse I', 'Refrain', 'Chorus'])
+
+    def test_defaultPath(self):
+        file_path = Path(self.tmp_dir.name) / 'xanadu.crd.yaml'
+        file_path.write_bytes((CHORD_FILES / 'xanadu.crd.yaml').read_bytes())
+
+        self.assertEqual(song.convert_to_compact(file_path), Path(self.tmp_dir.name) / 'xanadu.crd.jsonl')
+        self.assertTrue(song.is_compact(Path(self.tmp_dir.name) / 'xanadu.crd.jsonl'))
+
+    def test_headerTypes(self):
+        file_path = Path(self.tmp_dir.name) / 'song.crd.yaml'
+        file_path.write_text((CHORD_FILES / 'xanadu.crd.yaml').read_text(encoding='utf-8').replace('title: Xanadu', 'title: 1999'), encoding='utf-8')
+        compact_path = song.convert_to_compact(file_path)
+
+        self.assertEqual(song.Song.from_filename(compact_path).title, '1999')
+        self.assertEqual(
+            {k: v for k, v in song.Song.read_header(compact_path).items() if k != 'lyrics_offset'},
+            {k: v for k, v in song.Song.read_header(file_path).items() if k != 'lyrics_offset'},
+        )
+
+        # Compact files written before the header was read as strings
+        with open(compact_path, 'r', encoding='utf-8') as fh:
+            lines = fh.readlines()
+        lines[0] = lines[0].replace('"title":"1999"', '"title":1999')
+        compact_path.write_text(''.join(lines), encoding='utf-8')
+
+        song_obj = song.Song.from_filename(compact_path)
+        self.assertEqual(song_obj.title, '1999')
+        self.assertEqual(song_obj.segments, ['Verse I', 'Refrain', 'Chorus'])
+
+class Song_TimelineTest(unittest.TestCase):
+    def setUp(self):
+        self.song_obj = song.Song('Test Song', 'Nobody')
+        self.song_obj.bpm = 60
+        self.song_obj.time_sig = (3, 4)
+        self.song_obj._load_lyrics([
+            {'tag': 'Verse', 'text': '2   1\nLa la\n  3\nLa la la\n', 'chords': 'C G\nAm'},
+            {'tag': 'Chorus', 'text': '1 1 4\nOh oh oh\n', 'chords': 'F C G'},
+        ])
+
+    def test_basic(self):
+        timeline = self.song_obj.timeline()
+
+        self.assertEqual(len(timeline), len(song.SongCursor(self.song_obj)))
+        self.assertEqual([timeline.start_time(x) for x in range(len(timeline))], [0, 2, 3, 6, 7, 8])
+        self.assertEqual(timeline.chord_duration(5), 4)
+        self.assertEqual(timeline.duration, 12)
+        self.assertEqual([timeline.bar(x) for x in range(len(timeline))], [0, 0, 1, 2, 2, 2])
+        self.assertIs(self.song_obj.timeline(), timeline)
+
+        with self.assertRaises(IndexError):
+            timeline.start_time(6)
+
+    def test_chordAt(self):
+        timeline = self.song_obj.timeline()
+
+        self.assertEqual([timeline.chord_at(x) for x in [-1, 0, 1.9, 2, 2.5, 5.99, 6, 8, 11.9, 100]], [0, 0, 0, 1, 1, 2, 3, 5, 5, 5])
+        self.assertEqual(song.SongTimeline([]).chord_at(3), -1)
+
+    def test_tempo(self):
+        timeline = self.song_obj.timeline()
+        self.song_obj.bpm = 120
+        fast_timeline = self.song_obj.timeline()
+
+        self.assertIs(fast_timeline._beats, timeline._beats)
+        self.assertEqual(fast_timeline.start_time(3), 3)
+        self.assertEqual(fast_timeline.chord_at(3.1), 3)
+
+        self.song_obj.bpm = None
+        self.assertEqual(self.song_obj.timeline().bpm, song.SongTimeline.DEFAULT_BPM)
+
+    def test_lyricsOrder(self):
+        self.song_obj.lyrics_order = ['Chorus', 'Verse', 'Chorus', 'Outro']
+        timeline = self.song_obj.timeline()
+
+        self.assertEqual([x.name for x in self.song_obj.ordered_entries()], ['Chorus', 'Verse', 'Chorus'])
+        self.assertEqual([timeline.start_time(x) for x in range(len(timeline))], [0, 1, 2, 6, 8, 9, 12, 13, 14])
+        self.assertEqual(timeline.duration, 18)
+
+    def test_fileOrder(self):
+        obj_a = song.Song.from_filename(CHORD_FILES / 'baby_now_that_ive_found_you.crd.yaml')
+        timeline = obj_a.timeline()
+
+        self.assertEqual([x.name for x in obj_a.ordered_entries()], obj_a.lyrics_order)
+        self.assertEqual(len(obj_a.entries()), 4)
+        self.assertEqual(timeline.num_beats, sum(x[2] for y in obj_a.ordered_entries() for _, z in y.entries() for x in z))
+
+    def test_file(self):
+        obj_a = song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml')
+        timeline = obj_a.timeline()
+
+        self.assertEqual(timeline.bpm, 128)
+        self.assertEqual(timeline.num_beats, sum(x[2] for y in obj_a.entries() for _, z in y.entries() for x in z))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import unittest.mock
+import concurrent.futures
+import tempfile
+import textwrap
+import os
+from pathlib import Path
+
+import song
+import song_check
+
+CHORD_FILES = Path(__file__).resolve().parent.parent / 'ChordFiles'
+
+class SongCheck_SegmentTest(unittest.TestCase):
+    def test_valid(self):
+        segment = {'tag': 'Verse', 'chords': 'C G\nAm\nF C G', 'text': '4   4\nLa la\n\n\n  4\nLa la la\n4 4 4\n'}
+        self.assertEqual(song_check.validate_segment(segment), [])
+
+    def test_count(self):
+        segment = {'tag': 'Verse', 'chords': 'C G Am', 'text': '4   4\nLa la\n'}
+        self.assertEqual(song_check.validate_segment(segment), ['3 chord(s) but 2 duration(s) in the text'])
+
+    def test_alternation(self):
+        segment = {'tag': 'Verse', 'chords': 'C G', 'text': '4\n4\nLa la\n'}
+
+        self.assertEqual(song_check.validate_segment(segment), [
+            'text line 2: expected lyrics, found chord durations \'4\'',
+            'text line 3: expected chord durations, found \'La la\'',
+            '2 chord(s) but 1 duration(s) in the text',
+        ])
+        self.assertEqual(song_check.validate_segment({'tag': 'Verse', 'chords': '', 'text': '\nLa la\n'}), [
+            'text line 1: expected chord durations, found an empty line',
+        ])
+
+    def test_noLyrics(self):
+        segment = {'tag': 'Verse', 'chords': 'C G', 'text': '4\nLa\n4'}
+
+        self.assertEqual(song_check.validate_segment(segment), [
+            'text line 3: chord durations \'4\' are not followed by lyrics',
+        ])
+        self.assertEqual(song_check.validate_segment({'tag': 'Verse', 'chords': 'C', 'text': '4\n1999\n'}), [])
+        self.assertEqual(song_check.validate_segment({'tag': 'Verse', 'chords': 'C G', 'text': '4\n1999\n4\nLa\n'}), [
+            'text line 2: expected lyrics, found chord durations \'1999\'',
+        ])
+
+    def test_invalidChord(self):
+        segment = {'tag': 'Verse', 'chords': 'C Hm', 'text': '4 4\nLa la\n'}
+        self.assertEqual(song_check.validate_segment(segment), ['invalid chord \'Hm\''])
+
+    def test_missingKeys(self):
+        self.assertEqual(song_check.validate_segment({'tag': 'Verse', 'text': ''}), ['missing or non-string \'chords\''])
+        self.assertEqual(song_check.validate_segment('Verse'), ['not a mapping'])
+
+class SongCheck_FileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_song(self, name: str, text: str) -> str:
+        file_path = os.path.join(self.tmp_dir.name, name)
+        with open(file_path, 'w', encoding='utf-8') as fh:
+            fh.write(textwrap.dedent(text))
+
+        return file_path
+
+    def test_chordFiles(self):
+        file_paths = sorted(str(x) for x in CHORD_FILES.glob('*.crd.yaml'))
+        self.assertEqual(list(song_check.validate_song_files(file_paths, num_workers=1)), [(x, []) for x in file_paths])
+
+    def test_problems(self):
+        file_path = self.write_song('bad.crd.yaml', """\
+        title: Bad
+        lyrics:
+          - tag: Verse
+            chords: C G
+            text: |
+              4
+              La la
+        """)
+
+        self.assertEqual(song_check.validate_song_file(file_path), (file_path, [
+            "missing 'artist'",
+            'segment 0 (Verse): 2 chord(s) but 1 duration(s) in the text',
+        ]))
+
+    def test_unreadable(self):
+        file_path = self.write_song('broken.crd.yaml', """\
+        title: Broken
+        artist: Nobody
+        lyrics:
+          - tag: [this is not: valid yaml
+        """)
+
+        _, problems = song_check.validate_song_file(file_path)
+        self.assertEqual(len(problems), 1)
+        self.assertTrue(problems[0].startswith('cannot be read'))
+
+    def test_parallel(self):
+        old_min_files = song.SongCollection.PARALLEL_MIN_FILES
+        song.SongCollection.PARALLEL_MIN_FILES = 1
+
+        try:
+            file_paths = sorted(str(x) for x in CHORD_FILES.glob('*.crd.yaml'))
+            file_paths += [self.write_song('bad.crd.yaml', 'title: Bad\nartist: Nobody\nlyrics:\n  - tag: Verse\n    chords: C\n    text: "La\\n"\n')]
+
+            results = list(song_check.validate_song_files(file_paths, num_workers=2))
+        finally:
+            song.SongCollection.PARALLEL_MIN_FILES = old_min_files
+
+        self.assertEqual([x[0] for x in results], file_paths)
+        self.assertEqual([len(x[1]) > 0 for x in results], [False] * 5 + [True])
+
+    def test_brokenPool(self):
+        class BreakingExecutor:
+            def __init__(self, max_workers: int):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def map(self, fn, iterable, chunksize: int=1):
+                for idx, item in enumerate(iterable):
+                    if idx == 2:
+                        raise concurrent.futures.process.BrokenProcessPool('worker died')
+                    yield fn(item)
+
+        file_paths = sorted(str(x) for x in CHORD_FILES.glob('*.crd.yaml'))
+
+        with unittest.mock.patch.object(song.SongCollection, 'PARALLEL_MIN_FILES', 1), \
+                unittest.mock.patch.object(concurrent.futures, 'ProcessPoolExecutor', BreakingExecutor):
+            results = list(song_check.validate_song_files(file_paths, num_workers=2))
+
+        # Every file is reported exactly once
+        self.assertEqual([x[0] for x in results], file_paths)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,627 @@
+import unittest
+import unittest.mock
+import tempfile
+import shutil
+import os
+import pickle
+from pathlib import Path
+
+import song
+import uke
+
+CHORD_FILES = Path(__file__).resolve().parent.parent / 'ChordFiles'
+
+class SongCollectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.song_dir = Path(self.tmp_dir.name) / 'songs'
+        self.song_dir.mkdir()
+
+        for file_path in CHORD_FILES.glob('*.crd.yaml'):
+            shutil.copy(file_path, self.song_dir)
+
+        # Keep the cache files of the tests out of the user's cache folder
+        self.cache_dir = Path(self.tmp_dir.name) / 'cache'
+        self.cache_dir_patch = unittest.mock.patch.object(song, 'user_cache_dir', return_value=self.cache_dir)
+        self.cache_dir_patch.start()
+
+    def tearDown(self):
+        self.cache_dir_patch.stop()
+        self.tmp_dir.cleanup()
+
+class SongCollection_BasicTest(SongCollectionTestCase):
+    def test_sorted(self):
+        coll = song.SongCollection(self.song_dir)
+        titles = [x.title for x in coll.song_list()]
+
+        self.assertEqual(len(coll), 5)
+        self.assertEqual(titles, sorted(titles, key=str.casefold))
+        self.assertEqual(coll[0].title, 'Baby Now That I\'ve Found You')
+        self.assertEqual([x.title for x in coll[-2:]], ['Pagdating ng Panahon', 'Xanadu'])
+
+    def test_findSongs(self):
+        coll = song.SongCollection(self.song_dir)
+
+        self.assertEqual([x.title for x in coll.find_songs('xanadu')], ['Xanadu'])
+        self.assertEqual([x.title for x in coll.find_songs('CARA feeling')], ['Flashdance (What a Feeling)'])
+        self.assertEqual(coll.find_songs('no such song'), [])
+        self.assertEqual(len(coll.find_songs('')), 5)
+
+    def test_findSongsTypo(self):
+        coll = song.SongCollection(self.song_dir)
+
+        self.assertEqual([x.title for x in coll.find_songs('xanadoo')], ['Xanadu'])
+        self.assertEqual([x.title for x in coll.find_songs('evrytime we tuch')], ['Everytime We Touch'])
+
+    def test_findSongsRanked(self):
+        coll = song.SongCollection(self.song_dir)
+        shutil.copy(CHORD_FILES / 'xanadu.crd.yaml', self.song_dir / 'xanadu_copy.crd.yaml')
+
+        file_path = self.song_dir / 'xanadu_copy.crd.yaml'
+        text = file_path.read_text(encoding='utf-8').replace('title: Xanadu', 'title: Xanadoo')
+        file_path.write_text(text, encoding='utf-8')
+        coll.get_songs_from_folder(refresh=True)
+
+        self.assertEqual([x.title for x in coll.find_songs('xanadoo')], ['Xanadoo', 'Xanadu'])
+        self.assertEqual([x.title for x in coll.find_songs('xanadu')], ['Xanadu', 'Xanadoo'])
+
+class SongCollection_CacheTest(SongCollectionTestCase):
+    def test_cacheHit(self):
+        song.SongCollection(self.song_dir)
+        self.assertTrue(song.SongCollection.default_cache_path(self.song_dir).is_file())
+        self.assertEqual([x.name for x in self.song_dir.iterdir() if not x.name.endswith('.crd.yaml')], [])
+
+        with unittest.mock.patch.object(song, 'load_yaml', side_effect=AssertionError('parsed')):
+            coll = song.SongCollection(self.song_dir)
+
+        self.assertEqual(len(coll), 5)
+        self.assertEqual(coll[-1].bpm, 128)
+        self.assertEqual(coll[-1].segments, ['Verse I', 'Refrain', 'Chorus'])
+
+    def test_changedFile(self):
+        song.SongCollection(self.song_dir)
+
+        file_path = self.song_dir / 'xanadu.crd.yaml'
+        text = file_path.read_text(encoding='utf-8').replace('title: Xanadu', 'title: Xanadu (Live)')
+        file_path.write_text(text, encoding='utf-8')
+
+        coll = song.SongCollection(self.song_dir)
+        self.assertEqual(coll[-1].title, 'Xanadu (Live)')
+
+    def test_corruptCache(self):
+        self.cache_dir.mkdir()
+        song.SongCollection.default_cache_path(self.song_dir).write_bytes(b'not a cache')
+
+        coll = song.SongCollection(self.song_dir)
+        self.assertEqual(len(coll), 5)
+
+    def test_headersOnly(self):
+        song.SongCollection(self.song_dir)
+        coll = song.SongCollection(self.song_dir)
+
+        # Only the headers and the offsets of the lyrics are kept in memory
+        self.assertTrue(all(isinstance(x[3], int) for x in coll._entries.values()))
+        self.assertFalse(any(x.is_lyrics_loaded() for x in coll))
+
+    def test_evicted(self):
+        coll = song.SongCollection(self.song_dir)
+        segments = coll[-1].segments
+        song.Song._lyrics_lru.clear()
+
+        with unittest.mock.patch.object(song, 'load_yaml', side_effect=AssertionError('parsed')):
+            self.assertEqual(coll[-1].segments, segments)
+            self.assertEqual(len(coll[-1].entries()), len(segments))
+
+    def test_refreshKeepsCache(self):
+        coll = song.SongCollection(self.song_dir)
+
+        file_path = self.song_dir / 'flashdance.crd.yaml'
+        file_path.write_text(file_path.read_text(encoding='utf-8').replace('title: Flashdance', 'title: Flashdance!'), encoding='utf-8')
+        coll.get_songs_from_folder(refresh=True)
+        song.Song._lyrics_lru.clear()
+
+        # The lyrics of the other songs were copied to the new cache file
+        with unittest.mock.patch.object(song, 'load_yaml', side_effect=AssertionError('parsed')):
+            self.assertEqual([len(x.segments) > 0 for x in coll], [True] * 5)
+
+    def test_appended(self):
+        coll = song.SongCollection(self.song_dir)
+        cache_path = song.SongCollection.default_cache_path(self.song_dir)
+        old_cache = cache_path.read_bytes()
+
+        file_path = self.song_dir / 'flashdance.crd.yaml'
+        file_path.write_text(file_path.read_text(encoding='utf-8').replace('title: Flashdance', 'title: Flashdance!'), encoding='utf-8')
+        os.remove(self.song_dir / 'xanadu.crd.yaml')
+        coll.get_songs_from_folder(refresh=True)
+
+        # Only the changes were written, after the previous records
+        self.assertTrue(cache_path.read_bytes().startswith(old_cache))
+        self.assertEqual(len(cache_path.read_bytes().splitlines()) - len(old_cache.splitlines()), 3)
+
+        with unittest.mock.patch.object(song, 'load_yaml', side_effect=AssertionError('parsed')):
+            coll = song.SongCollection(self.song_dir)
+            self.assertEqual(len(coll), 4)
+            self.assertEqual(coll.find_songs('flashdance')[0].title, 'Flashdance! (What a Feeling)')
+            self.assertEqual([len(x.segments) > 0 for x in coll], [True] * 4)
+
+    def test_compacted(self):
+        coll = song.SongCollection(self.song_dir)
+        cache_path = song.SongCollection.default_cache_path(self.song_dir)
+        file_path = self.song_dir / 'flashdance.crd.yaml'
+
+        for idx in range(song.SongCollection.CACHE_COMPACT_FACTOR * 5):
+            file_path.write_text(file_path.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+            coll.get_songs_from_folder(refresh=True)
+
+        # One version line and two lines for each song
+        self.assertLessEqual(len(cache_path.read_bytes().splitlines()), 1 + 2 * 5 * song.SongCollection.CACHE_COMPACT_FACTOR)
+        self.assertEqual(len(song.SongCollection(self.song_dir)._entries), 5)
+
+    def test_noCache(self):
+        song.SongCollection(self.song_dir, use_cache=False)
+        self.assertFalse(os.path.exists(song.SongCollection.default_cache_path(self.song_dir)))
+
+    def test_pickle(self):
+        # Old caches were pickles, which must never be loaded
+        self.cache_dir.mkdir()
+        song.SongCollection.default_cache_path(self.song_dir).write_bytes(pickle.dumps({'version': 1, 'songs': {}}))
+
+        coll = song.SongCollection(self.song_dir)
+        self.assertEqual(len(coll), 5)
+
+class SongCollection_IndexTest(SongCollectionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.index_path = self.song_dir / 'songs.db'
+
+    def test_sameAsMemory(self):
+        coll_mem = song.SongCollection(self.song_dir, use_cache=False)
+        coll_idx = song.SongCollection(self.song_dir, use_cache=False, index_path=self.index_path)
+
+        self.assertEqual(len(coll_idx), len(coll_mem))
+        self.assertEqual([str(x) for x in coll_idx.song_list()], [str(x) for x in coll_mem.song_list()])
+        self.assertEqual([str(x) for x in coll_idx.find_songs('cara')], [str(x) for x in coll_mem.find_songs('cara')])
+        self.assertEqual(str(coll_idx[1]), str(coll_mem[1]))
+        self.assertEqual(str(coll_idx[-1]), str(coll_mem[-1]))
+        self.assertEqual([str(x) for x in coll_idx[1:3]], [str(x) for x in coll_mem[1:3]])
+
+        with self.assertRaises(IndexError):
+            coll_idx[5]
+
+    def test_header(self):
+        coll = song.SongCollection(self.song_dir, use_cache=False, index_path=self.index_path)
+        song_obj = coll[-1]
+
+        self.assertEqual(song_obj.bpm, 128)
+        self.assertEqual(song_obj.time_sig, (4, 4))
+
+        song_obj.load_lyrics()
+        self.assertEqual(song_obj.segments, ['Verse I', 'Refrain', 'Chorus'])
+
+    def test_sync(self):
+        coll = song.SongCollection(self.song_dir, use_cache=False, index_path=self.index_path)
+
+        os.remove(self.song_dir / 'xanadu.crd.yaml')
+        shutil.copy(CHORD_FILES / 'xanadu.crd.yaml', self.song_dir / 'xanadu_copy.crd.yaml')
+        coll.get_songs_from_folder(refresh=True)
+
+        self.assertEqual(len(coll), 5)
+        self.assertEqual(coll[-1].file_path, str(self.song_dir / 'xanadu_copy.crd.yaml'))
+
+    def test_findPrefix(self):
+        coll = song.SongCollection(self.song_dir, use_cache=False, index_path=self.index_path)
+
+        self.assertEqual([x.title for x in coll.find_songs('xan')], ['Xanadu'])
+        self.assertEqual([x.title for x in coll.find_songs('FEEL irene')], ['Flashdance (What a Feeling)'])
+        self.assertEqual(coll.find_songs('anadu'), [])
+
+    def test_queryPlan(self):
+        coll = song.SongCollection(self.song_dir, use_cache=False, index_path=self.index_path)
+        real_execute = coll.index._conn.execute
+        plans = []
+
+        def execute(sql, params=()):
+            if sql.lstrip().startswith('SELECT') and 'COUNT' not in sql:
+                plans.extend(x[3] for x in real_execute('EXPLAIN QUERY PLAN ' + sql, params))
+            return real_execute(sql, params)
+
+        coll.index._conn = unittest.mock.Mock(execute=execute)
+        coll[3]
+        coll[1:3]
+        coll.find_songs('cara feel')
+
+        self.assertNotEqual(plans, [])
+        self.assertEqual([x for x in plans if x.startswith('SCAN')], [])
+
+    def test_lazy(self):
+        with unittest.mock.patch.object(song.SongIndex, '_row_to_song', side_effect=AssertionError('materialized')):
+            coll = song.SongCollection(self.song_dir, use_cache=False, index_path=self.index_path)
+            self.assertEqual(len(coll), 5)
+
+        self.assertEqual(coll[0].title, 'Baby Now That I\'ve Found You')
+
+    def test_countCached(self):
+        coll = song.SongCollection(self.song_dir, use_cache=False, index_path=self.index_path)
+        self.assertEqual(len(coll), 5)
+
+        os.remove(self.song_dir / 'xanadu.crd.yaml')
+        self.assertEqual(len(coll.get_songs_from_folder(refresh=True)), 4)
+        self.assertEqual(len(coll), 4)
+        self.assertEqual(coll[-1].title, 'Pagdating ng Panahon')
+
+class SongCollection_ParallelTest(SongCollectionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.old_min_files = song.SongCollection.PARALLEL_MIN_FILES
+        song.SongCollection.PARALLEL_MIN_FILES = 1
+
+    def tearDown(self):
+        song.SongCollection.PARALLEL_MIN_FILES = self.old_min_files
+        super().tearDown()
+
+    def test_sameAsSerial(self):
+        coll_serial = song.SongCollection(self.song_dir, use_cache=False, num_workers=1)
+        coll_parallel = song.SongCollection(self.song_dir, use_cache=False, num_workers=2)
+
+        self.assertEqual([str(x) for x in coll_parallel.song_list()], [str(x) for x in coll_serial.song_list()])
+        self.assertEqual([x.segments for x in coll_parallel.song_list()], [x.segments for x in coll_serial.song_list()])
+
+class SongCollection_BadFileTest(SongCollectionTestCase):
+    def setUp(self):
+        super().setUp()
+        text = (CHORD_FILES / 'xanadu.crd.yaml').read_text(encoding='utf-8')
+        self.bad_files = {
+            'bad_yaml.crd.yaml': text.replace('lyrics:', 'lyrics: [', 1),
+            'bad_bpm.crd.yaml': text.replace('bpm: 128', 'bpm: 96.5'),
+            'empty_bpm.crd.yaml': text.replace('bpm: 128', 'bpm:'),
+        }
+
+        for name, bad_text in self.bad_files.items():
+            (self.song_dir / name).write_text(bad_text, encoding='utf-8')
+
+    def test_skipped(self):
+        coll = song.SongCollection(self.song_dir)
+
+        self.assertEqual(len(coll), 5)
+        self.assertEqual(sorted(coll.errors), sorted(str(self.song_dir / x) for x in self.bad_files))
+
+    def test_fixed(self):
+        coll = song.SongCollection(self.song_dir)
+        (self.song_dir / 'empty_bpm.crd.yaml').write_text(self.bad_files['empty_bpm.crd.yaml'].replace('bpm:', 'bpm: 90'), encoding='utf-8')
+        coll.get_songs_from_folder(refresh=True)
+
+        self.assertEqual(len(coll), 6)
+        self.assertEqual(len(coll.errors), 2)
+
+    def test_parallel(self):
+        with unittest.mock.patch.object(song.SongCollection, 'PARALLEL_MIN_FILES', 1):
+            coll = song.SongCollection(self.song_dir, use_cache=False, num_workers=2)
+
+        self.assertEqual(len(coll), 5)
+        self.assertEqual(len(coll.errors), 3)
+
+    def test_removedWhileParsing(self):
+        file_path = str(self.song_dir / 'gone.crd.yaml')
+        header, error = song._parse_song_file(file_path)
+
+        self.assertIsNone(header)
+        self.assertTrue(error.startswith('FileNotFoundError'))
+
+    def test_index(self):
+        coll = song.SongCollection(self.song_dir, use_cache=False, index_path=Path(self.tmp_dir.name) / 'songs.db')
+
+        # Only the headers are read into the index
+        self.assertEqual(len(coll), 6)
+        self.assertEqual(sorted(coll.errors), [str(self.song_dir / 'bad_bpm.crd.yaml'), str(self.song_dir / 'empty_bpm.crd.yaml')])
+
+class SongCollection_RefreshTest(SongCollectionTestCase):
+    def test_onlyChanged(self):
+        coll = song.SongCollection(self.song_dir, use_cache=False)
+        old_songs = coll.song_list()
+
+        file_path = self.song_dir / 'xanadu.crd.yaml'
+        text = file_path.read_text(encoding='utf-8').replace('title: Xanadu', 'title: A Xanadu')
+        file_path.write_text(text, encoding='utf-8')
+
+        with unittest.mock.patch.object(coll, '_parse_files', wraps=coll._parse_files) as parse_files:
+            new_songs = coll.get_songs_from_folder(refresh=True)
+
+        parse_files.assert_called_once_with([str(file_path)])
+        self.assertEqual(new_songs[0].title, 'A Xanadu')
+        self.assertEqual([id(x) for x in new_songs[1:]], [id(x) for x in old_songs[:-1]])
+        self.assertEqual(coll.song_list(), new_songs)
+
+    def test_addRemove(self):
+        coll = song.SongCollection(self.song_dir, use_cache=False)
+
+        os.remove(self.song_dir / 'flashdance.crd.yaml')
+        shutil.copy(CHORD_FILES / 'xanadu.crd.yaml', self.song_dir / 'xanadu_copy.crd.yaml')
+        coll.get_songs_from_folder(refresh=True)
+
+        self.assertEqual([x.title for x in coll], [
+            'Baby Now That I\'ve Found You',
+            'Everytime We Touch',
+            'Pagdating ng Panahon',
+            'Xanadu',
+            'Xanadu',
+        ])
+
+    def test_noRefresh(self):
+        coll = song.SongCollection(self.song_dir, use_cache=False)
+        os.remove(self.song_dir / 'flashdance.crd.yaml')
+
+        self.assertEqual(len(coll.get_songs_from_folder()), 4)
+        self.assertEqual(len(coll), 5)
+
+    def test_noRefreshChanged(self):
+        coll = song.SongCollection(self.song_dir)
+
+        file_path = self.song_dir / 'xanadu.crd.yaml'
+        text = file_path.read_text(encoding='utf-8').replace('title: Xanadu', 'title: A Xanadu')
+        file_path.write_text(text, encoding='utf-8')
+
+        self.assertEqual(coll.get_songs_from_folder()[0].title, 'A Xanadu')
+        self.assertEqual(coll[-1].title, 'Xanadu')
+
+        # The change is still picked up by the next refresh
+        self.assertEqual(coll.get_songs_from_folder(refresh=True)[0].title, 'A Xanadu')
+        self.assertEqual([x.title for x in coll.song_list()].count('Xanadu'), 0)
+        self.assertEqual(song.SongCollection(self.song_dir)[0].title, 'A Xanadu')
+
+class SongCollection_FindLyricsTest(SongCollectionTestCase):
+    def test_phrase(self):
+        coll = song.SongCollection(self.song_dir)
+        found = coll.find_lyrics('Now that I\'ve')
+
+        self.assertEqual([(x['song'].title, x['segment'], x['tag'], x['line']) for x in found], [
+            ('Baby Now That I\'ve Found You', 0, 'Chorus', 0),
+            ('Baby Now That I\'ve Found You', 0, 'Chorus', 8),
+        ])
+
+        segment = found[0]['song'].entries()[found[0]['segment']]
+        self.assertIn('now that I\'ve found you', segment.text[found[0]['line']])
+
+    def test_wordOrder(self):
+        coll = song.SongCollection(self.song_dir)
+
+        self.assertEqual(coll.find_lyrics('found you baby now'), [])
+        self.assertEqual(coll.find_lyrics(''), [])
+
+    def test_refresh(self):
+        coll = song.SongCollection(self.song_dir)
+        self.assertEqual(len(coll.find_lyrics('open your eyes')), 1)
+
+        os.remove(self.song_dir / 'xanadu.crd.yaml')
+        coll.get_songs_from_folder(refresh=True)
+        self.assertEqual(coll.find_lyrics('open your eyes'), [])
+
+        shutil.copy(CHORD_FILES / 'xanadu.crd.yaml', self.song_dir / 'xanadu_copy.crd.yaml')
+        coll.get_songs_from_folder(refresh=True)
+        self.assertEqual(len(coll.find_lyrics('open your eyes')), 1)
+
+    def test_emptyFolder(self):
+        empty_dir = Path(self.tmp_dir.name) / 'empty'
+        empty_dir.mkdir()
+        coll = song.SongCollection(empty_dir)
+        self.assertEqual(coll.find_lyrics('open your eyes'), [])
+
+        shutil.copy(CHORD_FILES / 'xanadu.crd.yaml', empty_dir)
+        coll.get_songs_from_folder(refresh=True)
+        self.assertEqual(len(coll.find_lyrics('open your eyes')), 1)
+
+class SongCollection_FindProgressionTest(SongCollectionTestCase):
+    def test_basic(self):
+        coll = song.SongCollection(self.song_dir)
+        found = coll.find_progression('E G#7 C#m')
+
+        self.assertEqual([(x['song'].title, x['chord']) for x in found], [('Xanadu', 3), ('Xanadu', 12)])
+
+    def test_transposed(self):
+        coll = song.SongCollection(self.song_dir)
+
+        self.assertEqual(
+            [(x['song'].title, x['chord']) for x in coll.find_progression('F A7 Dm Fdim Gm C7')],
+            [('Xanadu', 3), ('Xanadu', 12)],
+        )
+        self.assertEqual(
+            [(x['song'].title, x['chord']) for x in coll.find_progression('F AMaj7 Dm')],
+            [],
+        )
+
+    def test_short(self):
+        coll = song.SongCollection(self.song_dir)
+        found = coll.find_progression('E G#7')
+
+        self.assertEqual(
+            sorted((x['song'].title, x['chord']) for x in found),
+            sorted((x['song'].title, x['chord']) for x in coll.find_progression('C E7')),
+        )
+        self.assertIn(('Xanadu', 3), [(x['song'].title, x['chord']) for x in found])
+
+    def test_invalid(self):
+        coll = song.SongCollection(self.song_dir)
+
+        with self.assertRaises(ValueError):
+            coll.find_progression('E Hmin')
+
+    def test_notInterned(self):
+        coll = song.SongCollection(self.song_dir)
+        coll.find_progression('E G#7 C#m')
+        num_chords = uke.ChordTable.size()
+
+        coll.find_progression('Db Gbm7 Ebsus2')
+        with self.assertRaises(ValueError):
+            coll.find_progression('E Hmin7b5')
+
+        self.assertEqual(uke.ChordTable.size(), num_chords)
+
+    def test_refresh(self):
+        coll = song.SongCollection(self.song_dir)
+        self.assertEqual(len(coll.find_progression('E G#7 C#m')), 2)
+
+        shutil.copy(CHORD_FILES / 'xanadu.crd.yaml', self.song_dir / 'xanadu_copy.crd.yaml')
+        coll.get_songs_from_folder(refresh=True)
+        self.assertEqual(len(coll.find_progression('E G#7 C#m')), 4)
+
+    def test_emptyFolder(self):
+        empty_dir = Path(self.tmp_dir.name) / 'empty'
+        empty_dir.mkdir()
+        coll = song.SongCollection(empty_dir)
+        self.assertEqual(coll.find_progression('E G#7 C#m'), [])
+
+        shutil.copy(CHORD_FILES / 'xanadu.crd.yaml', empty_dir)
+        coll.get_songs_from_folder(refresh=True)
+        self.assertEqual(len(coll.find_progression('E G#7 C#m')), 2)
+
+class SongCollection_RenderTest(SongCollectionTestCase):
+    def test_basic(self):
+        coll = song.SongCollection(self.song_dir)
+        lines = list(coll.render_lines())
+
+        self.assertEqual(lines[0], str(coll[0]))
+        self.assertEqual(sum(1 for x in lines if x.startswith('"')), 5)
+        self.assertEqual(lines[-len(list(coll[-1].render_lines())):], list(coll[-1].render_lines()))
+
+    def test_sameAsIndex(self):
+        coll_mem = song.SongCollection(self.song_dir, use_cache=False)
+        coll_idx = song.SongCollection(self.song_dir, use_cache=False, index_path=self.song_dir / 'songs.db')
+
+        self.assertEqual(list(coll_idx.render_lines()), list(coll_mem.render_lines()))
+
+class SongCollection_CompactTest(SongCollectionTestCase):
+    def test_mixed(self):
+        coll_yaml = song.SongCollection(self.song_dir, use_cache=False)
+        song.convert_to_compact(self.song_dir / 'xanadu.crd.yaml', self.song_dir / 'xanadu.crd.jsonl')
+        os.remove(self.song_dir / 'xanadu.crd.yaml')
+        coll = song.SongCollection(self.song_dir, use_cache=False)
+
+        self.assertEqual([str(x) for x in coll], [str(x) for x in coll_yaml])
+        self.assertEqual(coll[-1].file_path, str(self.song_dir / 'xanadu.crd.jsonl'))
+        self.assertEqual(coll[-1].segments, ['Verse I', 'Refrain', 'Chorus'])
+
+    def test_shadowed(self):
+        yaml_path = self.song_dir / 'xanadu.crd.yaml'
+        compact_path = song.convert_to_compact(yaml_path)
+        stat = yaml_path.stat()
+        os.utime(compact_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        coll = song.SongCollection(self.song_dir, use_cache=False)
+        self.assertEqual(len(coll), 5)
+        self.assertEqual(coll[-1].file_path, str(compact_path))
+
+        # The YAML file was edited after it was converted
+        os.utime(yaml_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2))
+        coll.get_songs_from_folder(refresh=True)
+        self.assertEqual(len(coll), 5)
+        self.assertEqual(coll[-1].file_path, str(yaml_path))
+
+    def test_index(self):
+        song.convert_to_compact(self.song_dir / 'flashdance.crd.yaml', self.song_dir / 'flashdance.crd.jsonl')
+        os.remove(self.song_dir / 'flashdance.crd.yaml')
+
+        coll_mem = song.SongCollection(self.song_dir, use_cache=False)
+        coll_idx = song.SongCollection(self.song_dir, use_cache=False, index_path=self.song_dir / 'songs.db')
+
+        self.assertEqual([str(x) for x in coll_idx.song_list()], [str(x) for x in coll_mem.song_list()])
+        self.assertEqual(coll_idx.find_songs('feeling')[0].segments, coll_mem.find_songs('feeling')[0].segments)
+
+class SongCollection_ArchiveTest(SongCollectionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.archive_path = self.song_dir / 'songs.songbook'
+        self.coll_mem = song.SongCollection(self.song_dir, use_cache=False)
+        song.SongArchive.write(self.archive_path, self.coll_mem.song_list())
+
+    def test_sameAsMemory(self):
+        coll = song.SongCollection(archive_path=self.archive_path)
+
+        self.assertEqual(len(coll), 5)
+        self.assertEqual([str(x) for x in coll.song_list()], [str(x) for x in self.coll_mem.song_list()])
+        self.assertEqual([str(x) for x in coll[1:3]], [str(x) for x in self.coll_mem[1:3]])
+        self.assertEqual(coll[-1].bpm, 128)
+        self.assertEqual(coll[-1].segments, self.coll_mem[-1].segments)
+        self.assertEqual(list(coll.render_lines()), list(self.coll_mem.render_lines()))
+
+        with self.assertRaises(IndexError):
+            coll[5]
+
+    def test_lazy(self):
+        coll = song.SongCollection(archive_path=self.archive_path)
+        self.assertEqual(coll.archive._songs, {})
+
+        song_obj = coll[2]
+        self.assertEqual(list(coll.archive._songs), [2])
+        self.assertIs(coll[2], song_obj)
+        self.assertFalse(song_obj.is_lyrics_loaded())
+
+    def test_search(self):
+        coll = song.SongCollection(archive_path=self.archive_path)
+
+        self.assertEqual([x.title for x in coll.find_songs('xanadoo')], ['Xanadu'])
+        self.assertEqual(len(coll.find_songs('')), 5)
+        self.assertEqual(
+            [(x['song'].title, x['line']) for x in coll.find_lyrics('open your eyes')],
+            [(x['song'].title, x['line']) for x in self.coll_mem.find_lyrics('open your eyes')],
+        )
+        self.assertEqual([(x['song'].title, x['chord']) for x in coll.find_progression('E G#7 C#m')], [('Xanadu', 3), ('Xanadu', 12)])
+
+    def test_refresh(self):
+        coll = song.SongCollection(archive_path=self.archive_path)
+        song.SongArchive.write(self.archive_path, self.coll_mem.song_list()[:2])
+
+        self.assertEqual(len(coll.get_songs_from_folder()), 5)
+        self.assertEqual(len(coll.get_songs_from_folder(refresh=True)), 2)
+        self.assertEqual(coll.find_songs('xanadu'), [])
+
+    def test_refreshOldSongs(self):
+        coll = song.SongCollection(archive_path=self.archive_path)
+        song_obj = coll[-1]
+
+        song.SongArchive.write(self.archive_path, self.coll_mem.song_list()[:2])
+        coll.get_songs_from_folder(refresh=True)
+
+        # Songs from the previous archive can still load their lyrics
+        self.assertEqual(song_obj.segments, ['Verse I', 'Refrain', 'Chorus'])
+
+    def test_mappedNotReplaced(self):
+        coll = song.SongCollection(archive_path=self.archive_path)
+        real_replace = os.replace
+        real_remove = os.remove
+
+        def replace(src, dst):
+            # A mapped file cannot be replaced on Windows
+            self.assertNotEqual(Path(dst), coll.archive.data_path)
+            real_replace(src, dst)
+
+        def remove(file_path):
+            if Path(file_path) == coll.archive.data_path:
+                raise PermissionError('file is mapped')
+            real_remove(file_path)
+
+        with unittest.mock.patch.object(song.os, 'replace', side_effect=replace), unittest.mock.patch.object(song.os, 'remove', side_effect=remove):
+            song.SongArchive.write(self.archive_path, self.coll_mem.song_list()[:2])
+
+        self.assertEqual(coll[-1].segments, ['Verse I', 'Refrain', 'Chorus'])
+        self.assertEqual(len(coll.get_songs_from_folder(refresh=True)), 2)
+        self.assertEqual(len(list(self.song_dir.glob('songs.songbook.*.gen'))), 2)
+
+        # The generation left behind is removed by the next write
+        song.SongArchive.write(self.archive_path, self.coll_mem.song_list())
+        self.assertEqual(len(list(self.song_dir.glob('songs.songbook.*'))), 1)
+
+    def test_invalid(self):
+        (self.song_dir / 'bad.songbook').write_bytes(b'not an archive')
+        (self.song_dir / 'empty.songbook').write_bytes(b'')
+
+        with self.assertRaises(ValueError):
+            song.SongArchive(self.song_dir / 'bad.songbook')
+
+        with self.assertRaises(ValueError):
+            song.SongArchive(self.song_dir / 'empty.songbook')
+
+        (self.song_dir / 'outside.songbook').write_bytes(song.SongArchive.POINTER_MAGIC + b'../songs.songbook')
+        with self.assertRaises(ValueError):
+            song.SongArchive(self.song_dir / 'outside.songbook')
+
+if __name__ == '__main__':
+    unittest.main()
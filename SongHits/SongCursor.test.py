@@ -0,0 +1,77 @@
+import unittest
+from pathlib import Path
+
+import song
+
+CHORD_FILES = Path(__file__).resolve().parent.parent / 'ChordFiles'
+
+class SongCursorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.song_obj = song.Song('Test Song', 'Nobody')
+        self.song_obj._load_lyrics([
+            {'tag': 'Verse', 'text': '4   4\nLa la\n  4\nLa la la\n', 'chords': 'C G\nAm'},
+            {'tag': 'Chorus', 'text': '4 4 4\nOh oh oh\n', 'chords': 'F C G'},
+        ])
+        self.cursor = song.SongCursor(self.song_obj)
+
+class SongCursor_IndexTest(SongCursorTestCase):
+    def test_basic(self):
+        self.assertEqual(len(self.cursor), 6)
+        self.assertEqual(self.cursor[0], {'line': 1, 'col': 0, 'chord_name': 'C'})
+        self.assertEqual(self.cursor[2], {'line': 3, 'col': 2, 'chord_name': 'Am'})
+        self.assertEqual(self.cursor[3], {'line': 7, 'col': 0, 'chord_name': 'F'})
+        self.assertEqual([x['chord_name'] for x in self.cursor[-3:]], ['F', 'C', 'G'])
+
+    def test_file(self):
+        cursor = song.SongCursor(song.Song.from_filename(CHORD_FILES / 'xanadu.crd.yaml'))
+
+        self.assertEqual(len(cursor), 45)
+        self.assertEqual([x['chord_name'] for x in cursor[:6]], ['E', 'A', 'Am', 'E', 'G#7', 'C#m'])
+
+class SongCursor_NavigationTest(SongCursorTestCase):
+    def test_nextLine(self):
+        self.assertEqual(self.cursor.next_line_pos(-1), (0, 0))
+        self.assertEqual(self.cursor.next_line_pos(1), (2, 2))
+        self.assertEqual(self.cursor.next_line_pos(2), (3, 4))
+        self.assertEqual(self.cursor.next_line_pos(4), (4, 0))
+
+    def test_prevLine(self):
+        self.assertEqual(self.cursor.prev_line_pos(10), (5, 0))
+        self.assertEqual(self.cursor.prev_line_pos(5), (2, 4))
+        self.assertEqual(self.cursor.prev_line_pos(2), (0, 2))
+        self.assertEqual(self.cursor.prev_line_pos(1), (1, 0))
+
+    def test_nextChord(self):
+        self.assertEqual(self.cursor.next_chord_pos(0), (1, 0))
+        self.assertEqual(self.cursor.next_chord_pos(2), (3, 4))
+        self.assertEqual(self.cursor.next_chord_pos(5), (5, 0))
+        self.assertEqual(self.cursor.next_chord_pos(10), (5, 0))
+
+    def test_prevChord(self):
+        self.assertEqual(self.cursor.prev_chord_pos(0), (0, 0))
+        self.assertEqual(self.cursor.prev_chord_pos(-3), (0, 0))
+        self.assertEqual(self.cursor.prev_chord_pos(3), (2, 4))
+        self.assertEqual(self.cursor.prev_chord_pos(5), (4, 0))
+
+    def test_linePos(self):
+        self.assertEqual(self.cursor.line_pos(0), 0)
+        self.assertEqual(self.cursor.line_pos(2), 2)
+        self.assertEqual(self.cursor.line_pos(3), 2)
+        self.assertEqual(self.cursor.line_pos(4), 3)
+        self.assertEqual(self.cursor.line_pos(100), 5)
+        self.assertEqual(song.SongCursor(song.Song('Empty', 'Nobody')).line_pos(3), 0)
+
+    def test_sameAsLinearScan(self):
+        cursor = song.SongCursor(song.Song.from_filename(CHORD_FILES / 'baby_now_that_ive_found_you.crd.yaml'))
+        lines = [x['line'] for x in cursor[:]]
+
+        for idx in range(len(cursor)):
+            next_idx = next((x for x in range(idx, len(cursor)) if lines[x] != lines[idx]), idx)
+            prev_line = max((x for x in lines if x < lines[idx]), default=None)
+            prev_idx = lines.index(prev_line) if prev_line is not None else idx
+
+            self.assertEqual(cursor.next_line_pos(idx), (next_idx, lines[next_idx] - lines[idx]))
+            self.assertEqual(cursor.prev_line_pos(idx), (prev_idx, lines[idx] - lines[prev_idx]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+import uke
+
+class Ukulele_FretTest(unittest.TestCase):
+    def setUp(self):
+        self.uke_std = uke.Ukulele()
+
+    def test_fretNotes(self):
+        fret_notes = self.uke_std.gen_fret_notes()
+
+        self.assertEqual(list(fret_notes.keys()), ['G', 'C', 'E', 'A'])
+        self.assertEqual(len(fret_notes['G']), 20)
+        self.assertEqual(fret_notes['C'][:5], ['C', 'C#', 'D', 'D#', 'E'])
+
+    def test_noteIdxs(self):
+        fret_map = self.uke_std.get_note_idxs_on_fret(['C', 'E', 'G'])
+
+        self.assertEqual(fret_map['C'], [0, 4, 7, 12, 16, 19])
+        self.assertEqual(fret_map['G'], [0, 5, 9, 12, 17])
+
+class Ukulele_FingeringsTest(unittest.TestCase):
+    def setUp(self):
+        self.uke_std = uke.Ukulele()
+
+    def assert_validFingering(self, chord_name, fingering):
+        notes = {self.uke_std.get_note_index(x) for x in self.uke_std.get_chord_notes(chord_name)}
+        played = {(self.uke_std.get_note_index(x) + y) % 12 for x, y in zip(self.uke_std.tuning, fingering)}
+        self.assertEqual(played, notes)
+
+        fretted = [x for x in fingering if x != 0]
+        if len(fretted) > 0:
+            mean_fret = sum(fretted) / len(fretted)
+
+            self.assertLessEqual(max(fretted) - min(fretted), 4)
+            self.assertLessEqual(min(fretted), 7)
+            self.assertTrue(all(abs(x - mean_fret) <= 3 for x in fretted))
+
+    def test_common(self):
+        self.assertIn([0, 0, 0, 3], self.uke_std.get_chord_fingerings('C'))
+        self.assertIn([2, 0, 0, 0], self.uke_std.get_chord_fingerings('Am'))
+        self.assertIn([0, 2, 3, 2], self.uke_std.get_chord_fingerings('G'))
+        self.assertIn([2, 0, 1, 0], self.uke_std.get_chord_fingerings('F'))
+
+    def test_rules(self):
+        for chord_name in ['C', 'Am', 'G7', 'Bbm7', 'F#dim', 'Dsus2', 'Eaug']:
+            fingerings = self.uke_std.get_chord_fingerings(chord_name)
+            self.assertGreater(len(fingerings), 0)
+
+            for fingering in fingerings:
+                self.assert_validFingering(chord_name, fingering)
+
+    def test_enharmonic(self):
+        self.assertEqual(self.uke_std.get_chord_fingerings('A#m'), self.uke_std.get_chord_fingerings('Bbm'))
+
+    def test_raises(self):
+        with self.assertRaises(ValueError):
+            self.uke_std.get_chord_fingerings('Hmin')
+
+@unittest.skipIf(uke.np is None, 'NumPy is not installed')
+class Ukulele_FingeringsNumPyTest(unittest.TestCase):
+    def test_sameAsLoop(self):
+        for uke_obj in (uke.Ukulele(), uke.Ukulele(['D', 'G', 'B', 'E'], [3, 3, 3, 4], num_frets=15)):
+            for root in uke_obj.A_chroma:
+                for chord_type in uke_obj.chord_maps:
+                    chord_id = uke.ChordTable.intern(root + chord_type)
+                    fingerings = uke_obj._find_fingerings(chord_id)
+
+                    with mock.patch.object(uke, 'np', None):
+                        self.assertEqual(fingerings, uke_obj._find_fingerings(chord_id), root + chord_type)
+
+class Ukulele_InvalidChordTest(unittest.TestCase):
+    def test_notInterned(self):
+        uke_std = uke.Ukulele()
+        num_chords = uke.ChordTable.size()
+
+        for chord_name in ('Hm', 'Cmaj7b9', 'Xsus'):
+            with self.assertRaises(ValueError):
+                uke_std.get_chord_fingerings(chord_name)
+
+        self.assertEqual(uke.ChordTable.size(), num_chords)
+        self.assertIsNone(uke.ChordTable.lookup('Hm'))
+
+class Ukulele_FingeringNotesTest(unittest.TestCase):
+    def setUp(self):
+        self.uke_std = uke.Ukulele()
+
+    def test_open(self):
+        self.assertEqual(self.uke_std.get_fingering_notes([0, 0, 0, 0]), (['G', 'C', 'E', 'A'], [4, 4, 4, 4]))
+
+    def test_octave(self):
+        self.assertEqual(self.uke_std.get_fingering_notes([5, 4, 3, 3]), (['C', 'E', 'G', 'C'], [5, 4, 4, 5]))
+
+class Ukulele_FingeringTableTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.tmp_dir.name) / 'fingerings.json'
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_table(self):
+        uke_std = uke.Ukulele()
+        table = uke_std.gen_fingering_table()
+
+        self.assertEqual(len(table), len(uke.Ukulele.A_chroma) * len(uke.Ukulele.chord_maps))
+        self.assertEqual([list(x) for x in table['C']], uke_std.get_chord_fingerings('C'))
+
+    def test_cache(self):
+        uke.Ukulele(num_frets=15).load_fingering_table(self.cache_path)
+        self.assertTrue(self.cache_path.exists())
+
+        uke.Ukulele._fingering_tables.clear()
+        uke_obj = uke.Ukulele(num_frets=15)
+
+        with mock.patch.object(uke.Ukulele, '_find_fingerings', side_effect=AssertionError('searched')):
+            uke_obj.load_fingering_table(self.cache_path)
+            fingerings = uke_obj.get_chord_fingerings('Bbm7')
+
+        # Flat roots share the fingerings of their sharp counterpart
+        self.assertEqual(fingerings, uke_obj.get_chord_fingerings('A#m7'))
+        self.assertEqual(fingerings, uke.Ukulele(num_frets=15).get_chord_fingerings('A#m7'))
+        self.assertIn([1, 1, 1, 1], fingerings)
+
+    def test_badCache(self):
+        self.cache_path.write_text('not json')
+        uke_obj = uke.Ukulele(num_frets=14)
+        uke_obj.load_fingering_table(self.cache_path)
+
+        self.assertEqual(len(uke_obj.get_chord_fingerings('Dsus2')), len(uke_obj._find_fingerings(uke.ChordTable.intern('Dsus2'))))
+
+    def test_badTables(self):
+        key = json.dumps(uke.Ukulele(num_frets=14).fingering_table_key())
+        bad_tables = [
+            ['C', [[0, 0, 0, 3]]],
+            {'Hm': [[0, 0, 0, 3]]},
+            {'C': 3},
+            {'C': [[0, 0, 3]]},
+            {'C': [[0, 0, 0, 99]]},
+        ]
+
+        for table in bad_tables:
+            with self.subTest(table=table):
+                self.cache_path.write_text(json.dumps({'version': uke.Ukulele.FINGERING_CACHE_VERSION, 'tables': {key: table}}))
+                uke.Ukulele._fingering_tables.clear()
+                uke_obj = uke.Ukulele(num_frets=14)
+                uke_obj.load_fingering_table(self.cache_path)
+
+                self.assertIn([0, 0, 0, 3], uke_obj.get_chord_fingerings('C'))
+                self.assertEqual(uke_obj._load_fingering_cache(self.cache_path)[key]['C'], uke_obj.get_chord_fingerings('C'))
+
+    def test_defaultPath(self):
+        with mock.patch('song.user_cache_dir', return_value=Path(self.tmp_dir.name) / 'cache'):
+            uke.Ukulele(num_frets=13).load_fingering_table()
+
+        self.assertEqual(os.listdir(Path(self.tmp_dir.name) / 'cache'), [uke.Ukulele.FINGERING_CACHE_NAME])
+
+class ChordTable_InternTest(unittest.TestCase):
+    def test_basic(self):
+        chord_id = uke.ChordTable.intern('C#m7')
+
+        self.assertEqual(uke.ChordTable.intern('C#m7'), chord_id)
+        self.assertEqual(uke.ChordTable.name(chord_id), 'C#m7')
+        self.assertEqual(uke.ChordTable.split(chord_id), ('C', '#', 'm7'))
+        self.assertNotEqual(uke.ChordTable.intern('Dbm7'), chord_id)
+
+    def test_invalid(self):
+        chord_id = uke.ChordTable.intern('Cmaj7b9')
+
+        with self.assertRaises(ValueError):
+            uke.ChordTable.split(chord_id)
+
+class ChordTable_TransposeTest(unittest.TestCase):
+    def test_basic(self):
+        chord_id = uke.ChordTable.intern('Am7')
+
+        self.assertEqual(uke.ChordTable.name(uke.ChordTable.transpose(chord_id, 2)), 'Bm7')
+        self.assertEqual(uke.ChordTable.name(uke.ChordTable.transpose(chord_id, -2)), 'Gm7')
+        self.assertEqual(uke.ChordTable.transpose(chord_id, 12), chord_id)
+        self.assertEqual(uke.ChordTable.name(uke.ChordTable.transpose(uke.ChordTable.intern('Bb'), 1)), 'B')
+
+    def test_invalid(self):
+        chord_id = uke.ChordTable.intern('Cmaj7b9')
+        self.assertEqual(uke.ChordTable.transpose(chord_id, 3), chord_id)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+# Built-in modules
+import argparse
+from pathlib import Path
+
+# Local modules
+import song
+
+def main(argv: list[str]=None):
+    parser = argparse.ArgumentParser(description='Convert .crd.yaml files to the compact .crd.jsonl format, or pack them into a songbook archive.')
+    parser.add_argument('paths', nargs='+', help='.crd.yaml files, or folders containing them')
+    parser.add_argument('-o', '--output-dir', help='folder to write the compact files to (default: next to each file)')
+    parser.add_argument('-a', '--archive', help='write every song to this songbook archive instead')
+    args = parser.parse_args(argv)
+
+    file_paths = []
+    for path in map(Path, args.paths):
+        if path.is_dir():
+            file_paths += sorted(path.glob(f'*{song.YAML_SUFFIX}'))
+        else:
+            file_paths += [path]
+
+    if args.archive is not None:
+        num_songs = song.SongArchive.write(args.archive, (song.Song.from_filename(x) for x in file_paths))
+        print(f'{args.archive}: {num_songs} song(s)')
+        return
+
+    for file_path in file_paths:
+        out_path = None
+        if args.output_dir is not None:
+            out_path = Path(args.output_dir) / (file_path.name.removesuffix(song.YAML_SUFFIX) + song.COMPACT_SUFFIX)
+
+        print(song.convert_to_compact(file_path, out_path))
+
+if __name__ == '__main__':
+    main()
@@ -517,6 +517,8 @@ def ui_main(w: ui_lib.CursesMainWindow):
             next_screen, _ = screen_chords(w)
 
 def main():
+    # Every Ukulele() with the standard tuning shares this table
+    Ukulele().load_fingering_table()
     ui_lib.CursesMainWindow.wrapper(ui_main)
 
 if __name__ == '__main__':
@@ -0,0 +1,240 @@
+# Import for type hints
+from collections.abc import Callable
+
+# Built-in modules
+import asyncio
+import time
+
+# Local modules
+import song
+from uke import Ukulele
+
+class ChordPlayer:
+    """Represents a player that plays the chords of a song on schedule
+
+    The chords are played at the times given by :py:meth:`song.Song.timeline`.
+    The position of the player is kept as an anchor (a beat of the song and
+    the time of the event loop clock at which it was reached), and the time
+    at which each chord should be played is computed from that anchor. As
+    the player never adds up the time it slept, late wake-ups do not make
+    the following chords later, i.e. the drift does not accumulate.
+
+    The player is controlled with :py:meth:`play`, :py:meth:`pause`,
+    :py:meth:`seek`, and :py:meth:`set_tempo_scale`, which should be called
+    from the event loop running :py:meth:`run`.
+    """
+    def __init__(self, song_obj: song.Song, on_chord: Callable[[int, str], None]=None, tempo_scale: float=1.0):
+        """Instantiate an object of this class
+
+        This method will instantiate a new, paused :py:class:`ChordPlayer`
+        at the start of ``song_obj``.
+
+        :param song_obj: the song to play
+        :type song_obj: :py:class:`song.Song`
+        :param on_chord: called with the index and name of each chord when it
+            should be played. By default, the first fingering of the chord is
+            played on a :py:class:`uke.Ukulele` in a worker thread
+        :type on_chord: Callable[[int, str], None]
+        :param tempo_scale: how many times faster than the song's ``bpm`` to play
+        :type tempo_scale: float
+        """
+        self.song = song_obj
+        self.timeline = song_obj.timeline()
+        self.on_chord = on_chord if on_chord is not None else self._play_chord
+        self.tempo_scale = tempo_scale
+
+        # The chords are named in the order of the timeline, i.e. with
+        # repeated segments played again
+        self.chord_names = [
+            x[0]
+            for segment in song_obj.ordered_entries()
+            for _, chord_list in segment.entries()
+            for x in chord_list
+        ]
+        self.next_idx = 0
+        self.max_lateness = 0.0
+
+        self._anchor_beat = 0.0
+        self._anchor_time = None
+        self._playing = False
+        self._stopped = False
+        self._changed = None
+        self._uke = None
+        self._clock_resolution = time.get_clock_info('monotonic').resolution
+
+    def _clock(self) -> float:
+        """Get the time of the monotonic clock of the running event loop
+
+        :return: the time in seconds
+        :rtype: float
+        """
+        return asyncio.get_running_loop().time()
+
+    def _beats_per_second(self) -> float:
+        """Get the speed of the player
+
+        :return: the number of beats of the song played per second
+        :rtype: float
+        """
+        return self.tempo_scale / self.timeline.seconds_per_beat
+
+    def _notify(self):
+        """Wake up :py:meth:`run` so that it reschedules the next chord"""
+        if self._changed is not None:
+            self._changed.set()
+
+    @property
+    def position(self) -> float:
+        """float of the beat of the song where the player currently is"""
+        if not self._playing or self._anchor_time is None:
+            return self._anchor_beat
+
+        return self._anchor_beat + (self._clock() - self._anchor_time) * self._beats_per_second()
+
+    @property
+    def is_playing(self) -> bool:
+        """bool of whether the player is playing (i.e. not paused or stopped)"""
+        return self._playing and not self._stopped
+
+    def play(self):
+        """Start or resume playing from the current position"""
+        if self._playing:
+            return
+
+        self._anchor_time = self._clock()
+        self._playing = True
+        self._notify()
+
+    def pause(self):
+        """Pause playing, keeping the current position"""
+        if not self._playing:
+            return
+
+        self._anchor_beat = self.position
+        self._playing = False
+        self._notify()
+
+    def stop(self):
+        """Stop playing and make :py:meth:`run` return"""
+        self._stopped = True
+        self._notify()
+
+    def seek(self, idx: int):
+        """Move the player to the start of a chord
+
+        The chord at ``idx`` is played next.
+
+        :param idx: index of the chord in the song, clamped to the chords of the song
+        :type idx: int
+        """
+        idx = min(max(idx, 0), len(self.timeline))
+
+        self._anchor_beat = self.timeline.start_beat(idx) if idx < len(self.timeline) else self.timeline.num_beats
+        self._anchor_time = self._clock() if self._playing else None
+        self.next_idx = idx
+        self._notify()
+
+    def seek_time(self, t: float):
+        """Move the player to the chord played at a time
+
+        :param t: the time in seconds from the start of the song, at the
+            song's ``bpm``
+        :type t: float
+        """
+        self.seek(self.timeline.chord_at(t))
+
+    def set_tempo_scale(self, tempo_scale: float):
+        """Change how many times faster than the song's ``bpm`` to play
+
+        The current position is kept, so the chords after it are simply
+        played sooner or later.
+
+        :param tempo_scale: the new scale, greater than zero
+        :type tempo_scale: float
+        """
+        if tempo_scale <= 0:
+            raise ValueError('tempo_scale should be greater than zero')
+
+        if self._playing:
+            self._anchor_beat = self.position
+            self._anchor_time = self._clock()
+
+        self.tempo_scale = tempo_scale
+        self._notify()
+
+    def _play_chord(self, idx: int, chord_name: str):
+        """Play the first fingering of a chord on a ukulele without blocking
+
+        Invalid chords are skipped.
+
+        :param idx: index of the chord in the song
+        :type idx: int
+        :param chord_name: the name of the chord
+        :type chord_name: str
+        """
+        if self._uke is None:
+            self._uke = Ukulele()
+
+        try:
+            fingerings = self._uke.get_chord_fingerings(chord_name)
+        except ValueError:
+            return
+
+        if len(fingerings) > 0:
+            asyncio.get_running_loop().run_in_executor(None, self._uke.play_fingering, fingerings[0], chord_name)
+
+    async def run(self, autoplay: bool=True):
+        """Play the song until it ends or :py:meth:`stop` is called
+
+        Each chord is played once the clock reaches its start time. A chord
+        whose time already passed (e.g. after the event loop was blocked) is
+        played right away, and the lateness is kept in :py:attr:`max_lateness`.
+
+        :param autoplay: whether to start playing right away, otherwise the
+            player waits for :py:meth:`play`
+        :type autoplay: bool
+        """
+        self._changed = asyncio.Event()
+        self._stopped = False
+
+        if autoplay:
+            self.play()
+
+        try:
+            while not self._stopped:
+                self._changed.clear()
+
+                if not self._playing:
+                    await self._changed.wait()
+                    continue
+
+                if self.next_idx < len(self.timeline):
+                    target_beat = self.timeline.start_beat(self.next_idx)
+                else:
+                    target_beat = self.timeline.num_beats
+
+                # The delay is computed from the anchor every time, so it
+                # also makes up for the chords that were played late
+                delay = (target_beat - self._anchor_beat) / self._beats_per_second() - (self._clock() - self._anchor_time)
+
+                # Timers may fire up to the clock resolution early, which is
+                # close enough; waiting again would only spin until the clock ticks
+                if delay > self._clock_resolution:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+
+                    continue
+
+                if self.next_idx >= len(self.timeline):
+                    break
+
+                self.max_lateness = max(self.max_lateness, -delay)
+                self.on_chord(self.next_idx, self.chord_names[self.next_idx])
+                self.next_idx += 1
+        finally:
+            self._anchor_beat = self.position
+            self._anchor_time = None
+            self._playing = False
+            self._changed = None
@@ -3,12 +3,176 @@ from collections.abc import Iterable
 
 # Built-in modules
 import re # HINT: People who know regex may use this module
+import bisect
+from array import array
+from collections import OrderedDict
 from pathlib import Path
 import os
+import sys
+import hashlib
+import glob
+import uuid
+import sqlite3
+import json
+import mmap
+import struct
+import concurrent.futures
 
 # pip downlodeable modules
 import yaml
 
+# Local modules
+import song_search
+import uke
+
+# YAML loaders by backend name, fastest first. The LibYAML one is only
+# available when PyYAML was built with its C extension
+YAML_LOADERS = {}
+if getattr(yaml, '__with_libyaml__', False):
+    YAML_LOADERS['libyaml'] = yaml.CSafeLoader
+YAML_LOADERS['python'] = yaml.SafeLoader
+
+_yaml_backend = next(iter(YAML_LOADERS))
+
+def yaml_backend() -> str:
+    """Get the name of the YAML backend used to load songs
+
+    :return: a key of :py:data:`YAML_LOADERS`, ``libyaml`` if available
+    :rtype: str
+    """
+    return _yaml_backend
+
+def set_yaml_backend(name: str):
+    """Set the YAML backend used to load songs
+
+    :param name: a key of :py:data:`YAML_LOADERS`
+    :type name: str
+
+    :raise: ValueError when the backend is not available
+    """
+    global _yaml_backend
+
+    if name not in YAML_LOADERS:
+        raise ValueError(f'YAML backend not available: {name!r}')
+
+    _yaml_backend = name
+
+def load_yaml(stream) -> object:
+    """Parse a YAML document with the current backend
+
+    This is the equivalent of :py:func:`yaml.safe_load`, but uses the
+    LibYAML parser when it is available.
+
+    :param stream: the YAML text or a file opened for reading it
+    :type stream: str or TextIO
+
+    :return: the parsed document
+    :rtype: object
+    """
+    return yaml.load(stream, Loader=YAML_LOADERS[_yaml_backend])
+
+# Songs are authored as YAML and may be compiled to the compact format,
+# which is a JSON header line followed by a JSON lyrics line
+YAML_SUFFIX = '.crd.yaml'
+COMPACT_SUFFIX = '.crd.jsonl'
+
+def is_compact(file_path: str|Path) -> bool:
+    """Check whether a song file is in the compact format
+
+    :param file_path: path of the song file
+    :type file_path: str or Path
+
+    :return: whether ``file_path`` ends with :py:data:`COMPACT_SUFFIX`
+    :rtype: bool
+    """
+    return str(file_path).endswith(COMPACT_SUFFIX)
+
+def convert_to_compact(file_path: str|Path, out_path: str|Path=None) -> Path:
+    """Convert a ``.crd.yaml`` file to the compact format
+
+    The first line of the compact file is the header of the song (every
+    key except ``lyrics``) and the second line is the ``lyrics`` key, both
+    as JSON. Loading it only needs :py:func:`json.loads` instead of YAML
+    parsing.
+
+    :param file_path: path where the ``.crd.yaml`` file resides
+    :type file_path: str or Path
+    :param out_path: path of the compact file to write. By default, this
+        is ``file_path`` with :py:data:`COMPACT_SUFFIX` instead
+    :type out_path: str or Path
+
+    :return: the path of the compact file
+    :rtype: Path
+    """
+    file_path = Path(file_path)
+    if out_path is None:
+        out_path = file_path.with_name(file_path.name.removesuffix(YAML_SUFFIX) + COMPACT_SUFFIX)
+
+    # The header is read like the one of any .crd.yaml file (i.e. with
+    # strings, never numbers or booleans) so that both formats give the same header
+    header = Song.read_header(file_path)
+    del header['lyrics_offset']
+
+    with open(file_path, 'r', encoding='utf-8') as fh:
+        lyrics = load_yaml(fh).get('lyrics') or []
+
+    with open(out_path, 'w', encoding='utf-8') as fh:
+        fh.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')) + '\n')
+        fh.write(json.dumps(lyrics, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    return Path(out_path)
+
+def user_cache_dir() -> Path:
+    """Get the folder where this user's cache files are kept
+
+    :return: ``songhits`` inside the platform's per-user cache folder
+    :rtype: Path
+    """
+    if sys.platform.startswith('win32'):
+        base = os.environ.get('LOCALAPPDATA')
+    elif sys.platform.startswith('darwin'):
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME')
+
+    return (Path(base) if base else Path.home() / '.cache') / 'songhits'
+
+def _song_files(song_path: str|Path) -> list[os.DirEntry]:
+    """List the song files inside a folder
+
+    If a song is in both formats, only the compact file is listed, unless
+    the ``.crd.yaml`` file was modified after it (i.e. it was edited but
+    not converted again).
+
+    :param song_path: folder containing the song files
+    :type song_path: str or Path
+
+    :return: the directory entries of the song files
+    :rtype: list[os.DirEntry]
+    """
+    files = {}
+
+    with os.scandir(song_path) as it:
+        for dir_entry in it:
+            if dir_entry.name.endswith(YAML_SUFFIX):
+                stem = dir_entry.name.removesuffix(YAML_SUFFIX)
+            elif dir_entry.name.endswith(COMPACT_SUFFIX):
+                stem = dir_entry.name.removesuffix(COMPACT_SUFFIX)
+            else:
+                continue
+
+            if dir_entry.is_file():
+                files.setdefault(stem, []).append(dir_entry)
+
+    song_files = []
+    for entries in files.values():
+        if len(entries) > 1:
+            entries.sort(key=lambda x: (x.stat().st_mtime_ns, is_compact(x.name)))
+
+        song_files += [entries[-1]]
+
+    return song_files
+
 class LyricSegment:
     """Represents a lyric segment
 
@@ -17,6 +181,8 @@ class LyricSegment:
     names include the chorus, refrain, and verses. This class
     represents one of these segments.
     """
+    __slots__ = ('name', 'text')
+
     def __init__(self, name: str, text: str):
         """Instantiate an object of this class
 
@@ -61,7 +227,16 @@ class ChordedLyricSegment(LyricSegment):
     also contains chord annotations. These annotations are
     placed on top of the lyrics, with the chords over
     the syllable where such a chord should be played.
+
+    To keep many segments in memory at once, the chords are stored
+    as ids from the :py:class:`~uke.ChordTable` in an ``array('I')``, and
+    the column, duration, and lyric line of each chord annotation are
+    stored in compact ``array('H')`` buffers instead of lists.
     """
+    __slots__ = ('_chord_ids', '_chord_cols', '_chord_durs', '_chord_lines', '_num_annotations')
+
+    _chord_dur_re = re.compile(r'(?<!\w)\d+(?!\w)')
+
     def __init__(self, name: str, text: str, chords: str=''):
         """Instantiate an object of this class
 
@@ -85,18 +260,89 @@ class ChordedLyricSegment(LyricSegment):
         :type chords: list[str]
         """
         super().__init__(name, text)
-        self.full_lyrics = self.text
-        self.chords = chords.strip().split()
+        full_lyrics = self.text
+        self._chord_ids = array('I', [uke.ChordTable.intern(x) for x in chords.strip().split()])
 
         self.text = []
-        for idx, line in enumerate(self.full_lyrics):
+        for idx, line in enumerate(full_lyrics):
             if idx % 2 != 0:
                 self.text += [line]
 
-        self.chord_annotations = []
-        for idx, line in enumerate(self.full_lyrics):
-            if idx % 2 == 0 and line != '':
-                self.chord_annotations += [line]
+        # Each annotation line is tokenized once into (column, duration) pairs
+        self._chord_cols = array('H')
+        self._chord_durs = array('H')
+        self._chord_lines = array('H')
+        self._num_annotations = 0
+
+        # Empty annotation lines are kept (except the trailing one) so that
+        # the lyrics of an empty pair of lines, used to separate stanzas,
+        # are not paired with the chords of the next line
+        for idx, line in enumerate(full_lyrics):
+            if idx % 2 == 0 and (line != '' or idx + 1 < len(full_lyrics)):
+                for x in self._chord_dur_re.finditer(line):
+                    self._chord_cols.append(x.start())
+                    self._chord_durs.append(int(x.group()))
+                    self._chord_lines.append(self._num_annotations)
+
+                self._num_annotations += 1
+
+    @property
+    def chords(self) -> list[str]:
+        """list[str] of the chords of this segment, in order"""
+        return [uke.ChordTable.name(x) for x in self._chord_ids]
+
+    def transposed(self, semitones: int) -> 'ChordedLyricSegment':
+        """Get a copy of this segment with its chords transposed
+
+        Only the chord ids are transposed (see :py:meth:`uke.ChordTable.transpose`).
+        The lyrics and the chord annotation buffers are shared with this
+        segment instead of being copied.
+
+        :param semitones: the number of semitones to transpose the chords to
+        :type semitones: int
+
+        :return: the transposed segment
+        :rtype: :py:class:`ChordedLyricSegment`
+        """
+        segment = ChordedLyricSegment.__new__(ChordedLyricSegment)
+        segment.name = self.name
+        segment.text = self.text
+        segment._chord_ids = array('I', [uke.ChordTable.transpose(x, semitones) for x in self._chord_ids])
+        segment._chord_cols = self._chord_cols
+        segment._chord_durs = self._chord_durs
+        segment._chord_lines = self._chord_lines
+        segment._num_annotations = self._num_annotations
+
+        return segment
+
+    @property
+    def chord_annotations(self) -> list[str]:
+        """list[str] of the chord annotation lines, rebuilt from the tokens"""
+        return [
+            ''.join(' ' * (col - prev_end) + str(dur) for col, dur, prev_end in line)
+            for line in self._annotation_lines()
+        ]
+
+    def _annotation_lines(self) -> list[list[tuple[int, int, int]]]:
+        """Group the chord annotations of this segment by line
+
+        :return: for each annotation line, a list of the (``col``, ``dur``, ``prev_end``)
+            of its annotations, where ``prev_end`` is the column right after the
+            previous annotation in the line
+        :rtype: list[list[tuple[int, int, int]]]
+        """
+        lines = [[] for _ in range(self._num_annotations)]
+        prev_end = 0
+
+        for idx, line_idx in enumerate(self._chord_lines):
+            if len(lines[line_idx]) == 0:
+                prev_end = 0
+
+            col, dur = self._chord_cols[idx], self._chord_durs[idx]
+            lines[line_idx] += [(col, dur, prev_end)]
+            prev_end = col + len(str(dur))
+
+        return lines
 
     def __len__(self):
         """Count the number of chords in this lyric segment
@@ -122,26 +368,32 @@ class ChordedLyricSegment(LyricSegment):
         :return: the lyrics with the segment name and content
         :rtype: str
         """
-        str_ChordedLyrics = f'[{self.name}]' + '\n'
-        offset = 0
-
-        for line_index, line_chord in enumerate(self.chord_annotations):
-            modified_line = line_chord
-            for num_chord in range(len(re.findall(r'(?<!\w)\d+(?!\w)', modified_line))):
-                if modified_line == '':
-                    modified_line = '\n'
-                elif len(self.chords[num_chord + offset - 1]) > 1 and num_chord != 0:
-                    index = modified_line.find(r'(?<!\w)\d+(?!\w)')
-                    modified_line = modified_line[:index - len(self.chords[num_chord + offset - 1]) + 1] + modified_line[index]
-                    modified_line = re.sub(r'(?<!\w)\d+(?!\w)', self.chords[num_chord + offset], modified_line, 1)                 
-                else:
-                    modified_line = re.sub(r'(?<!\w)\d+(?!\w)', self.chords[num_chord + offset], modified_line, 1)
-            offset += len(re.findall(r'(?<!\w)\d+(?!\w)', line_chord))
-            str_ChordedLyrics += modified_line + '\n'
-            str_ChordedLyrics += self.text[line_index].strip() + '\n'
-        
-        return str_ChordedLyrics.strip()
-    
+        return '\n'.join(self.render_lines()).strip()
+
+    def render_lines(self) -> Iterable[str]:
+        """Generate the lines of the string representation of this segment
+
+        The lines are generated one at a time from :py:meth:`entries`, in
+        the order used by :py:meth:`__str__`: the segment name, then each
+        chord line followed by its lyric line.
+
+        :return: an ``Iterable`` of lines, without line endings
+        :rtype: Iterable[str]
+        """
+        yield f'[{self.name}]'
+
+        for lyric, chord_list in self.entries():
+            chord_line = ''
+            for chord_name, chord_col, _ in chord_list:
+                # Keep chords apart if the previous chord name is too long
+                if len(chord_line) > 0 and len(chord_line) >= chord_col:
+                    chord_line += ' '
+
+                chord_line += ' ' * (chord_col - len(chord_line)) + chord_name
+
+            yield chord_line
+            yield lyric.strip()
+
     def entries(self) -> Iterable[tuple[str, list[tuple[str, int, int]]]]:
         """Generate a "list" of lyrics and corresponding chords in the :py:class:`Song`
 
@@ -157,38 +409,24 @@ class ChordedLyricSegment(LyricSegment):
 
         This method is usually used if we want to iterate through
         each lyric line with its chord information already bundled.
+        The entries are generated from the chord buffers of this
+        segment as they are iterated.
 
         :return: an ``Iterable`` object, with each element
             containing a tuple
         :rtype: Iterable[tuple[str, list[str, int, int]]]
         """
-        list_entries = []
-        counter = 0
-        # list_EachLine_Lyric = str(self).split('\n')
-        # line_chord_dur = [x for idx, x in enumerate(self.full) if idx % 2 == 0 and x != '']
-        
-        for idx, line in enumerate(self.chord_annotations):
-            list_dur = line.strip().split()
-            
-            chord_elements = []
-            temp = line
-            offset = 0
-
-            for x in list_dur:
-                chord_col_temp = re.search(r'(?<!\w)\d+(?!\w)', temp)
-                if chord_col_temp is not None:
-                    chord_col_temp = chord_col_temp.start()
-                    chord_col = (chord_col_temp + offset)
+        chord_idx = 0
 
-                    temp = temp[chord_col_temp + 1:]
-                    offset += chord_col_temp + 1
-
-                    chord_elements += [(self.chords[counter], chord_col, int(x))]
-                    counter += 1
+        for line_idx in range(self._num_annotations):
+            chord_elements = []
 
-            list_entries += [(self.text[idx], chord_elements)]
+            while chord_idx < len(self._chord_lines) and self._chord_lines[chord_idx] == line_idx:
+                chord_name = uke.ChordTable.name(self._chord_ids[chord_idx])
+                chord_elements += [(chord_name, self._chord_cols[chord_idx], self._chord_durs[chord_idx])]
+                chord_idx += 1
 
-        return list_entries
+            yield self.text[line_idx], chord_elements
 
 class Song:
     """Represents a song
@@ -198,8 +436,16 @@ class Song:
     repetitively across the song. It also has some "metadata"
     to display how a song should be played or how should it
     be named.
+
+    Only the header of a song is kept in the object itself. The lyrics
+    of songs read from a file are loaded the first time they are needed
+    and kept in a shared LRU of :py:attr:`LYRICS_CACHE_SIZE` songs, so
+    that a large collection of songs does not keep every lyric in memory.
     """
-    def __init__(self, title: str, artist: str, file_path: str=None):
+    LYRICS_CACHE_SIZE = 64
+    _lyrics_lru = OrderedDict()
+
+    def __init__(self, title: str, artist: str, file_path: str=None, header: dict=None):
         """Instantiate an object of this class
 
         This method will instantiate a new :py:class:`Song`
@@ -221,48 +467,199 @@ class Song:
           the song; time_sig[0] is the numerator and time_sig[1]
           is the denominator
 
+        If ``header`` is not given, the header of ``file_path`` is read
+        with :py:meth:`read_header`.
+
         :param title: name of the lyric segment
         :type title: str
         :param artist: lyrics of the segment
         :type artist: str
         :param file_path: accompanying chords of the segment
         :type file_path: str
+        :param header: already-parsed header of ``file_path``
+        :type header: dict
         """
         self.title = title
         self.artist = artist
         self.file_path = file_path
 
-        if os.path.isfile(file_path):
-            list_info = []
-            with open(file_path, 'r') as fh: #assumes that there is a file
-                for i in range(7):
-                    list_info += [fh.readline().strip()]
+        self.bpm = None
+        self.global_semitones = 0
+        self.time_sig = (4, 4)
+        self.lyrics_order = []
+        self._lyrics_offset = None
+        self._pinned_lyrics = None
+
+        if header is None and file_path is not None and os.path.isfile(file_path):
+            header = self.read_header(file_path)
+
+        if header is not None:
+            self._apply_header(header)
+
+    def _apply_header(self, header: dict):
+        """Set the song metadata from a header returned by :py:meth:`read_header`
+
+        :param header: header of a ``.crd.yaml`` file
+        :type header: dict
+        """
+        if 'bpm' in header:
+            self.bpm = int(header['bpm'])
+
+        if 'semitones' in header:
+            self.global_semitones = int(header['semitones'])
+
+        if len(header.get('time_signature', [])) == 2:
+            self.time_sig = tuple(int(x) for x in header['time_signature'])
+
+        self.lyrics_order = list(header.get('lyrics_order', []))
+        self._lyrics_offset = header.get('lyrics_offset')
+
+    @staticmethod
+    def _parse_scalar(value: str) -> str:
+        """Unquote a plain YAML scalar found in a ``.crd.yaml`` header
+
+        :param value: the raw scalar, without the key
+        :type value: str
+
+        :return: the scalar with its surrounding quotes removed
+        :rtype: str
+        """
+        value = value.strip()
+
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"':
+            quote = value[0]
+            value = value[1:-1]
+
+            if quote == "'":
+                value = value.replace("''", "'")
+
+        return value
+
+    @staticmethod
+    def _header_value(value: object) -> str|list[str]:
+        """Convert a value of a compact header to what :py:meth:`read_header` gives
+
+        Compact files written by older versions may have numbers or booleans
+        in their header (e.g. a ``title: 1999`` parsed as YAML).
+
+        :param value: the value from the JSON header
+        :type value: object
+
+        :return: the value, with every scalar as a string
+        :rtype: str or list[str]
+        """
+        if isinstance(value, list):
+            return [x if isinstance(x, str) else json.dumps(x) for x in value]
+
+        return value if isinstance(value, str) else json.dumps(value)
 
-            self.bpm = list_info[2].split()[1]
-            self.global_semitones = list_info[3].split()[1]
+    @classmethod
+    def read_header(cls, file_path: str|Path) -> dict:
+        """Read the header of a ``.crd.yaml`` file in a single pass
+
+        The header is every top-level key before ``lyrics``. The file
+        is read line by line and reading stops as soon as the ``lyrics``
+        key is reached, so the (much larger) lyrics are never touched.
+        Keys may appear in any order. Scalars are returned as strings
+        while block lists (``- item``) and flow lists (``[a, b]``) are
+        returned as lists of strings.
+
+        The offset of the ``lyrics`` key is saved in the ``lyrics_offset``
+        key so that the lyrics can later be parsed without re-reading
+        the header.
+
+        Files in the compact format (see :py:func:`convert_to_compact`)
+        are also accepted; their header is the JSON object on the first line.
+
+        :classmethod:
+        :param file_path: path where the ``.crd.yaml`` file resides
+        :type file_path: str or Path
+
+        :return: the header keys mapped to their values
+        :rtype: dict
+        """
+        if is_compact(file_path):
+            with open(file_path, 'r', encoding='utf-8') as fh:
+                header = {k: cls._header_value(v) for k, v in json.loads(fh.readline()).items()}
+                header['lyrics_offset'] = fh.tell()
+
+            return header
+
+        header = {}
+        list_key = None
+
+        with open(file_path, 'r', encoding='utf-8') as fh:
+            while True:
+                offset = fh.tell()
+                line = fh.readline()
+
+                if line == '':
+                    break
+
+                stripped = line.strip()
+                if stripped == '' or stripped.startswith('#'):
+                    continue
+
+                # Items of a block list belong to the last key seen
+                if line[0] in ' \t-':
+                    if list_key is not None and stripped.startswith('-'):
+                        header[list_key] += [cls._parse_scalar(stripped[1:])]
+                    continue
+
+                key, sep, value = stripped.partition(':')
+                if sep == '':
+                    continue
+
+                key = key.strip()
+                value = value.strip()
+                list_key = None
+
+                if key == 'lyrics':
+                    header['lyrics_offset'] = offset
+                    break
+                elif value == '':
+                    header[key] = []
+                    list_key = key
+                elif value.startswith('[') and value.endswith(']'):
+                    header[key] = [cls._parse_scalar(x) for x in value[1:-1].split(',') if x.strip() != '']
+                else:
+                    header[key] = cls._parse_scalar(value)
+
+        return header
+
+    @classmethod
+    def from_header(cls, header: dict, file_path: str|Path=None):
+        """Instantiate a Song object from a header returned by :py:meth:`read_header`
+
+        No file is read; the lyrics are only loaded once they are needed.
+
+        :classmethod:
+        :param header: header of a ``.crd.yaml`` file
+        :type header: dict
+        :param file_path: path where the ``.crd.yaml`` file resides
+        :type file_path: str or Path
 
-            list_info[4 : 7] = [' '.join(list_info[4 : 7]).split(' ', maxsplit=1)]
-            list_info[4] = list_info[4][1].replace('-','').split()
-            self.time_sig = (int(list_info[4][0]), int(list_info[4][1]))
+        :return: a header-only ``Song`` object
+        :rtype: Song
+        """
+        return cls(header.get('title', ''), header.get('artist', ''), file_path, header=header)
 
     @classmethod
     def from_filename(cls, file_path: str|Path):
         """Instantiate a Song object from a filename
 
+        The file is only read once, up to its ``lyrics`` key. See
+        :py:meth:`read_header`.
+
         :classmethod:
         :param file_path: path where the ``.crd.yaml`` file resides
-        :type file_path: str or Pa
+        :type file_path: str or Path
 
         :return: information in the file stored in a ``Song`` object
         :rtype: Song
         """
-        list_info = []
         if os.path.isfile(file_path):
-            with open(file_path, 'r') as fh:
-                for i in range(2):
-                    list_info += [fh.readline().strip().split(' ', maxsplit=1)]
-            
-            return cls(list_info[0][1], list_info[1][1], file_path)
+            return cls.from_header(cls.read_header(file_path), file_path)
 
     # @classmethod
     # def from_yaml(cls, song_dict: dict):
@@ -309,21 +706,105 @@ class Song:
 
         This method is used to process the ``lyrics`` key of a ``.crd.yaml`` file.
 
+        The processed lyrics are put in the shared LRU if this song has a
+        file to reload them from. Otherwise, they are kept in the object.
+
         :param lyrics_list: string containing information about the :py:class:`Song` object
         :type lyrics_list: list[dict]
         """
-        self.lyrics = []
+        lyrics = []
         for segment in lyrics_list:
-            self.lyrics += [segment['text']]
+            lyrics += [segment['text']]
 
-        self.segments = []
+        segments = []
         for segment in lyrics_list:
-            self.segments += [segment['tag']]
+            segments += [segment['tag']]
 
-        self.chords = []
+        chords = []
         for segment in lyrics_list:
-            self.chords += [segment['chords']]
-    
+            chords += [segment['chords']]
+
+        if self.file_path is None:
+            self._pinned_lyrics = [lyrics, segments, chords, None, None, None]
+            return
+
+        Song._lyrics_lru[self] = [lyrics, segments, chords, None, None, None]
+        Song._lyrics_lru.move_to_end(self)
+
+        while len(Song._lyrics_lru) > self.LYRICS_CACHE_SIZE:
+            Song._lyrics_lru.popitem(last=False)
+
+    def _lyrics_data(self) -> list:
+        """Get the processed lyrics of this song, loading them if needed
+
+        :return: the segment texts, segment names, segment chords, and
+            the memoized results of :py:meth:`entries`, :py:meth:`layout`
+            and :py:meth:`timeline` (or ``None``)
+        :rtype: list
+        """
+        if self._pinned_lyrics is not None:
+            return self._pinned_lyrics
+
+        if self not in Song._lyrics_lru:
+            self.load_lyrics()
+
+            if self._pinned_lyrics is not None:
+                return self._pinned_lyrics
+        else:
+            Song._lyrics_lru.move_to_end(self)
+
+        return Song._lyrics_lru[self]
+
+    @property
+    def lyrics(self) -> list[str]:
+        """list[str] of the text of each segment, loaded on first access"""
+        return self._lyrics_data()[0]
+
+    @property
+    def segments(self) -> list[str]:
+        """list[str] of the name of each segment, loaded on first access"""
+        return self._lyrics_data()[1]
+
+    @property
+    def chords(self) -> list[str]:
+        """list[str] of the chords of each segment, loaded on first access"""
+        return self._lyrics_data()[2]
+
+    def is_lyrics_loaded(self) -> bool:
+        """Check whether the lyrics of this song are currently in memory
+
+        :return: whether accessing the lyrics will not read the file
+        :rtype: bool
+        """
+        return self._pinned_lyrics is not None or self in Song._lyrics_lru
+
+    def load_lyrics(self):
+        """Load the lyrics of this song from its ``.crd.yaml`` file
+
+        Only the part of the file starting from the ``lyrics`` key is
+        parsed, as the header was already read by :py:meth:`read_header`.
+        """
+        self._load_lyrics(self._read_lyrics_list())
+
+    def _read_lyrics_list(self) -> list[dict]:
+        """Parse the ``lyrics`` key of the ``.crd.yaml`` file of this song
+
+        :return: the unprocessed ``lyrics`` key, see :py:meth:`_load_lyrics`
+        :rtype: list[dict]
+        """
+        if self.file_path is None or self._lyrics_offset is None:
+            return []
+
+        with open(self.file_path, 'r', encoding='utf-8') as fh:
+            fh.seek(self._lyrics_offset)
+
+            if is_compact(self.file_path):
+                return json.loads(fh.readline())
+
+            song_dict = load_yaml(fh)
+
+        return song_dict['lyrics'] or []
+
     def num_total_lines(self, include_chords: bool=False, include_title: bool=False, include_sep: bool=False):
         """Count the number of total lines in the :py:class:`Song`
 
@@ -348,14 +829,16 @@ class Song:
             :py:class:`Song` is to be printed
         :rtype: int
         """
-        total_len = len([x for x in self.lyrics[0].split('\n') if x != '']) // 2
+        layout = self.layout()
+
+        total_len = len(layout.lyric_rows)
         if include_chords == True:
-            total_len += len([x for x in self.lyrics[0].split('\n') if x != '']) // 2
-        elif include_title == True:
-            total_len += len(self.segments)
-        elif include_sep == True:
-            total_len += (len([x for x in self.lyrics[0].split('\n') if x == '']) - 1)      
-        
+            total_len += len(layout.chord_rows)
+        if include_title == True:
+            total_len += len(layout.segment_rows)
+        if include_sep == True:
+            total_len += max(len(layout.segment_rows) - 1, 0)
+
         return total_len
 
     def entries(self) -> Iterable[ChordedLyricSegment]:
@@ -364,200 +847,1697 @@ class Song:
         The method returns an ``Iterable``, which can be converted to
         a ``list`` or sequence appropriately. The resulting ``list``
         should contain a list of :py:class:`ChordedLyricSegment`s
-        in the order shown in :py:attr:`~.lyrics_order`.
+        in the order they are written in the ``.crd.yaml`` file, each
+        segment once. See :py:meth:`ordered_entries` for the order in
+        which the song is played.
 
-        This method is usually used if we want to iterate through
-        each lyric segments in the order in which the song is
-        supposed to be.
+        The segments are only built on the first call and the same
+        objects are returned afterwards, until the lyrics are loaded
+        again or :py:meth:`invalidate_entries` is called. The memoized
+        segments are dropped along with the lyrics when this song is
+        evicted from the lyrics LRU.
 
         :return: an ``Iterable`` object, with each element
             containing a :py:class:`ChordedLyricSegment`
         :rtype: Iterable[:py:class:`ChordedLyricSegment`]
         """
-        list_chordedLS = []
-        for index, line in enumerate(self.lyrics):
-            list_chordedLS += [ChordedLyricSegment(self.segments[index], line, self.chords[0])]
-        
-        return list_chordedLS
-
-class SongCursor:
-    """Represents a song cursor
+        lyrics_data = self._lyrics_data()
 
-    The song cursor is a wrapper around the :py:class:`Song` class.
-    It is used by the main UI to navigate and scroll across
-    the song using the chord annotations on top of each lyric
-    line.
-    """
-    def __init__(self, song: Song):
-        """Instantiate an object of this class
+        if lyrics_data[3] is None:
+            list_chordedLS = []
+            for index, line in enumerate(lyrics_data[0]):
+                list_chordedLS += [ChordedLyricSegment(lyrics_data[1][index], line, lyrics_data[2][index])]
 
-        This method will instantiate a new :py:class:`SongCursor`
-        object with the given ``song``.
+            lyrics_data[3] = tuple(list_chordedLS)
 
-        :param song: :py:class:`Song` object that this cursor will track
-        :type song: :py:class:`Song`
-        """
-        raise NotImplementedError('Stub code!')
-    
-    def _chord_idx_to_rc(self, song: Song) -> list[dict]:
-        """Generate a chord index mapping to (line, col) coordinates
+        return lyrics_data[3]
 
-        Inside a :py:class:`Song`, a chord can be fetched using its 0-index within the
-        song.
+    def ordered_entries(self) -> list[ChordedLyricSegment]:
+        """Get the lyric segments of the :py:class:`Song` in playing order
 
-        :param song: :py:class:`Song` object to preprocess the mapping from index to
-            coordinates
-        :type song: :py:class:`Song`
+        Each name in :py:attr:`~.lyrics_order` is resolved to the first
+        segment from :py:meth:`entries` with that name, so a segment that is
+        repeated appears once per repetition. Names without a segment are
+        skipped. If the song has no :py:attr:`~.lyrics_order`, the segments
+        are played in the order of :py:meth:`entries`.
 
-        :return: a list of dictionaries, with each dictionary containing three
-            keys ``line``, ``col``, and ``chord_name``. This is read as: from coordinates
-            ``(line, col)``, ``chord_name`` appears.
-        :rtype: list[dict]
+        :return: the segments, in the order in which the song is played
+        :rtype: list[:py:class:`ChordedLyricSegment`]
         """
-        raise NotImplementedError('Stub code!')
-    
-    def next_line_pos(self, idx: int) -> tuple[int, int]:
-        """Find the chord one line downward in the song
+        entries = self.entries()
 
-        This method finds the chord one line downward in the song. It does this
-        by looking for the ``line`` of the chord at ``idx`` in the song and then
-        checking whether a line exists below it. If so, then the leftmost chord
-        at that line is fetched with its index ``next_idx`` and difference
-        between its line and the line corresponding to ``idx`` ``diff_lines``. The tuple
-        (``next_idx``, ``diff_lines``) is then returned.
+        if len(self.lyrics_order) == 0:
+            return list(entries)
 
-        If ``idx`` is less than zero, it returns (0, 0).
+        by_name = {}
+        for segment in entries:
+            by_name.setdefault(segment.name, segment)
 
-        If a next line cannot be found, it returns (``idx``, 0).
+        return [by_name[x] for x in self.lyrics_order if x in by_name]
 
-        :param idx: current index of the chord to check for its corresponding
-            chord in the next line
-        :type idx: int
+    def invalidate_entries(self):
+        """Discard the memoized results of :py:meth:`entries`, :py:meth:`layout` and :py:meth:`timeline`
 
-        :return: a 2-ary ``tuple``, with the first element being the index
-            of the chord at the next line ``next_idx``, and the second element
-            being the difference between the ``line``s of the chord at ``idx``
-            and of the chord at ``next_idx``
-        :rtype: tuple[int, int]
+        This is done automatically when the lyrics are loaded again. Call
+        this method if anything used to build the segments changes.
         """
-        raise NotImplementedError('Stub code!')
-    
-    def prev_line_pos(self, idx: int) -> tuple[int, int]:
-        """Find the chord one line upward in the song
+        if self._pinned_lyrics is not None:
+            self._pinned_lyrics[3:] = [None, None, None]
+        elif self in Song._lyrics_lru:
+            Song._lyrics_lru[self][3:] = [None, None, None]
+
+    def render_lines(self) -> Iterable[str]:
+        """Generate the lines of the whole :py:class:`Song` as text
+
+        The song is rendered as the string from :py:meth:`__str__`, then
+        each segment from :py:meth:`entries` (see
+        :py:meth:`ChordedLyricSegment.render_lines`), with an empty line
+        before each segment. Lines are generated one at a time, so the
+        whole text is never built in memory.
+
+        :return: an ``Iterable`` of lines, without line endings
+        :rtype: Iterable[str]
+        """
+        yield str(self)
 
-        This method finds the chord one line upward in the song. It does this
-        by looking for the ``line`` of the chord at ``idx`` in the song and then
-        checking whether a line exists above it. If so, then the leftmost chord
-        at that line is fetched with its index ``prev_idx`` and difference
-        between its line and the line corresponding to ``idx`` ``diff_lines``. The tuple
-        (``prev_idx``, ``diff_lines``) is then returned.
+        for segment in self.entries():
+            yield ''
+            yield from segment.render_lines()
 
-        If ``idx`` is greater than the number of chords in the song, it returns
-        (``num_chords`` - 1, 0).
+    def transposed(self, semitones: int) -> 'TransposedSong':
+        """Get a view of this song with every chord transposed
 
-        If a previous line cannot be found, it returns (``idx``, 0).
+        The view shares the lyrics of this song, so it is cheap to make
+        one for each key a user flips through.
 
-        :param idx: current index of the chord to check for its corresponding
-            chord in the previous line
-        :type idx: int
+        :param semitones: the number of semitones to transpose the chords to
+        :type semitones: int
 
-        :return: a 2-ary ``tuple``, with the first element being the index
-            of the chord at the previous line ``prev_idx``, and the second element
-            being the difference between the ``line``s of the chord at ``idx``
-            and of the chord at ``prev_idx``
-        :rtype: tuple[int, int]
+        :return: the transposed view of this song
+        :rtype: :py:class:`TransposedSong`
         """
-        raise NotImplementedError('Stub code!')
-    
-    def next_chord_pos(self, idx: int) -> tuple[int, int]:
-        """Find the chord next to a chord in the song
+        return TransposedSong(self, semitones)
 
-        This method finds the chord next to it in the song. If this is used
-        in a UI setting, this is similar to pressing the NEXT key. So, if
-        there are chords like so:
+    def layout(self) -> 'SongLayout':
+        """Get the rows used to display the :py:class:`Song`
 
-            C G Em F
+        The layout is computed once from :py:meth:`entries` and memoized
+        along with it, so it is discarded by :py:meth:`invalidate_entries`.
 
-        ... then, the next chord of Em is F. The index of F ``next_idx`` and
-        the difference between the lines where Em and F `diff_lines` are fetched.
-        The tuple (``next_idx``, ``diff_lines``) is then returned. Note that in
-        this example, ``diff_lines`` is 0.
+        :return: the row of every segment name, chord line and lyric line
+        :rtype: :py:class:`SongLayout`
+        """
+        lyrics_data = self._lyrics_data()
 
-        If ``idx`` is greater than the number of chords in the song, it returns
-        (``num_chords`` - 1, 0).
+        if lyrics_data[4] is None:
+            lyrics_data[4] = SongLayout(self.entries())
 
-        :param idx: current index of the chord to check for its corresponding
-            chord next to it
-        :type idx: int
+        return lyrics_data[4]
 
-        :return: a 2-ary ``tuple``, with the first element being the index
-            of the chord next to it ``next_idx``, and the second element
-            being the difference between the ``line``s of the chord at ``idx``
-            and of the chord at ``next_idx``
-        :rtype: tuple[int, int]
-        """
-        raise NotImplementedError('Stub code!')
-    
-    def prev_chord_pos(self, idx: int) -> tuple[int, int]:
-        """Find the chord before a chord in the song
+    def timeline(self) -> 'SongTimeline':
+        """Get the times at which each chord of the :py:class:`Song` is played
 
-        This method finds the chord immediately before it in the song. If
-        this is used in a UI setting, this is similar to pressing the PREV key.
-        So, if there are chords like so:
+        The beats of every chord are computed once from :py:meth:`ordered_entries`
+        and memoized along with :py:meth:`entries`. If :py:attr:`bpm` or
+        :py:attr:`time_sig` changed since, the memoized beats are reused
+        with the new tempo.
 
-            C G Em F
+        :return: the timeline of the chords, in playing order. The chords of
+            a repeated segment are in the timeline once per repetition
+        :rtype: :py:class:`SongTimeline`
+        """
+        lyrics_data = self._lyrics_data()
+        timeline = lyrics_data[5]
+
+        if timeline is None:
+            timeline = SongTimeline(self.ordered_entries(), self.bpm, self.time_sig)
+            lyrics_data[5] = timeline
+        elif timeline.bpm != (self.bpm or SongTimeline.DEFAULT_BPM) or timeline.time_sig != self.time_sig:
+            timeline = timeline.with_tempo(self.bpm, self.time_sig)
+            lyrics_data[5] = timeline
+
+        return timeline
+
+class TransposedSong(Song):
+    """Represents a song with every chord transposed
+
+    This is a view of another :py:class:`Song`: its metadata and lyrics
+    are the ones of the original song, which is the only one that reads
+    its file. The segments from :py:meth:`entries` share the lyrics and
+    chord annotations of the original segments, and only their chords
+    are transposed.
+    """
+    def __init__(self, song: Song, semitones: int):
+        """Instantiate an object of this class
 
-        ... then, the previous chord of Em is G. The index of G ``prev_idx`` and
-        the difference between the lines where Em and G ``diff_lines`` are fetched.
-        The tuple (``prev_idx``, ``diff_lines``) is then returned. Note that in
-        this example, ``diff_lines`` is 0.
+        This method will instantiate a new :py:class:`TransposedSong`
+        view of ``song``.
 
-        If ``idx`` is zero or less, it returns (0, 0).
+        :param song: the original song
+        :type song: :py:class:`Song`
+        :param semitones: the number of semitones to transpose the chords to
+        :type semitones: int
+        """
+        self.song = song
+        self.semitones = semitones
+
+        self.title = song.title
+        self.artist = song.artist
+        self.file_path = song.file_path
+        self.bpm = song.bpm
+        self.global_semitones = song.global_semitones
+        self.time_sig = song.time_sig
+        self.lyrics_order = song.lyrics_order
+        self._lyrics_offset = song._lyrics_offset
+        self._pinned_lyrics = None
+
+        self._source_entries = None
+        self._entries = None
+
+    def _lyrics_data(self) -> list:
+        """Get the processed lyrics of the original song
+
+        :return: see :py:meth:`Song._lyrics_data`
+        :rtype: list
+        """
+        return self.song._lyrics_data()
+
+    @property
+    def chords(self) -> list[str]:
+        """list[str] of the transposed chords of each segment"""
+        return [' '.join(x.chords) for x in self.entries()]
+
+    def is_lyrics_loaded(self) -> bool:
+        """Check whether the lyrics of the original song are currently in memory
+
+        :return: whether accessing the lyrics will not read the file
+        :rtype: bool
+        """
+        return self.song.is_lyrics_loaded()
+
+    def load_lyrics(self):
+        """Load the lyrics of the original song from its ``.crd.yaml`` file"""
+        self.song.load_lyrics()
+
+    def entries(self) -> Iterable[ChordedLyricSegment]:
+        """Generate a "list" of the transposed lyric segments
+
+        The segments are transposed from the ones of the original song and
+        memoized until the original segments change.
+
+        :return: an ``Iterable`` object, with each element
+            containing a :py:class:`ChordedLyricSegment`
+        :rtype: Iterable[:py:class:`ChordedLyricSegment`]
+        """
+        source_entries = self.song.entries()
+
+        if self._source_entries is not source_entries:
+            self._entries = tuple(x.transposed(self.semitones) for x in source_entries)
+            self._source_entries = source_entries
+
+        return self._entries
+
+    def invalidate_entries(self):
+        """Discard the memoized segments of this view and of the original song"""
+        self._source_entries = None
+        self._entries = None
+        self.song.invalidate_entries()
+
+    def transposed(self, semitones: int) -> 'TransposedSong':
+        """Get a view of the original song transposed further
+
+        :param semitones: the number of semitones to transpose this view to
+        :type semitones: int
+
+        :return: the view of the original song, transposed to the sum of
+            the semitones
+        :rtype: :py:class:`TransposedSong`
+        """
+        return TransposedSong(self.song, self.semitones + semitones)
+
+class SongLayout:
+    """Represents the rows used to display a song
+
+    A song is displayed as the name of each segment, followed by alternating
+    chord and lyric lines, and an empty line between segments. The layout
+    records the row of each of these lines once, so the display does not
+    need to count them again.
+
+    The chord and lyric lines of all segments are numbered together, so line
+    ``n`` of the song is shown on rows ``chord_rows[n]`` and ``lyric_rows[n]``.
+    """
+    def __init__(self, entries: Iterable[ChordedLyricSegment]):
+        """Instantiate an object of this class
+
+        This method will instantiate a new :py:class:`SongLayout` with the
+        rows of the given ``entries``.
+
+        :param entries: the segments of the song, in display order
+        :type entries: Iterable[:py:class:`ChordedLyricSegment`]
+        """
+        self.segment_rows = array('I')
+        self.segment_lines = array('I')
+        self.chord_rows = array('I')
+        self.lyric_rows = array('I')
+
+        row = 0
+        for segment in entries:
+            self.segment_rows.append(row)
+            self.segment_lines.append(len(self.chord_rows))
+            row += 1
+
+            for _ in range(segment._num_annotations):
+                self.chord_rows.append(row)
+                self.lyric_rows.append(row + 1)
+                row += 2
+
+            # Empty line after the segment
+            row += 1
+
+        self.num_rows = max(row - 1, 0)
+        self.segment_lines.append(len(self.chord_rows))
+
+    def segment_of_line(self, line_idx: int) -> int:
+        """Get the segment a chord and lyric line belongs to
+
+        :param line_idx: the index of the line in the whole song
+        :type line_idx: int
+
+        :return: the index of the segment containing the line
+        :rtype: int
+        """
+        return bisect.bisect_right(self.segment_lines, line_idx, hi=len(self.segment_rows)) - 1
+
+    def __len__(self) -> int:
+        """Get the number of rows needed to display the whole song
+
+        :return: number of rows, not counting the empty line after the
+            last segment
+        :rtype: int
+        """
+        return self.num_rows
+
+class SongTimeline:
+    """Represents the times at which the chords of a song are played
+
+    The duration of each chord (see :py:meth:`ChordedLyricSegment.entries`)
+    is a number of beats. The beat at which each chord starts is summed up
+    once, in the order in which the chords are played, so the start of a chord is
+    a lookup and the chord played at some time is found with a binary search.
+    Times are in seconds from the start of the song.
+    """
+    DEFAULT_BPM = 120
+
+    def __init__(self, entries: Iterable[ChordedLyricSegment], bpm: int=None, time_sig: tuple[int, int]=(4, 4)):
+        """Instantiate an object of this class
+
+        This method will instantiate a new :py:class:`SongTimeline` with
+        the chords of the given ``entries``.
+
+        :param entries: the segments of the song, in playing order
+        :type entries: Iterable[:py:class:`ChordedLyricSegment`]
+        :param bpm: beats per minute, or ``None`` for :py:attr:`DEFAULT_BPM`
+        :type bpm: int
+        :param time_sig: the time signature of the song
+        :type time_sig: tuple[int, int]
+        """
+        # The start beat of every chord, then the beat where the last one ends
+        self._beats = array('d', [0])
+
+        for segment in entries:
+            for dur in segment._chord_durs:
+                self._beats.append(self._beats[-1] + dur)
+
+        self.bpm = bpm or self.DEFAULT_BPM
+        self.time_sig = tuple(time_sig)
+
+    def with_tempo(self, bpm: int=None, time_sig: tuple[int, int]=None) -> 'SongTimeline':
+        """Get the same timeline played at another tempo
+
+        The beats of the chords are shared with this timeline.
+
+        :param bpm: beats per minute, or ``None`` for :py:attr:`DEFAULT_BPM`
+        :type bpm: int
+        :param time_sig: the time signature, or ``None`` to keep this one
+        :type time_sig: tuple[int, int]
+
+        :return: the timeline with the new tempo
+        :rtype: :py:class:`SongTimeline`
+        """
+        timeline = SongTimeline.__new__(SongTimeline)
+        timeline._beats = self._beats
+        timeline.bpm = bpm or self.DEFAULT_BPM
+        timeline.time_sig = tuple(time_sig) if time_sig is not None else self.time_sig
+
+        return timeline
+
+    @property
+    def seconds_per_beat(self) -> float:
+        """float of the length of a beat in seconds"""
+        return 60 / self.bpm
+
+    @property
+    def num_beats(self) -> float:
+        """float of the number of beats in the whole song"""
+        return self._beats[-1]
+
+    @property
+    def duration(self) -> float:
+        """float of the length of the whole song in seconds"""
+        return self._beats[-1] * self.seconds_per_beat
+
+    def start_beat(self, idx: int) -> float:
+        """Get the beat at which a chord starts
+
+        :param idx: index of the chord in the song
+        :type idx: int
+
+        :return: the number of beats before the chord
+        :rtype: float
+        """
+        if not 0 <= idx < len(self):
+            raise IndexError('chord index out of range')
+
+        return self._beats[idx]
+
+    def start_time(self, idx: int) -> float:
+        """Get the time at which a chord starts
+
+        :param idx: index of the chord in the song
+        :type idx: int
+
+        :return: the time in seconds
+        :rtype: float
+        """
+        return self.start_beat(idx) * self.seconds_per_beat
+
+    def chord_duration(self, idx: int) -> float:
+        """Get the time for which a chord is played
+
+        :param idx: index of the chord in the song
+        :type idx: int
+
+        :return: the duration in seconds
+        :rtype: float
+        """
+        return (self._beats[idx + 1] - self.start_beat(idx)) * self.seconds_per_beat
+
+    def bar(self, idx: int) -> int:
+        """Get the bar in which a chord starts
+
+        :param idx: index of the chord in the song
+        :type idx: int
+
+        :return: the 0-index of the bar, using the numerator of :py:attr:`time_sig`
+        :rtype: int
+        """
+        return int(self.start_beat(idx) // self.time_sig[0])
+
+    def chord_at_beat(self, beat: float) -> int:
+        """Find the chord played at a beat
+
+        :param beat: the number of beats from the start of the song
+        :type beat: float
+
+        :return: the index of the chord, clamped to the first and last chords,
+            or -1 if the song has no chords
+        :rtype: int
+        """
+        if len(self) == 0:
+            return -1
+
+        idx = bisect.bisect_right(self._beats, beat, hi=len(self)) - 1
+        return max(idx, 0)
+
+    def chord_at(self, t: float) -> int:
+        """Find the chord played at a time
+
+        :param t: the time in seconds from the start of the song
+        :type t: float
+
+        :return: the index of the chord, clamped to the first and last chords,
+            or -1 if the song has no chords
+        :rtype: int
+        """
+        return self.chord_at_beat(t / self.seconds_per_beat)
+
+    def __len__(self) -> int:
+        """Get the number of chords in the timeline
+
+        :return: number of chords in the song
+        :rtype: int
+        """
+        return len(self._beats) - 1
+
+class SongCursor:
+    """Represents a song cursor
+
+    The song cursor is a wrapper around the :py:class:`Song` class.
+    It is used by the main UI to navigate and scroll across
+    the song using the chord annotations on top of each lyric
+    line.
+    """
+    def __init__(self, song: Song):
+        """Instantiate an object of this class
+
+        This method will instantiate a new :py:class:`SongCursor`
+        object with the given ``song``.
+
+        :param song: :py:class:`Song` object that this cursor will track
+        :type song: :py:class:`Song`
+        """
+        self.song = song
+
+        chord_rc = self._chord_idx_to_rc(song)
+        self._lines = array('I', [x['line'] for x in chord_rc])
+        self._cols = array('H', [x['col'] for x in chord_rc])
+        self._chord_ids = array('I', [uke.ChordTable.intern(x['chord_name']) for x in chord_rc])
+
+        # Index of the leftmost chord of each chord line, the display line
+        # of each of those chords, and the chord line each chord is on
+        self._line_starts = array('I')
+        self._start_lines = array('I')
+        self._chord_line_idxs = array('I')
+
+        for idx, line in enumerate(self._lines):
+            if len(self._start_lines) == 0 or self._start_lines[-1] != line:
+                self._line_starts.append(idx)
+                self._start_lines.append(line)
+
+            self._chord_line_idxs.append(len(self._line_starts) - 1)
+    
+    def _chord_idx_to_rc(self, song: Song) -> list[dict]:
+        """Generate a chord index mapping to (line, col) coordinates
+
+        Inside a :py:class:`Song`, a chord can be fetched using its 0-index within the
+        song.
+
+        :param song: :py:class:`Song` object to preprocess the mapping from index to
+            coordinates
+        :type song: :py:class:`Song`
+
+        :return: a list of dictionaries, with each dictionary containing three
+            keys ``line``, ``col``, and ``chord_name``. This is read as: from coordinates
+            ``(line, col)``, ``chord_name`` appears.
+        :rtype: list[dict]
+        """
+        chord_rc = []
+        layout = song.layout()
+        line_idx = 0
+
+        for segment in song.entries():
+            for _, chord_list in segment.entries():
+                for chord_name, chord_col, _ in chord_list:
+                    chord_rc += [{'line': layout.chord_rows[line_idx], 'col': chord_col, 'chord_name': chord_name}]
+
+                line_idx += 1
+
+        return chord_rc
+    
+    def next_line_pos(self, idx: int) -> tuple[int, int]:
+        """Find the chord one line downward in the song
+
+        This method finds the chord one line downward in the song. It does this
+        by looking for the ``line`` of the chord at ``idx`` in the song and then
+        checking whether a line exists below it. If so, then the leftmost chord
+        at that line is fetched with its index ``next_idx`` and difference
+        between its line and the line corresponding to ``idx`` ``diff_lines``. The tuple
+        (``next_idx``, ``diff_lines``) is then returned.
+
+        If ``idx`` is less than zero, it returns (0, 0).
+
+        If a next line cannot be found, it returns (``idx``, 0).
+
+        :param idx: current index of the chord to check for its corresponding
+            chord in the next line
+        :type idx: int
+
+        :return: a 2-ary ``tuple``, with the first element being the index
+            of the chord at the next line ``next_idx``, and the second element
+            being the difference between the ``line``s of the chord at ``idx``
+            and of the chord at ``next_idx``
+        :rtype: tuple[int, int]
+        """
+        if idx < 0 or len(self) == 0:
+            return 0, 0
+
+        idx = min(idx, len(self) - 1)
+        line_idx = self._chord_line_idxs[idx] + 1
+
+        if line_idx == len(self._line_starts):
+            return idx, 0
+
+        next_idx = self._line_starts[line_idx]
+        return next_idx, self._lines[next_idx] - self._lines[idx]
+    
+    def prev_line_pos(self, idx: int) -> tuple[int, int]:
+        """Find the chord one line upward in the song
+
+        This method finds the chord one line upward in the song. It does this
+        by looking for the ``line`` of the chord at ``idx`` in the song and then
+        checking whether a line exists above it. If so, then the leftmost chord
+        at that line is fetched with its index ``prev_idx`` and difference
+        between its line and the line corresponding to ``idx`` ``diff_lines``. The tuple
+        (``prev_idx``, ``diff_lines``) is then returned.
+
+        If ``idx`` is greater than the number of chords in the song, it returns
+        (``num_chords`` - 1, 0).
+
+        If a previous line cannot be found, it returns (``idx``, 0).
+
+        :param idx: current index of the chord to check for its corresponding
+            chord in the previous line
+        :type idx: int
+
+        :return: a 2-ary ``tuple``, with the first element being the index
+            of the chord at the previous line ``prev_idx``, and the second element
+            being the difference between the ``line``s of the chord at ``idx``
+            and of the chord at ``prev_idx``
+        :rtype: tuple[int, int]
+        """
+        if len(self) == 0:
+            return 0, 0
+
+        if idx >= len(self):
+            return len(self) - 1, 0
+
+        idx = max(idx, 0)
+        line_idx = self._chord_line_idxs[idx]
+
+        if line_idx == 0:
+            return idx, 0
+
+        prev_idx = self._line_starts[line_idx - 1]
+        return prev_idx, self._lines[idx] - self._lines[prev_idx]
+    
+    def next_chord_pos(self, idx: int) -> tuple[int, int]:
+        """Find the chord next to a chord in the song
+
+        This method finds the chord next to it in the song. If this is used
+        in a UI setting, this is similar to pressing the NEXT key. So, if
+        there are chords like so:
+
+            C G Em F
+
+        ... then, the next chord of Em is F. The index of F ``next_idx`` and
+        the difference between the lines where Em and F `diff_lines` are fetched.
+        The tuple (``next_idx``, ``diff_lines``) is then returned. Note that in
+        this example, ``diff_lines`` is 0.
+
+        If ``idx`` is greater than the number of chords in the song, it returns
+        (``num_chords`` - 1, 0).
+
+        :param idx: current index of the chord to check for its corresponding
+            chord next to it
+        :type idx: int
+
+        :return: a 2-ary ``tuple``, with the first element being the index
+            of the chord next to it ``next_idx``, and the second element
+            being the difference between the ``line``s of the chord at ``idx``
+            and of the chord at ``next_idx``
+        :rtype: tuple[int, int]
+        """
+        if len(self) == 0:
+            return 0, 0
+
+        if idx >= len(self) - 1:
+            return len(self) - 1, 0
+
+        idx = max(idx, 0)
+        return idx + 1, self._lines[idx + 1] - self._lines[idx]
+    
+    def prev_chord_pos(self, idx: int) -> tuple[int, int]:
+        """Find the chord before a chord in the song
+
+        This method finds the chord immediately before it in the song. If
+        this is used in a UI setting, this is similar to pressing the PREV key.
+        So, if there are chords like so:
+
+            C G Em F
+
+        ... then, the previous chord of Em is G. The index of G ``prev_idx`` and
+        the difference between the lines where Em and G ``diff_lines`` are fetched.
+        The tuple (``prev_idx``, ``diff_lines``) is then returned. Note that in
+        this example, ``diff_lines`` is 0.
+
+        If ``idx`` is zero or less, it returns (0, 0).
+
+        :param idx: current index of the chord to check for its corresponding
+            chord before it
+        :type idx: int
+
+        :return: a 2-ary ``tuple``, with the first element being the index
+            of the chord before it ``prev_idx``, and the second element
+            being the difference between the ``line``s of the chord at ``idx``
+            and of the chord at ``prev_idx``
+        :rtype: tuple[int, int]
+        """
+        if idx <= 0 or len(self) == 0:
+            return 0, 0
+
+        idx = min(idx, len(self) - 1)
+        return idx - 1, self._lines[idx] - self._lines[idx - 1]
+
+    def line_pos(self, line: int) -> int:
+        """Find the first chord at or below a line in the song
+
+        This method finds the leftmost chord on the first chord line that
+        is at or below ``line``, which is where the cursor should land when
+        the view is scrolled to ``line``.
+
+        If there is no chord at or below ``line``, it returns the index of the
+        last chord in the song, or 0 if the song has no chords.
+
+        :param line: the display line to look from
+        :type line: int
+
+        :return: the index of the chord at or below ``line``
+        :rtype: int
+        """
+        if len(self) == 0:
+            return 0
+
+        line_idx = bisect.bisect_left(self._start_lines, line)
+
+        if line_idx == len(self._line_starts):
+            return len(self) - 1
+
+        return self._line_starts[line_idx]
+
+    def __getitem__(self, key):
+        """Get the (line, col) coordinates of a chord
+
+        This function also supports ``slice``s to get a list of coordinates of
+        the chords in that ``slice``.
+
+        :param key: index of the chord(s) to get
+        :type key: int or slice
+
+        :return: a ``dict`` with the keys ``line``, ``col``, and ``chord_name``,
+            corresponding to the coordinates. See :py:meth:`~._chord_idx_to_rc` for
+            details.
+        :rtype: dict
+
+        .. seealso:: :py:meth:`~._chord_idx_to_rc`
+        """
+        if isinstance(key, slice):
+            return [self[x] for x in range(*key.indices(len(self)))]
+
+        return {
+            'line': self._lines[key],
+            'col': self._cols[key],
+            'chord_name': uke.ChordTable.name(self._chord_ids[key]),
+        }
+    
+    def __len__(self):
+        """Return the total number of chords in the song
+
+        :return: an ``int`` of the total number of chords in the song
+        :rtype: int
+        """
+        return len(self._chord_ids)
+
+class SongIndex:
+    """Represents an on-disk index of song metadata
+
+    The index is a SQLite database containing only the header of each
+    ``.crd.yaml`` file in a folder (title, artist, bpm, semitones, time
+    signature, path, and modification time). Songs are returned as
+    header-only :py:class:`Song` objects, so a large folder can be listed,
+    paged, and searched without reading every file.
+
+    Every query is answered from an index of the database: each song has
+    a ``rank`` (its position when sorted by title), so a page of songs is
+    a range of ranks, and the words of each title and artist are kept in
+    a separate table for :py:meth:`find`.
+    """
+    VERSION = 2
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS songs (
+            path TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            artist TEXT NOT NULL,
+            bpm INTEGER,
+            semitones INTEGER NOT NULL,
+            ts_num INTEGER NOT NULL,
+            ts_den INTEGER NOT NULL,
+            lyrics_order TEXT NOT NULL,
+            lyrics_offset INTEGER,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            title_key TEXT NOT NULL,
+            rank INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS songs_title_key ON songs (title_key, path);
+        CREATE INDEX IF NOT EXISTS songs_rank ON songs (rank);
+        CREATE TABLE IF NOT EXISTS song_words (
+            word TEXT NOT NULL,
+            path TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS song_words_word ON song_words (word, path);
+        CREATE INDEX IF NOT EXISTS song_words_path ON song_words (path);
+    """
+    _word_re = re.compile(r'\w+')
+    _COLUMNS = 'path, title, artist, bpm, semitones, ts_num, ts_den, lyrics_order, lyrics_offset'
+
+    def __init__(self, db_path: str|Path):
+        """Instantiate an object of this class
+
+        This method will open (or create) the index at ``db_path``.
+
+        :param db_path: path of the SQLite database file
+        :type db_path: str or Path
+        """
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._num_songs = None
+
+        # The index only mirrors a folder, so an older one is simply rebuilt
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != self.VERSION:
+            self._conn.executescript('DROP TABLE IF EXISTS songs; DROP TABLE IF EXISTS song_words;')
+            self._conn.execute(f'PRAGMA user_version = {self.VERSION}')
+
+        self._conn.executescript(self._SCHEMA)
+
+    def close(self):
+        """Close the underlying database connection"""
+        self._conn.close()
+
+    def sync(self, song_path: str|Path):
+        """Update the index with the ``.crd.yaml`` files inside a folder
+
+        Only files that are new or whose modification time or size changed
+        have their header read again. Rows of files that no longer exist in
+        ``song_path`` (or whose header cannot be read) are removed. If anything
+        changed, the rank of every song is computed again.
+
+        :param song_path: folder containing the ``.crd.yaml`` files
+        :type song_path: str or Path
+
+        :return: a description of the error of each file that cannot be read
+        :rtype: dict[str, str]
+        """
+        song_path = Path(song_path)
+        indexed = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self._conn.execute('SELECT path, mtime_ns, size FROM songs')
+        }
+
+        seen = set()
+        rows = []
+        words = []
+        errors = {}
+        if song_path.is_dir():
+            for entry in _song_files(song_path):
+                stat = entry.stat()
+
+                if indexed.get(entry.path) == (stat.st_mtime_ns, stat.st_size):
+                    seen.add(entry.path)
+                    continue
+
+                try:
+                    song_obj = Song.from_filename(entry.path)
+                except SONG_FILE_ERRORS as e:
+                    errors[entry.path] = f'{type(e).__name__}: {e}'.splitlines()[0]
+                    continue
+
+                seen.add(entry.path)
+                rows += [(
+                    entry.path, song_obj.title, song_obj.artist, song_obj.bpm,
+                    song_obj.global_semitones, song_obj.time_sig[0], song_obj.time_sig[1],
+                    json.dumps(song_obj.lyrics_order), song_obj._lyrics_offset,
+                    stat.st_mtime_ns, stat.st_size, song_obj.title.casefold(), None,
+                )]
+                words += [(x, entry.path) for x in self._words(f'{song_obj.title} {song_obj.artist}')]
+
+        removed = [(x,) for x in indexed.keys() - seen]
+        if len(removed) == 0 and len(rows) == 0:
+            return errors
+
+        with self._conn:
+            self._conn.executemany('DELETE FROM songs WHERE path = ?', removed)
+            self._conn.executemany('DELETE FROM song_words WHERE path = ?', removed + [(x[0],) for x in rows])
+            self._conn.executemany(f'INSERT OR REPLACE INTO songs VALUES ({", ".join(["?"] * 13)})', rows)
+            self._conn.executemany('INSERT INTO song_words VALUES (?, ?)', words)
+            self._conn.execute("""
+                UPDATE songs SET rank = ranked.rank
+                FROM (SELECT path, ROW_NUMBER() OVER (ORDER BY title_key, path) - 1 AS rank FROM songs) AS ranked
+                WHERE songs.path = ranked.path
+            """)
+
+        self._num_songs = None
+        return errors
+
+    @classmethod
+    def _words(cls, text: str) -> set[str]:
+        """Split a text into the words kept in the ``song_words`` table
+
+        :param text: the text to split
+        :type text: str
+
+        :return: the distinct words of ``text``, ignoring case
+        :rtype: set[str]
+        """
+        return set(cls._word_re.findall(text.casefold()))
+
+    @staticmethod
+    def _row_to_song(row: tuple) -> Song:
+        """Build a header-only :py:class:`Song` from a row of the index
+
+        :param row: a row with the columns in :py:attr:`_COLUMNS`
+        :type row: tuple
+
+        :return: the song described by the row
+        :rtype: Song
+        """
+        path, title, artist, bpm, semitones, ts_num, ts_den, lyrics_order, lyrics_offset = row
+        header = {
+            'semitones': semitones,
+            'time_signature': [ts_num, ts_den],
+            'lyrics_order': json.loads(lyrics_order),
+            'lyrics_offset': lyrics_offset,
+        }
+        if bpm is not None:
+            header['bpm'] = bpm
+
+        header['title'] = title
+        header['artist'] = artist
+
+        return Song.from_header(header, path)
+
+    def songs(self, offset: int=0, limit: int=-1) -> list[Song]:
+        """Get a page of songs sorted by ascending title
+
+        :param offset: number of songs to skip
+        :type offset: int
+        :param limit: maximum number of songs to return, or -1 for no limit
+        :type limit: int
+
+        :return: the songs in the page
+        :rtype: list[Song]
+        """
+        if limit < 0:
+            cursor = self._conn.execute(f'SELECT {self._COLUMNS} FROM songs WHERE rank >= ? ORDER BY rank', (offset,))
+        else:
+            cursor = self._conn.execute(
+                f'SELECT {self._COLUMNS} FROM songs WHERE rank >= ? AND rank < ? ORDER BY rank',
+                (offset, offset + limit),
+            )
+
+        return [self._row_to_song(x) for x in cursor]
+
+    def iter_songs(self) -> Iterable[Song]:
+        """Generate every song sorted by ascending title
+
+        Unlike :py:meth:`songs`, the rows are fetched as the songs are
+        iterated instead of all at once.
+
+        :return: an ``Iterable`` of every :py:class:`Song` in the index
+        :rtype: Iterable[Song]
+        """
+        cursor = self._conn.execute(f'SELECT {self._COLUMNS} FROM songs ORDER BY rank')
+
+        for row in cursor:
+            yield self._row_to_song(row)
+
+    def find(self, kwords: str) -> list[Song]:
+        """Get the songs where every keyword starts a word of the title or artist
+
+        Each keyword is looked up as a range of the ``song_words`` table,
+        e.g. ``feel`` matches the songs with a word from ``feel`` up to
+        (but not including) ``feel`` followed by the last character.
+
+        :param kwords: keywords, matched ignoring case
+        :type kwords: str
+
+        :return: the matching songs sorted by ascending title
+        :rtype: list[Song]
+        """
+        kword_list = sorted(self._words(kwords))
+        where = ' AND '.join(['path IN (SELECT path FROM song_words WHERE word >= ? AND word < ?)'] * len(kword_list)) or '1'
+        params = [y for x in kword_list for y in (x, x + chr(0x10ffff))]
+
+        cursor = self._conn.execute(f'SELECT {self._COLUMNS} FROM songs WHERE {where} ORDER BY rank', params)
+        return [self._row_to_song(x) for x in cursor]
+
+    def __len__(self) -> int:
+        """Get the number of songs in the index
+
+        The count is only queried again after :py:meth:`sync` changed the index.
+
+        :return: number of songs in the index
+        :rtype: int
+        """
+        if self._num_songs is None:
+            self._num_songs = self._conn.execute('SELECT COUNT(*) FROM songs').fetchone()[0]
 
-        :param idx: current index of the chord to check for its corresponding
-            chord before it
-        :type idx: int
+        return self._num_songs
 
-        :return: a 2-ary ``tuple``, with the first element being the index
-            of the chord before it ``prev_idx``, and the second element
-            being the difference between the ``line``s of the chord at ``idx``
-            and of the chord at ``prev_idx``
-        :rtype: tuple[int, int]
+class CachedSong(Song):
+    """Represents a song of a :py:class:`SongCollection`
+
+    The lyrics of the song are read from the cache file of its collection
+    when they are needed, so they are not parsed as YAML again after being
+    evicted from the lyrics LRU. If the cache has no lyrics for the file as
+    it was when the song was read, they are read from the file instead.
+    """
+    def __init__(self, collection: 'SongCollection', file_path: str, entry: tuple):
+        """Instantiate an object of this class
+
+        This method will instantiate a new header-only :py:class:`CachedSong`
+        from one of the entries of :py:meth:`SongCollection._scan_folder`.
+
+        :param collection: the collection containing the song
+        :type collection: :py:class:`SongCollection`
+        :param file_path: path where the ``.crd.yaml`` file resides
+        :type file_path: str
+        :param entry: the (``mtime_ns``, ``size``, ``header``, ``lyrics_offset``) of the file
+        :type entry: tuple
         """
-        raise NotImplementedError('Stub code!')
+        mtime_ns, size, header, _ = entry
 
-    def __getitem__(self, key):
-        """Get the (line, col) coordinates of a chord
+        self.collection = collection
+        self.file_stat = (mtime_ns, size)
 
-        This function also supports ``slice``s to get a list of coordinates of
-        the chords in that ``slice``.
+        super().__init__(header.get('title', ''), header.get('artist', ''), file_path, header=header)
 
-        :param key: index of the chord(s) to get
-        :type key: int or slice
+    def _read_lyrics_list(self) -> list[dict]:
+        """Read the ``lyrics`` of this song from the cache of its collection
 
-        :return: a ``dict`` with the keys ``line``, ``col``, and ``chord_name``,
-            corresponding to the coordinates. See :py:meth:`~._chord_idx_to_rc` for
-            details.
+        :return: the unprocessed ``lyrics`` key, see :py:meth:`_load_lyrics`
+        :rtype: list[dict]
+        """
+        lyrics = self.collection._read_cached_lyrics(self.file_path, self.file_stat)
+
+        if lyrics is None:
+            return super()._read_lyrics_list()
+
+        return lyrics
+
+class ArchivedSong(Song):
+    """Represents a song stored in a :py:class:`SongArchive`
+
+    The lyrics of the song are read from the archive instead of a
+    ``.crd.yaml`` file when they are needed.
+    """
+    def __init__(self, archive: 'SongArchive', archive_idx: int, header: dict):
+        """Instantiate an object of this class
+
+        This method will instantiate a new header-only :py:class:`ArchivedSong`
+        for the song at ``archive_idx`` in ``archive``.
+
+        :param archive: the archive containing the song
+        :type archive: :py:class:`SongArchive`
+        :param archive_idx: the position of the song in ``archive``
+        :type archive_idx: int
+        :param header: header of the song, see :py:meth:`SongArchive.header`
+        :type header: dict
+        """
+        self.archive = archive
+        self.archive_idx = archive_idx
+
+        super().__init__(header.get('title', ''), header.get('artist', ''), f'{archive.archive_path}#{archive_idx}', header=header)
+
+    def _read_lyrics_list(self) -> list[dict]:
+        """Read the ``lyrics`` of this song from its archive
+
+        :return: the unprocessed ``lyrics`` key, see :py:meth:`_load_lyrics`
+        :rtype: list[dict]
+        """
+        return self.archive.lyrics(self.archive_idx)
+
+class SongArchive:
+    """Represents a single-file songbook archive
+
+    The archive starts with a header and a table with the offset and sizes
+    of each song, followed by the songs in the compact format (see
+    :py:func:`convert_to_compact`), sorted by ascending title. The file is
+    opened through :py:mod:`mmap`, and each song is only deserialized when
+    it is accessed, so opening an archive of thousands of songs only reads
+    its offset table.
+
+    A file that is mapped cannot be replaced or removed on every platform
+    (e.g. Windows), so :py:meth:`write` never touches the data of an
+    archive that may be open. Each write creates a new generation file
+    next to the archive path, and the archive path itself only holds the
+    name of the current generation.
+    """
+    MAGIC = b'SHSB'
+    POINTER_MAGIC = b'SHSP'
+    VERSION = 1
+    _HEADER = struct.Struct('<4sHI')
+    _ENTRY = struct.Struct('<QII')
+
+    def __init__(self, archive_path: str|Path):
+        """Instantiate an object of this class
+
+        This method will instantiate a new :py:class:`SongArchive` by
+        opening the archive at ``archive_path``.
+
+        :param archive_path: path of the archive file
+        :type archive_path: str or Path
+
+        :raise: ValueError when the file is not a songbook archive
+        """
+        self.archive_path = Path(archive_path)
+        self.data_path = self._read_pointer(self.archive_path)
+
+        try:
+            fh = open(self.data_path, 'rb')
+        except FileNotFoundError:
+            # The generation was replaced (and removed) after the pointer was read
+            self.data_path = self._read_pointer(self.archive_path)
+            fh = open(self.data_path, 'rb')
+
+        with fh:
+            try:
+                self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f'Not a songbook archive: {str(archive_path)!r}')
+
+        if len(self._mm) < self._HEADER.size:
+            self.close()
+            raise ValueError(f'Not a songbook archive: {str(archive_path)!r}')
+
+        magic, version, self._num_songs = self._HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f'Not a songbook archive: {str(archive_path)!r}')
+
+        self._songs = {}
+
+    @classmethod
+    def _read_pointer(cls, archive_path: Path) -> Path:
+        """Find the generation file holding the data of an archive
+
+        :classmethod:
+        :param archive_path: path of the archive file
+        :type archive_path: Path
+
+        :return: the generation named in ``archive_path``, or ``archive_path``
+            itself if it holds the data directly
+        :rtype: Path
+
+        :raise: ValueError when the pointer does not name a file next to it
+        """
+        with open(archive_path, 'rb') as fh:
+            pointer = fh.read(4096)
+
+        if not pointer.startswith(cls.POINTER_MAGIC):
+            return archive_path
+
+        data_name = pointer[len(cls.POINTER_MAGIC):].decode('utf-8', errors='replace')
+        if data_name in ('', '.', '..') or Path(data_name).name != data_name:
+            raise ValueError(f'Not a songbook archive: {str(archive_path)!r}')
+
+        return archive_path.with_name(data_name)
+
+    @classmethod
+    def write(cls, archive_path: str|Path, songs: Iterable[Song]) -> int:
+        """Write songs to a new archive
+
+        The songs are written to a new generation file, named after
+        ``archive_path`` with a unique suffix, and ``archive_path`` is then
+        replaced with a pointer to it. An archive that is currently open
+        keeps its own generation, which is never modified. The files of
+        older generations are removed if possible; one that is still
+        mapped (where that prevents it) is removed by a later write.
+
+        :classmethod:
+        :param archive_path: path of the archive file to write
+        :type archive_path: str or Path
+        :param songs: the songs to write, whose lyrics are loaded if needed
+        :type songs: Iterable[Song]
+
+        :return: the number of songs written
+        :rtype: int
+        """
+        records = []
+        for song_obj in songs:
+            header = {
+                'title': song_obj.title,
+                'artist': song_obj.artist,
+                'semitones': song_obj.global_semitones,
+                'time_signature': list(song_obj.time_sig),
+                'lyrics_order': song_obj.lyrics_order,
+            }
+            if song_obj.bpm is not None:
+                header['bpm'] = song_obj.bpm
+
+            lyrics = [
+                {'tag': tag, 'chords': chords, 'text': text}
+                for text, tag, chords in zip(song_obj.lyrics, song_obj.segments, song_obj.chords)
+            ]
+
+            records += [(
+                (song_obj.title.casefold(), str(song_obj.file_path)),
+                json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+                json.dumps(lyrics, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+            )]
+
+        records.sort(key=lambda x: x[0])
+
+        archive_path = Path(archive_path)
+        data_path = archive_path.with_name(f'{archive_path.name}.{uuid.uuid4().hex}.gen')
+        tmp_path = archive_path.with_name(f'{archive_path.name}.{uuid.uuid4().hex}.tmp')
+
+        try:
+            with open(data_path, 'xb') as fh:
+                fh.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, len(records)))
+
+                offset = cls._HEADER.size + cls._ENTRY.size * len(records)
+                for _, header, lyrics in records:
+                    fh.write(cls._ENTRY.pack(offset, len(header), len(lyrics)))
+                    offset += len(header) + len(lyrics)
+
+                for _, header, lyrics in records:
+                    fh.write(header)
+                    fh.write(lyrics)
+
+            # Only the small pointer file is replaced, and it is never mapped
+            with open(tmp_path, 'xb') as fh:
+                fh.write(cls.POINTER_MAGIC + data_path.name.encode('utf-8'))
+
+            os.replace(tmp_path, archive_path)
+        except BaseException:
+            for file_path in (tmp_path, data_path):
+                if file_path.exists():
+                    os.remove(file_path)
+            raise
+
+        for old_path in archive_path.parent.glob(f'{glob.escape(archive_path.name)}.*.gen'):
+            if old_path != data_path:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+
+        return len(records)
+
+    def _entry(self, idx: int) -> tuple[int, int, int]:
+        """Get the (``offset``, ``header_size``, ``lyrics_size``) of a song
+
+        :param idx: the position of the song in the archive
+        :type idx: int
+
+        :return: the entry of the song in the offset table
+        :rtype: tuple[int, int, int]
+        """
+        return self._ENTRY.unpack_from(self._mm, self._HEADER.size + self._ENTRY.size * idx)
+
+    def header(self, idx: int) -> dict:
+        """Deserialize the header of a song
+
+        :param idx: the position of the song in the archive
+        :type idx: int
+
+        :return: the header keys of the song, as in :py:meth:`Song.read_header`
         :rtype: dict
+        """
+        offset, header_size, _ = self._entry(idx)
+        return json.loads(self._mm[offset:offset + header_size])
 
-        .. seealso:: :py:meth:`~._chord_idx_to_rc`
+    def lyrics(self, idx: int) -> list[dict]:
+        """Deserialize the lyrics of a song
+
+        :param idx: the position of the song in the archive
+        :type idx: int
+
+        :return: the unprocessed ``lyrics`` of the song
+        :rtype: list[dict]
         """
-        raise NotImplementedError('Stub code!')
-    
-    def __len__(self):
-        """Return the total number of chords in the song
+        offset, header_size, lyrics_size = self._entry(idx)
+        return json.loads(self._mm[offset + header_size:offset + header_size + lyrics_size])
 
-        :return: an ``int`` of the total number of chords in the song
+    def close(self):
+        """Close the memory map of the archive"""
+        self._mm.close()
+
+    def __getitem__(self, key: int) -> ArchivedSong:
+        """Get the ``key``th song in the archive
+
+        The song is deserialized (header only) on its first access.
+
+        :param key: index of the :py:class:`Song` to retrieve
+        :type key: int
+
+        :return: the song
+        :rtype: :py:class:`ArchivedSong`
+        """
+        if key < 0:
+            key += self._num_songs
+        if not 0 <= key < self._num_songs:
+            raise IndexError('song index out of range')
+
+        song_obj = self._songs.get(key)
+        if song_obj is None:
+            song_obj = ArchivedSong(self, key, self.header(key))
+            self._songs[key] = song_obj
+
+        return song_obj
+
+    def __len__(self) -> int:
+        """Get the number of songs in the archive
+
+        :return: number of songs in the archive
         :rtype: int
         """
-        raise NotImplementedError('Stub code!')
+        return self._num_songs
+
+# Errors raised by a song file that cannot be read, e.g. invalid YAML or
+# a header value of the wrong type. Only that file is skipped
+SONG_FILE_ERRORS = (OSError, ValueError, TypeError, KeyError, AttributeError, yaml.YAMLError)
+
+def _read_song_file(file_path: str) -> tuple[dict, list[dict]]:
+    """Read the header and lyrics of a ``.crd.yaml`` file
+
+    :param file_path: path where the ``.crd.yaml`` file resides
+    :type file_path: str
+
+    :return: the header (see :py:meth:`Song.read_header`) and the
+        unprocessed ``lyrics`` key of the file
+    :rtype: tuple[dict, list[dict]]
+
+    :raise: any of :py:data:`SONG_FILE_ERRORS` when the file cannot be read
+    """
+    header = Song.read_header(file_path)
+    return header, Song.from_header(header, file_path)._read_lyrics_list()
+
+def _parse_song_file(file_path: str) -> tuple[dict, list[dict]]:
+    """Parse the header and lyrics of a ``.crd.yaml`` file
+
+    This is a module-level function so that it can be sent to the worker
+    processes of :py:meth:`SongCollection.get_songs_from_folder`. A file
+    that cannot be read does not stop the other files from being parsed,
+    so the error is returned instead of raised.
+
+    :param file_path: path where the ``.crd.yaml`` file resides
+    :type file_path: str
+
+    :return: the header (see :py:meth:`Song.read_header`) and the
+        unprocessed ``lyrics`` key of the file, or ``None`` and a
+        description of the error if the file cannot be read
+    :rtype: tuple[dict, list[dict]]
+    """
+    try:
+        return _read_song_file(file_path)
+    except SONG_FILE_ERRORS as e:
+        return None, f'{type(e).__name__}: {e}'.splitlines()[0]
 
 class SongCollection:
     """Represents a collection of songs
+
+    Parsed songs are saved to a cache file so that unchanged ``.crd.yaml``
+    files do not need to be parsed again the next time the folder is read.
+    A cached song is only used if the path, modification time, and size
+    of its file are the same as when it was cached. The cache only holds
+    JSON, so reading a cache file never runs any code.
+
+    When at least :py:attr:`PARALLEL_MIN_FILES` files need to be parsed,
+    they are split across a pool of worker processes. Files that cannot be
+    read are left out of the collection, and the error of each one is kept
+    in :py:attr:`errors` until the next scan of the folder.
+
+    A collection can also be read from a :py:class:`SongArchive` instead of
+    a folder, in which case each song is only read when it is accessed.
     """
-    def __init__(self, song_path: str|Path='./songs'):
-        raise NotImplementedError('Stub code!')
-    
+    CACHE_VERSION = 2
+    CACHE_COMPACT_FACTOR = 2
+    PARALLEL_MIN_FILES = 64
+    SEARCH_MIN_SCORE = 0.5
+    PROGRESSION_NGRAM_SIZE = 3
+
+    def __init__(self, song_path: str|Path='./songs', cache_path: str|Path=None, use_cache: bool=True, index_path: str|Path=None, num_workers: int=None, archive_path: str|Path=None):
+        """Instantiate an object of this class
+
+        This method will instantiate a new :py:class:`SongCollection`
+        object and read the songs inside ``song_path``.
+
+        :param song_path: folder containing the ``.crd.yaml`` files
+        :type song_path: str or Path
+        :param cache_path: file where parsed songs are cached. By default,
+            this is a file named after ``song_path`` inside :py:func:`user_cache_dir`
+        :type cache_path: str or Path
+        :param use_cache: whether to read and write the cache file
+        :type use_cache: bool
+        :param index_path: if given, the songs are kept in a :py:class:`SongIndex`
+            at this path instead of in memory
+        :type index_path: str or Path
+        :param num_workers: number of worker processes used to parse files.
+            By default, this is the number of CPUs; 1 parses every file in
+            this process
+        :type num_workers: int
+        :param archive_path: if given, the songs are read from the
+            :py:class:`SongArchive` at this path instead of ``song_path``
+        :type archive_path: str or Path
+        """
+        self.song_path = Path(song_path)
+        self.cache_path = Path(cache_path) if cache_path is not None else self.default_cache_path(self.song_path)
+        self.use_cache = use_cache
+        self.index = SongIndex(index_path) if index_path is not None else None
+        self.num_workers = num_workers if num_workers is not None else (os.cpu_count() or 1)
+        self.archive_path = Path(archive_path) if archive_path is not None else None
+        self.archive = None
+
+        self._songs = []
+        self._song_keys = []
+        self._song_by_path = {}
+        self._title_index = song_search.TrigramIndex()
+        self._lyric_index = None
+        self._lyric_songs = {}
+        self._chord_index = None
+        self._chord_songs = {}
+        self._entries = None
+        self._cache_records = 0
+        self.errors = {}
+
+        # Opening an archive (or syncing an index) does not build any song
+        # until it is accessed
+        if self.archive_path is not None:
+            self._open_archive()
+        elif self.index is not None:
+            self.errors = self.index.sync(self.song_path)
+        else:
+            self.get_songs_from_folder(refresh=True)
+
+    def _open_archive(self):
+        """Open (or open again) the archive of this collection
+
+        The title, lyric, and chord indexes of the previous archive are
+        discarded. The previous archive itself is not closed, since the
+        songs already returned from it may still need to load their lyrics;
+        its memory map is released once none of them is referenced.
+        """
+        self.archive = SongArchive(self.archive_path)
+        self._title_index = song_search.TrigramIndex()
+        self._lyric_index = None
+        self._chord_index = None
+
+    @staticmethod
+    def default_cache_path(song_path: str|Path) -> Path:
+        """Get the default cache file of a song folder
+
+        Every folder has its own file inside :py:func:`user_cache_dir`, so
+        nothing is ever written to the song folder itself.
+
+        :param song_path: folder containing the ``.crd.yaml`` files
+        :type song_path: str or Path
+
+        :return: the path of the cache file
+        :rtype: Path
+        """
+        digest = hashlib.sha1(str(Path(song_path).resolve()).encode('utf-8')).hexdigest()
+        return user_cache_dir() / f'{digest[:16]}.jsonl'
+
+    def _load_cache(self) -> dict:
+        """Read the cache file of this collection
+
+        The cache file is in JSON Lines: a line with the version of the
+        cache, then two lines for each song, ``[path, mtime_ns, size,
+        header]`` and ``[path, mtime_ns, size, lyrics]``. Only the headers
+        are parsed; the lyrics are read by :py:meth:`_read_cached_lyrics`
+        when a song needs them. Songs that changed are appended to the file
+        (see :py:meth:`_save_cache`), so a later record of a file replaces
+        the earlier ones, and a ``[path, null, null, null]`` line without
+        lyrics marks a file that was removed.
+
+        :return: a dictionary with the file paths as keys and tuples
+            (``mtime_ns``, ``size``, ``header``, ``lyrics_offset``) as values,
+            where ``lyrics_offset`` is the offset of the lyrics line in the
+            cache file. An empty dictionary is returned if the cache is
+            missing, unreadable, or of a different version.
+        :rtype: dict
+        """
+        if not self.use_cache:
+            return {}
+
+        entries = {}
+        num_records = 0
+
+        try:
+            with open(self.cache_path, 'rb') as fh:
+                if json.loads(fh.readline()) != {'version': self.CACHE_VERSION}:
+                    return {}
+
+                for line in fh:
+                    file_path, mtime_ns, size, header = json.loads(line)
+                    num_records += 1
+
+                    if header is None:
+                        entries.pop(file_path, None)
+                        continue
+
+                    entries[file_path] = (mtime_ns, size, header, fh.tell())
+                    fh.readline()
+        except (OSError, ValueError, TypeError):
+            return {}
+
+        self._cache_records = num_records
+        return entries
+
+    @staticmethod
+    def _cache_line(record: list) -> bytes:
+        """Serialize a line of the cache file
+
+        :param record: the ``[path, mtime_ns, size, header]`` or
+            ``[path, mtime_ns, size, lyrics]`` to write
+        :type record: list
+
+        :return: the line, with its line ending
+        :rtype: bytes
+
+        :raise: TypeError or ValueError when the record cannot be written as JSON
+        """
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+    @staticmethod
+    def _lyrics_line_prefix(file_path: str, mtime_ns: int, size: int) -> bytes:
+        """Get the start of the lyrics line of a file in the cache
+
+        :param file_path: path of the file
+        :type file_path: str
+        :param mtime_ns: modification time of the file
+        :type mtime_ns: int
+        :param size: size of the file
+        :type size: int
+
+        :return: the line up to the lyrics, used to check that the line
+            belongs to the file as it is now
+        :rtype: bytes
+        """
+        return json.dumps([file_path, mtime_ns, size], ensure_ascii=False, separators=(',', ':'))[:-1].encode('utf-8') + b','
+
+    def _read_cached_lyrics(self, file_path: str, file_stat: tuple[int, int]) -> list[dict]:
+        """Read the lyrics of a file from the cache file of this collection
+
+        :param file_path: path of the file
+        :type file_path: str
+        :param file_stat: the ``mtime_ns`` and ``size`` of the file when it was read
+        :type file_stat: tuple[int, int]
+
+        :return: the unprocessed ``lyrics`` key of the file, or ``None`` if
+            the cache does not have the lyrics of the file as it was then
+        :rtype: list[dict]
+        """
+        entry = self._entries.get(file_path) if self._entries is not None else None
+        if entry is None or tuple(entry[:2]) != tuple(file_stat) or entry[3] is None:
+            return None
+
+        try:
+            with open(self.cache_path, 'rb') as fh:
+                fh.seek(entry[3])
+                line = fh.readline()
+        except OSError:
+            return None
+
+        if not line.startswith(self._lyrics_line_prefix(file_path, *file_stat)):
+            return None
+
+        try:
+            return json.loads(line)[3]
+        except (ValueError, IndexError):
+            return None
+
+    def _save_cache(self, entries: dict, parsed: dict) -> dict:
+        """Update the cache file of this collection
+
+        Only the songs that were parsed and the files that were removed
+        since the previous scan are appended to the cache file (see
+        :py:meth:`_append_cache`), so a refresh that changed a few files
+        does not copy the whole cache. Once the file holds more than
+        :py:attr:`CACHE_COMPACT_FACTOR` times as many records as there are
+        songs, it is compacted by writing it again (see :py:meth:`_write_cache`).
+
+        :param entries: the entries of the scan, see :py:meth:`_load_cache`
+        :type entries: dict
+        :param parsed: the unprocessed ``lyrics`` of the files that were parsed
+        :type parsed: dict
+
+        :return: ``entries`` with the offsets of the lyrics in the cache file
+        :rtype: dict
+        """
+        if not self.use_cache:
+            return entries
+
+        removed = [x for x in self._entries if x not in entries] if self._entries is not None else []
+        num_records = self._cache_records + len(removed) + len(parsed)
+
+        if self._cache_records > 0 and num_records <= self.CACHE_COMPACT_FACTOR * len(entries):
+            new_entries = self._append_cache(entries, parsed, removed)
+
+            if new_entries is not None:
+                self._cache_records = num_records
+                return new_entries
+
+        return self._write_cache(entries, parsed)
+
+    def _append_cache(self, entries: dict, parsed: dict, removed: list[str]) -> dict:
+        """Append the changes of a scan to the cache file of this collection
+
+        A song whose header cannot be written as JSON is not appended, so
+        its earlier record no longer matches the file and it is parsed
+        again the next time. If its lyrics cannot be written, ``null``
+        lyrics are appended instead and they are read from the file.
+
+        :param entries: the entries of the scan, see :py:meth:`_load_cache`
+        :type entries: dict
+        :param parsed: the unprocessed ``lyrics`` of the files that were parsed
+        :type parsed: dict
+        :param removed: paths of the files that are no longer in the folder
+        :type removed: list[str]
+
+        :return: ``entries`` with the offsets of the appended lyrics, or
+            ``None`` if the cache file could not be appended to
+        :rtype: dict
+        """
+        new_entries = dict(entries)
+
+        try:
+            with open(self.cache_path, 'ab') as fh:
+                for file_path in removed:
+                    fh.write(self._cache_line([file_path, None, None, None]))
+
+                for file_path, lyrics in parsed.items():
+                    mtime_ns, size, header, _ = entries[file_path]
+
+                    try:
+                        header_line = self._cache_line([file_path, mtime_ns, size, header])
+                    except (TypeError, ValueError):
+                        continue
+
+                    try:
+                        lyrics_line = self._cache_line([file_path, mtime_ns, size, lyrics])
+                    except (TypeError, ValueError):
+                        lyrics_line = self._cache_line([file_path, mtime_ns, size, None])
+
+                    fh.write(header_line)
+                    new_entries[file_path] = (mtime_ns, size, header, fh.tell())
+                    fh.write(lyrics_line)
+        except OSError:
+            return None
+
+        return new_entries
+
+    def _write_cache(self, entries: dict, parsed: dict) -> dict:
+        """Write the whole cache file of this collection again
+
+        The cache is written to a temporary file first and then moved
+        in place so that a partially-written cache is never read. The
+        lyrics of the files that were not parsed are copied from the
+        current cache file, and the records that were replaced or removed
+        are dropped. Songs whose lyrics cannot be written as JSON or copied
+        are left out, so they are parsed again the next time.
+
+        :param entries: the entries of the scan, see :py:meth:`_load_cache`
+        :type entries: dict
+        :param parsed: the unprocessed ``lyrics`` of the files that were parsed
+        :type parsed: dict
+
+        :return: ``entries`` with the offsets of the lyrics in the new cache file
+        :rtype: dict
+        """
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        new_entries = {}
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+            try:
+                old_fh = open(self.cache_path, 'rb')
+            except OSError:
+                old_fh = None
+
+            with open(tmp_path, 'wb') as fh:
+                fh.write(json.dumps({'version': self.CACHE_VERSION}).encode('utf-8') + b'\n')
+
+                for file_path, (mtime_ns, size, header, lyrics_offset) in entries.items():
+                    prefix = self._lyrics_line_prefix(file_path, mtime_ns, size)
+
+                    if file_path in parsed:
+                        try:
+                            lyrics_line = self._cache_line([file_path, mtime_ns, size, parsed[file_path]])
+                        except (TypeError, ValueError):
+                            lyrics_line = None
+                    elif old_fh is not None and lyrics_offset is not None:
+                        old_fh.seek(lyrics_offset)
+                        lyrics_line = old_fh.readline()
+                    else:
+                        lyrics_line = None
+
+                    try:
+                        header_line = self._cache_line([file_path, mtime_ns, size, header])
+                    except (TypeError, ValueError):
+                        header_line = None
+
+                    if header_line is None or lyrics_line is None or not lyrics_line.startswith(prefix):
+                        new_entries[file_path] = (mtime_ns, size, header, None)
+                        continue
+
+                    fh.write(header_line)
+                    new_entries[file_path] = (mtime_ns, size, header, fh.tell())
+                    fh.write(lyrics_line)
+
+            if old_fh is not None:
+                old_fh.close()
+
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # The songs read from the old cache file keep using it
+            return entries
+
+        self._cache_records = len([x for x in new_entries.values() if x[3] is not None])
+        return new_entries
+
+    def _parse_files(self, file_paths: list[str]) -> list[tuple[dict, list[dict]]]:
+        """Parse several ``.crd.yaml`` files, in parallel if worthwhile
+
+        A process pool is only used if there are at least
+        :py:attr:`PARALLEL_MIN_FILES` files and more than one worker.
+        If the pool cannot be used (e.g. the platform does not support
+        it), the files are parsed in this process instead. Errors of
+        single files are returned by :py:func:`_parse_song_file`, so only
+        a failure of the pool itself gets here.
+
+        :param file_paths: paths of the files to parse
+        :type file_paths: list[str]
+
+        :return: the result of :py:func:`_parse_song_file` for each file,
+            in the same order as ``file_paths``
+        :rtype: list[tuple[dict, list[dict]]]
+        """
+        num_workers = min(self.num_workers, len(file_paths))
+
+        if num_workers > 1 and len(file_paths) >= self.PARALLEL_MIN_FILES:
+            chunksize = max(1, len(file_paths) // (num_workers * 4))
+
+            try:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+                    return list(executor.map(_parse_song_file, file_paths, chunksize=chunksize))
+            except (OSError, NotImplementedError, concurrent.futures.process.BrokenProcessPool):
+                pass
+
+        return [_parse_song_file(x) for x in file_paths]
+
     def song_list(self) -> list[Song]:
         """Get the internal songlist in this collection
 
@@ -568,16 +2548,55 @@ class SongCollection:
         :return: a list of :py:class:`Song`s found inside the folder
         :rtype: list[Song]
         """
-        raise NotImplementedError('Stub code!')
+        if self.index is not None:
+            return self.index.songs()
+
+        if self.archive is not None:
+            return [self.archive[x] for x in range(len(self.archive))]
+
+        return list(self._songs)
+
+    def render_lines(self) -> Iterable[str]:
+        """Generate the lines of every song in this collection as text
+
+        The songs are rendered in the same order as :py:meth:`song_list`
+        using :py:meth:`Song.render_lines`, with two empty lines between
+        songs. The lyrics of each song are read as it is reached, so only
+        the songs still in the lyrics LRU are kept in memory.
+
+        :return: an ``Iterable`` of lines, without line endings
+        :rtype: Iterable[str]
+        """
+        if self.index is not None:
+            songs = self.index.iter_songs()
+        elif self.archive is not None:
+            songs = (self.archive[x] for x in range(len(self.archive)))
+        else:
+            songs = list(self._songs)
+
+        for idx, song_obj in enumerate(songs):
+            if idx > 0:
+                yield ''
+                yield ''
+
+            yield from song_obj.render_lines()
 
     def get_songs_from_folder(self, refresh: bool=False) -> list[Song]:
         """Get songs from a specified folder
 
-        This method looks non-recursively for ``.crd.yaml`` files inside
-        the folder where this collection is currently set and returns it.
+        This method looks non-recursively for ``.crd.yaml`` files (or their
+        compact ``.crd.jsonl`` versions, see :py:func:`convert_to_compact`)
+        inside the folder where this collection is currently set and returns it.
         Optionally, the ``refresh`` flag can be set to force the collection
         to replace its current contents with the one read by this method.
 
+        Files that did not change since they were last read (or cached)
+        are not parsed again. When refreshing, only the songs of files that
+        were added, removed, or changed are updated in the sorted list of
+        this collection. If this collection
+        uses a :py:class:`SongIndex`, the index is synced with the folder
+        and header-only songs are returned instead.
+
         The method returns the list of :py:class:`Song`s sorted by ascending
         title alphabetically.
 
@@ -587,24 +2606,401 @@ class SongCollection:
         :return: a list of :py:class:`Song`s found inside the folder
         :rtype: list[Song]
         """
-        raise NotImplementedError('Stub code!')
-    
+        if self.index is not None:
+            # The index always mirrors the folder, so it is refreshed either way
+            self.errors = self.index.sync(self.song_path)
+            self._lyric_index = None
+            self._chord_index = None
+            return self.index.songs()
+
+        if self.archive_path is not None:
+            # The archive is opened again to pick up a rebuilt file
+            if refresh:
+                self._open_archive()
+
+            return self.song_list()
+
+        # Without refreshing, the scan is not kept so that the files parsed
+        # here are still seen as changed by the next refresh
+        entries, parsed = self._scan_folder(keep=refresh)
+
+        if not refresh:
+            songs = [
+                self._song_by_path[x] if x in self._song_by_path and x not in parsed else self._new_song(x, entries[x], parsed.get(x))
+                for x in entries
+            ]
+            songs.sort(key=self._sort_key)
+            return songs
+
+        if len(self._songs) == 0:
+            self._songs = [self._new_song(x, entry, parsed.get(x)) for x, entry in entries.items()]
+            self._songs.sort(key=self._sort_key)
+            self._song_keys = [self._sort_key(x) for x in self._songs]
+            self._song_by_path = {x.file_path: x for x in self._songs}
+
+            # The lyric and chord indexes may already exist, e.g. if they
+            # were searched while the folder was empty
+            for song_obj in self._songs:
+                self._title_index.add(song_obj.file_path, f'{song_obj.title} {song_obj.artist}')
+
+                if self._lyric_index is not None:
+                    self._index_lyrics(song_obj)
+
+                if self._chord_index is not None:
+                    self._index_chords(song_obj)
+
+            return list(self._songs)
+
+        # Only touch the songs that were removed, added, or changed
+        for file_path in [x for x in self._song_by_path if x not in entries or x in parsed]:
+            song_obj = self._song_by_path.pop(file_path)
+            idx = bisect.bisect_left(self._song_keys, self._sort_key(song_obj))
+            del self._songs[idx]
+            del self._song_keys[idx]
+            self._title_index.remove(file_path)
+
+            if self._lyric_index is not None:
+                self._lyric_index.remove(file_path)
+                del self._lyric_songs[file_path]
+
+            if self._chord_index is not None:
+                self._chord_index.remove(file_path)
+                del self._chord_songs[file_path]
+
+        for file_path, entry in entries.items():
+            if file_path in self._song_by_path:
+                continue
+
+            song_obj = self._new_song(file_path, entry, parsed.get(file_path))
+            key = self._sort_key(song_obj)
+            idx = bisect.bisect_right(self._song_keys, key)
+            self._songs.insert(idx, song_obj)
+            self._song_keys.insert(idx, key)
+            self._song_by_path[file_path] = song_obj
+            self._title_index.add(file_path, f'{song_obj.title} {song_obj.artist}')
+
+            if self._lyric_index is not None:
+                self._index_lyrics(song_obj)
+
+            if self._chord_index is not None:
+                self._index_chords(song_obj)
+
+        return list(self._songs)
+
+    @staticmethod
+    def _sort_key(song_obj: Song) -> tuple[str, str]:
+        """Get the key by which the songs in this collection are sorted
+
+        :param song_obj: the song to get the key of
+        :type song_obj: Song
+
+        :return: the case-insensitive title and the path of the song
+        :rtype: tuple[str, str]
+        """
+        return song_obj.title.casefold(), str(song_obj.file_path)
+
+    def _new_song(self, file_path: str, entry: tuple, lyrics: list[dict]=None) -> Song:
+        """Build a :py:class:`Song` from one of the entries of :py:meth:`_scan_folder`
+
+        :param file_path: path where the ``.crd.yaml`` file resides
+        :type file_path: str
+        :param entry: the (``mtime_ns``, ``size``, ``header``, ``lyrics_offset``) of the file
+        :type entry: tuple
+        :param lyrics: the unprocessed ``lyrics`` of the file if it was just
+            parsed. Otherwise, the song is header-only
+        :type lyrics: list[dict]
+
+        :return: the song
+        :rtype: :py:class:`CachedSong`
+        """
+        song_obj = CachedSong(self, file_path, entry)
+
+        if lyrics is not None:
+            song_obj._load_lyrics(lyrics)
+
+        return song_obj
+
+    def _scan_folder(self, keep: bool=True) -> tuple[dict, dict]:
+        """Read the ``.crd.yaml`` files inside the folder of this collection
+
+        The folder is compared with the result of the previous kept scan (or
+        the cache file, for the first scan) using the modification time and
+        size of each file. Only the files that are new or changed are parsed.
+
+        :param keep: whether to keep the result of this scan for the next
+            one and write it to the cache file
+        :type keep: bool
+
+        Only the headers of the files are kept in memory (see
+        :py:meth:`_load_cache`); the lyrics of each song are kept in the
+        lyrics LRU of :py:class:`Song` like any other song.
+
+        :return: a dictionary with the file paths as keys and tuples
+            (``mtime_ns``, ``size``, ``header``, ``lyrics_offset``) as values,
+            and a dictionary with the unprocessed ``lyrics`` of the files that
+            had to be parsed
+        :rtype: tuple[dict, dict]
+        """
+        if self._entries is None:
+            self._entries = self._load_cache()
+
+        entries = {}
+        to_parse = []
+
+        if self.song_path.is_dir():
+            for dir_entry in _song_files(self.song_path):
+                stat = dir_entry.stat()
+                entry = self._entries.get(dir_entry.path)
+
+                if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                    entries[dir_entry.path] = entry
+                else:
+                    to_parse += [(dir_entry.path, stat)]
+
+        parsed = {}
+        errors = {}
+        for (file_path, stat), (header, lyrics) in zip(to_parse, self._parse_files([x[0] for x in to_parse])):
+            # Bad files are left out until they change, like removed ones
+            if header is None:
+                errors[file_path] = lyrics
+                continue
+
+            entries[file_path] = (stat.st_mtime_ns, stat.st_size, header, None)
+            parsed[file_path] = lyrics
+
+        self.errors = errors
+
+        if keep:
+            # Nothing was parsed, so the entries can only differ if files were removed
+            if len(to_parse) > 0 or len(entries) != len(self._entries):
+                entries = self._save_cache(entries, parsed)
+
+            self._entries = entries
+
+        return entries, parsed
+
     def find_songs(self, kwords: str) -> list[Song]:
         """Find songs in this collection that match certain keywords
 
         This method looks for songs that match the keywords ``kwords``.
-        It then returns the list of :py:class:`Song`s sorted by ascending
-        title alphabetically. It *does not* change the internal songlist
+        It then returns the list of :py:class:`Song`s sorted from the best
+        match to the worst match, and by ascending title alphabetically
+        for equally good matches. It *does not* change the internal songlist
         in the collection.
 
+        Songs are matched by the trigrams of their title and artist (see
+        :py:class:`~song_search.TrigramIndex`), so keywords with small typos
+        still match. If ``kwords`` is empty, every song is returned. If this
+        collection uses a :py:class:`SongIndex`, a song matches only if every
+        keyword starts a word of its title or artist, ignoring case.
+
         :param kwords: keywords to use to search for song names in this collection
         :type kwords: str
 
         :return: a sorted list of :py:class:`Song`s matching the ``kwords``
         :rtype: list[Song]
         """
-        raise NotImplementedError('Stub code!')
-    
+        if self.index is not None:
+            return self.index.find(kwords)
+
+        if self.archive is not None:
+            return self._find_archived_songs(kwords)
+
+        if kwords.strip() == '':
+            return list(self._songs)
+
+        found = [(self._song_by_path[x], score) for x, score in self._title_index.search(kwords, self.SEARCH_MIN_SCORE)]
+        found.sort(key=lambda x: (-x[1], self._sort_key(x[0])))
+
+        return [x[0] for x in found]
+
+    def _find_archived_songs(self, kwords: str) -> list[Song]:
+        """Find songs in the archive of this collection that match certain keywords
+
+        The title index is built from the headers in the archive the first
+        time this method is called. See :py:meth:`find_songs`.
+
+        :param kwords: keywords to use to search for song names in the archive
+        :type kwords: str
+
+        :return: a sorted list of :py:class:`Song`s matching the ``kwords``
+        :rtype: list[Song]
+        """
+        if kwords.strip() == '':
+            return self.song_list()
+
+        if len(self._title_index) == 0:
+            for idx in range(len(self.archive)):
+                header = self.archive.header(idx)
+                self._title_index.add(idx, f'{header.get("title", "")} {header.get("artist", "")}')
+
+        # The archive is already sorted by title
+        found = self._title_index.search(kwords, self.SEARCH_MIN_SCORE)
+        found.sort(key=lambda x: (-x[1], x[0]))
+
+        return [self.archive[x] for x, _ in found]
+
+    def _index_lyrics(self, song_obj: Song):
+        """Add the lyric lines of a song to the lyric index
+
+        Songs whose lyrics are not loaded are read without loading them,
+        so that building the index does not fill the lyrics LRU.
+
+        :param song_obj: the song to add
+        :type song_obj: Song
+        """
+        if song_obj.is_lyrics_loaded():
+            segments = song_obj.entries()
+        else:
+            segments = [ChordedLyricSegment(x['tag'], x['text'], x['chords']) for x in song_obj._read_lyrics_list()]
+
+        lines = []
+        for segment_idx, segment in enumerate(segments):
+            for line_idx, line in enumerate(segment.text):
+                lines += [((segment_idx, segment.name, line_idx), line)]
+
+        self._lyric_index.add(song_obj.file_path, lines)
+        self._lyric_songs[song_obj.file_path] = song_obj
+
+    def find_lyrics(self, phrase: str) -> list[dict]:
+        """Find the lyric lines in this collection containing a phrase
+
+        A lyric line matches if the words in ``phrase`` appear in it next
+        to each other and in the same order, ignoring case and punctuation.
+        The lyric index is built the first time this method is called and
+        is kept up to date when the collection is refreshed.
+
+        :param phrase: the words to look for, e.g. ``shooting star``
+        :type phrase: str
+
+        :return: a list of dictionaries, with each dictionary containing four
+            keys ``song``, ``segment``, ``tag``, and ``line``. This is read as:
+            ``phrase`` appears in ``song`` at the ``line``th lyric line of its
+            ``segment``th :py:class:`ChordedLyricSegment`, named ``tag``.
+        :rtype: list[dict]
+        """
+        if self._lyric_index is None:
+            self._lyric_index = song_search.PhraseIndex()
+            self._lyric_songs = {}
+
+            for song_obj in self.song_list():
+                self._index_lyrics(song_obj)
+
+        found = []
+        for file_path, (segment_idx, tag, line_idx) in self._lyric_index.search(phrase):
+            song_obj = self._lyric_songs[file_path]
+            found += [{'song': song_obj, 'segment': segment_idx, 'tag': tag, 'line': line_idx}]
+
+        found.sort(key=lambda x: (self._sort_key(x['song']), x['segment'], x['line']))
+        return found
+
+    @staticmethod
+    def _progression_tokens(chords: Iterable[str], intern: bool=True) -> list[tuple]:
+        """Convert chords into tokens that do not depend on the key of the song
+
+        Each chord becomes a tuple of the interval (in semitones, from 0 to 11)
+        from the root of the previous chord to its root, and the integer
+        notation of its chord type. For example, both ``E G#7 C#m`` and
+        ``F A7 Dm`` become::
+
+            [(None, (0, 4, 7)), (4, (0, 4, 7, 10)), (5, (0, 3, 7))]
+
+        The first chord, and any chord after an invalid one, has no interval.
+        Invalid chords become ``None``.
+
+        :param chords: the chords to convert
+        :type chords: Iterable[str]
+        :param intern: whether to split the chords through the
+            :py:class:`~uke.ChordTable`. Chords typed by the user should not
+            be interned, as the table is never emptied
+        :type intern: bool
+
+        :return: the token of each chord
+        :rtype: list[tuple]
+        """
+        tokens = []
+        prev_note_idx = None
+
+        for chord in chords:
+            try:
+                if intern:
+                    root, accidental, chord_type = uke.ChordTable.split(uke.ChordTable.intern(chord))
+                else:
+                    root, accidental, chord_type = uke.ChordedInstrument.split_chord(chord)
+            except ValueError:
+                tokens += [None]
+                prev_note_idx = None
+                continue
+
+            note_idx = uke.ChordedInstrument.get_note_index(root + accidental)
+            interval = (note_idx - prev_note_idx) % 12 if prev_note_idx is not None else None
+
+            tokens += [(interval, tuple(uke.ChordedInstrument.chord_maps[chord_type]))]
+            prev_note_idx = note_idx
+
+        return tokens
+
+    def _index_chords(self, song_obj: Song):
+        """Add the chords of a song to the chord progression index
+
+        :param song_obj: the song to add
+        :type song_obj: Song
+        """
+        if song_obj.is_lyrics_loaded():
+            segment_chords = song_obj.chords
+        else:
+            segment_chords = [x['chords'] for x in song_obj._read_lyrics_list()]
+
+        chords = []
+        for each_chords in segment_chords:
+            chords += each_chords.split()
+
+        self._chord_index.add(song_obj.file_path, self._progression_tokens(chords))
+        self._chord_songs[song_obj.file_path] = song_obj
+
+    def find_progression(self, chords: str) -> list[dict]:
+        """Find the songs in this collection containing a chord progression
+
+        The chords of a song are matched in the order they are played,
+        across its :py:class:`ChordedLyricSegment`s. The match does not depend
+        on the key of the song: ``E G#7 C#m`` also matches ``F A7 Dm`` since
+        the roots of both progressions are 4 and then 5 semitones apart
+        and the chord types are the same. The chord progression index is
+        built the first time this method is called and is kept up to date
+        when the collection is refreshed.
+
+        :param chords: the chords to look for, separated by spaces
+        :type chords: str
+
+        :return: a list of dictionaries, with each dictionary containing two
+            keys ``song`` and ``chord``. This is read as: the progression
+            starts at the ``chord``th chord of ``song``.
+        :rtype: list[dict]
+
+        :raise: ValueError when one of the ``chords`` is invalid according to
+            :py:meth:`~uke.ChordedInstrument.split_chord`
+        """
+        # The query is not interned so that searching does not grow the ChordTable
+        chord_list = chords.split()
+        for chord in chord_list:
+            uke.ChordedInstrument.split_chord(chord)
+
+        if self._chord_index is None:
+            self._chord_index = song_search.SequenceIndex(n=self.PROGRESSION_NGRAM_SIZE)
+            self._chord_songs = {}
+
+            for song_obj in self.song_list():
+                self._index_chords(song_obj)
+
+        query = self._progression_tokens(chord_list, intern=False)
+        found = [
+            {'song': self._chord_songs[file_path], 'chord': start}
+            for file_path, start in self._chord_index.search(query, match_first=lambda x, y: x[1] == y[1])
+        ]
+
+        found.sort(key=lambda x: (self._sort_key(x['song']), x['chord']))
+        return found
+
     def __getitem__(self, key):
         """Get the ``key``th song in this collection
 
@@ -620,7 +3016,29 @@ class SongCollection:
             (if key is slice) matching the indices
         :rtype: Song or list[Song]
         """
-        raise NotImplementedError('Stub code!')
+        if self.archive is not None:
+            if isinstance(key, slice):
+                return [self.archive[x] for x in range(*key.indices(len(self.archive)))]
+
+            return self.archive[key]
+
+        if self.index is None:
+            return self._songs[key]
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self.index))
+            if step == 1:
+                return self.index.songs(start, max(stop - start, 0))
+
+            return self.index.songs()[key]
+
+        num_songs = len(self.index)
+        if key < 0:
+            key += num_songs
+        if not 0 <= key < num_songs:
+            raise IndexError('song index out of range')
+
+        return self.index.songs(key, 1)[0]
 
     def __len__(self) -> int:
         """Get the number of :py:class:`Song`s in this collection
@@ -628,4 +3046,10 @@ class SongCollection:
         :return: number of :py:class:`Song`s in this collection
         :rtype: int
         """
-        raise NotImplementedError('Stub code!')
+        if self.index is not None:
+            return len(self.index)
+
+        if self.archive is not None:
+            return len(self.archive)
+
+        return len(self._songs)
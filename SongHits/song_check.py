@@ -0,0 +1,188 @@
+# Import for type hints
+from collections.abc import Iterable
+
+# Built-in modules
+import argparse
+import concurrent.futures
+import os
+import sys
+from pathlib import Path
+
+# pip downlodeable modules
+import yaml
+
+# Local modules
+import song
+from uke import ChordedInstrument
+
+def validate_segment(segment: dict) -> list[str]:
+    """Check a segment of the ``lyrics`` key of a song file
+
+    The checks are the ones :py:class:`song.ChordedLyricSegment` relies on:
+
+    * the segment has a ``tag``, ``text``, and ``chords``
+    * the lines of ``text`` alternate between chord annotations (only
+      durations and spaces) and lyrics, starting with an annotation. Every
+      annotation is followed by a line of lyrics, which is empty for an
+      instrumental line, and stanzas may be separated by a pair of empty lines
+    * there are as many chords as durations in the annotation lines
+    * every chord is supported by :py:meth:`uke.ChordedInstrument.split_chord`
+
+    :param segment: a segment of the ``lyrics`` key
+    :type segment: dict
+
+    :return: a description of each problem found, empty if there is none
+    :rtype: list[str]
+    """
+    if not isinstance(segment, dict):
+        return ['not a mapping']
+
+    problems = []
+    for key in ('tag', 'text', 'chords'):
+        if not isinstance(segment.get(key), str):
+            problems += [f'missing or non-string {key!r}']
+
+    if len(problems) > 0:
+        return problems
+
+    lines = segment['text'].split('\n')
+    num_text_lines = len(lines)
+    while len(lines) > 0 and lines[-1].strip() == '':
+        lines.pop()
+
+    num_durs = 0
+    for idx, line in enumerate(lines, start=1):
+        is_durations = line.strip() != '' and line.replace(' ', '').isdigit()
+
+        if idx % 2 == 0:
+            # The last line can only be lyrics, e.g. "1999"
+            if is_durations and idx < len(lines):
+                problems += [f'text line {idx}: expected lyrics, found chord durations {line.strip()!r}']
+        elif line.strip() == '':
+            # An empty pair of lines separates stanzas
+            if idx < len(lines) and lines[idx].strip() != '':
+                problems += [f'text line {idx}: expected chord durations, found an empty line']
+        elif not is_durations:
+            problems += [f'text line {idx}: expected chord durations, found {line.strip()!r}']
+        else:
+            # Even the empty lyrics of an instrumental line need their line
+            if idx == num_text_lines:
+                problems += [f'text line {idx}: chord durations {line.strip()!r} are not followed by lyrics']
+
+            num_durs += len(song.ChordedLyricSegment._chord_dur_re.findall(line))
+
+    chords = segment['chords'].split()
+    if len(chords) != num_durs:
+        problems += [f'{len(chords)} chord(s) but {num_durs} duration(s) in the text']
+
+    for chord in chords:
+        try:
+            ChordedInstrument.split_chord(chord)
+        except ValueError:
+            problems += [f'invalid chord {chord!r}']
+
+    return problems
+
+def validate_song_file(file_path: str) -> tuple[str, list[str]]:
+    """Check a song file
+
+    The file may be a ``.crd.yaml`` file or a compact file. Besides the
+    checks of :py:func:`validate_segment` on each segment, the file must
+    be readable, have a title and artist, and have a ``lyrics`` list.
+
+    This is a module-level function so that it can be sent to the worker
+    processes of :py:func:`validate_song_files`.
+
+    :param file_path: path where the song file resides
+    :type file_path: str
+
+    :return: ``file_path`` and a description of each problem found, empty
+        if there is none
+    :rtype: tuple[str, list[str]]
+    """
+    try:
+        header, lyrics = song._read_song_file(file_path)
+    except (OSError, UnicodeDecodeError, ValueError, yaml.YAMLError) as e:
+        return file_path, [f'cannot be read: {e}'.splitlines()[0]]
+    except (KeyError, TypeError):
+        return file_path, ['missing \'lyrics\' key']
+
+    problems = []
+    for key in ('title', 'artist'):
+        if header.get(key, '') == '':
+            problems += [f'missing {key!r}']
+
+    if not isinstance(lyrics, list):
+        return file_path, problems + ['\'lyrics\' is not a list']
+
+    for idx, segment in enumerate(lyrics):
+        name = segment.get('tag', '?') if isinstance(segment, dict) else '?'
+        problems += [f'segment {idx} ({name}): {x}' for x in validate_segment(segment)]
+
+    return file_path, problems
+
+def validate_song_files(file_paths: list[str], num_workers: int=None) -> Iterable[tuple[str, list[str]]]:
+    """Check several song files, in parallel if worthwhile
+
+    Results are generated in the same order as ``file_paths``, as soon as
+    they are ready. A process pool is used like in
+    :py:meth:`song.SongCollection.get_songs_from_folder`.
+
+    :param file_paths: paths of the files to check
+    :type file_paths: list[str]
+    :param num_workers: number of worker processes. By default, this is
+        the number of CPUs; 1 checks every file in this process
+    :type num_workers: int
+
+    :return: the result of :py:func:`validate_song_file` for each file
+    :rtype: Iterable[tuple[str, list[str]]]
+    """
+    num_workers = min(num_workers or os.cpu_count() or 1, len(file_paths))
+    num_done = 0
+
+    if num_workers > 1 and len(file_paths) >= song.SongCollection.PARALLEL_MIN_FILES:
+        chunksize = max(1, min(256, len(file_paths) // (num_workers * 4)))
+
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+                for result in executor.map(validate_song_file, file_paths, chunksize=chunksize):
+                    yield result
+                    num_done += 1
+            return
+        except (OSError, NotImplementedError, concurrent.futures.process.BrokenProcessPool):
+            # The pool could not be used or broke midway; the files that
+            # were not reported yet are checked in this process instead
+            pass
+
+    for file_path in file_paths[num_done:]:
+        yield validate_song_file(file_path)
+
+def main(argv: list[str]=None) -> int:
+    parser = argparse.ArgumentParser(description='Check folders of .crd.yaml files for malformed songs.')
+    parser.add_argument('paths', nargs='+', help='song files, or folders containing them')
+    parser.add_argument('-j', '--jobs', type=int, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='only print the files with problems')
+    args = parser.parse_args(argv)
+
+    file_paths = []
+    for path in map(Path, args.paths):
+        if path.is_dir():
+            file_paths += sorted(str(x) for x in path.iterdir() if x.name.endswith((song.YAML_SUFFIX, song.COMPACT_SUFFIX)))
+        else:
+            file_paths += [str(path)]
+
+    num_bad = 0
+    for file_path, problems in validate_song_files(file_paths, args.jobs):
+        if len(problems) > 0:
+            num_bad += 1
+            print(f'{file_path}: {len(problems)} problem(s)')
+            for problem in problems:
+                print(f'    {problem}')
+        elif not args.quiet:
+            print(f'{file_path}: OK')
+
+    print(f'{len(file_paths)} file(s) checked, {num_bad} with problems', file=sys.stderr)
+    return 1 if num_bad > 0 else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
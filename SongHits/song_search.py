@@ -0,0 +1,378 @@
+# Import for type hints
+from collections.abc import Callable, Hashable, Iterable, Sequence
+
+# Built-in modules
+import re
+from collections import Counter
+
+class TrigramIndex:
+    """Represents a trigram inverted index for fuzzy text search
+
+    Each text added to the index is split into words, and each word
+    is split into its trigrams (three-letter substrings, padded with
+    spaces at the word boundaries). The index maps each trigram to the
+    keys of the texts containing it, so a query only needs to look at
+    the texts sharing at least one trigram with it.
+
+    Because misspelled words still share most of their trigrams with
+    the correct spelling, this also finds texts with small typos.
+    """
+    _WORD_RE = re.compile(r'\w+')
+
+    def __init__(self):
+        """Instantiate an object of this class
+
+        This method will instantiate a new, empty :py:class:`TrigramIndex`.
+        """
+        self._postings = {}
+        self._key_trigrams = {}
+
+    @classmethod
+    def trigrams(cls, text: str) -> set[str]:
+        """Get the trigrams of a text
+
+        The text is compared case-insensitively and punctuation is ignored.
+        For example, the trigrams of ``Am I`` are::
+
+            {'  a', ' am', 'am ', '  i', ' i '}
+
+        :param text: the text to split into trigrams
+        :type text: str
+
+        :return: the trigrams of every word in ``text``
+        :rtype: set[str]
+        """
+        text_trigrams = set()
+
+        for word in cls._WORD_RE.findall(text.casefold()):
+            padded = f'  {word} '
+            for idx in range(len(padded) - 2):
+                text_trigrams.add(padded[idx:idx + 3])
+
+        return text_trigrams
+
+    def add(self, key: Hashable, text: str):
+        """Add a text to the index
+
+        If ``key`` is already in the index, its old text is replaced.
+
+        :param key: the key returned by :py:meth:`search` when ``text`` matches
+        :type key: Hashable
+        :param text: the text to index
+        :type text: str
+        """
+        if key in self._key_trigrams:
+            self.remove(key)
+
+        text_trigrams = self.trigrams(text)
+        self._key_trigrams[key] = text_trigrams
+
+        for trigram in text_trigrams:
+            self._postings.setdefault(trigram, set()).add(key)
+
+    def remove(self, key: Hashable):
+        """Remove a text from the index
+
+        Keys not in the index are ignored.
+
+        :param key: the key used when the text was added
+        :type key: Hashable
+        """
+        for trigram in self._key_trigrams.pop(key, ()):
+            postings = self._postings[trigram]
+            postings.discard(key)
+
+            if len(postings) == 0:
+                del self._postings[trigram]
+
+    def search(self, query: str, min_score: float=0.5) -> list[tuple[Hashable, float]]:
+        """Find the texts similar to a query
+
+        The score of a text is the fraction of the trigrams of ``query``
+        found in the text, so a text containing every word of the query
+        has a score of 1.0.
+
+        :param query: the text to look for
+        :type query: str
+        :param min_score: the lowest score of the texts to return
+        :type min_score: float
+
+        :return: a list of (``key``, ``score``) tuples, from the best match
+            to the worst match
+        :rtype: list[tuple[Hashable, float]]
+        """
+        query_trigrams = self.trigrams(query)
+        if len(query_trigrams) == 0:
+            return []
+
+        counts = Counter()
+        for trigram in query_trigrams:
+            counts.update(self._postings.get(trigram, ()))
+
+        results = []
+        for key, count in counts.items():
+            score = count / len(query_trigrams)
+            if score >= min_score:
+                results += [(key, score)]
+
+        results.sort(key=lambda x: -x[1])
+        return results
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether a key is in the index
+
+        :return: whether a text was added with ``key``
+        :rtype: bool
+        """
+        return key in self._key_trigrams
+
+    def __len__(self) -> int:
+        """Get the number of texts in the index
+
+        :return: number of texts in the index
+        :rtype: int
+        """
+        return len(self._key_trigrams)
+
+class PhraseIndex:
+    """Represents a positional inverted index for phrase search
+
+    Texts are added to the index as lines, each with a ``location``
+    describing where the line came from. The index maps each word to
+    the lines containing it, along with the positions of the word in
+    each line, so that a phrase only matches lines where its words
+    appear next to each other and in the same order.
+    """
+    _WORD_RE = re.compile(r'\w+')
+
+    def __init__(self):
+        """Instantiate an object of this class
+
+        This method will instantiate a new, empty :py:class:`PhraseIndex`.
+        """
+        self._postings = {}
+        self._lines = {}
+        self._key_lines = {}
+        self._next_line_id = 0
+
+    @classmethod
+    def tokens(cls, text: str) -> list[str]:
+        """Split a text into the words used by the index
+
+        Words are compared case-insensitively and punctuation is ignored.
+
+        :param text: the text to split
+        :type text: str
+
+        :return: the words of ``text`` in order
+        :rtype: list[str]
+        """
+        return cls._WORD_RE.findall(text.casefold())
+
+    def add(self, key: Hashable, lines: Iterable[tuple[Hashable, str]]):
+        """Add the lines of a text to the index
+
+        If ``key`` is already in the index, its old lines are replaced.
+
+        :param key: the key returned by :py:meth:`search` when a line matches
+        :type key: Hashable
+        :param lines: the (``location``, ``line``) of each line to index
+        :type lines: Iterable[tuple[Hashable, str]]
+        """
+        if key in self._key_lines:
+            self.remove(key)
+
+        line_ids = []
+        key_tokens = set()
+        for location, line in lines:
+            line_id = self._next_line_id
+            self._next_line_id += 1
+
+            self._lines[line_id] = (key, location)
+            line_ids += [line_id]
+
+            for pos, token in enumerate(self.tokens(line)):
+                self._postings.setdefault(token, {}).setdefault(line_id, []).append(pos)
+                key_tokens.add(token)
+
+        self._key_lines[key] = (line_ids, key_tokens)
+
+    def remove(self, key: Hashable):
+        """Remove the lines of a text from the index
+
+        Keys not in the index are ignored.
+
+        :param key: the key used when the lines were added
+        :type key: Hashable
+        """
+        line_ids, key_tokens = self._key_lines.pop(key, ([], set()))
+
+        for line_id in line_ids:
+            del self._lines[line_id]
+
+        for token in key_tokens:
+            postings = self._postings[token]
+
+            for line_id in line_ids:
+                postings.pop(line_id, None)
+
+            if len(postings) == 0:
+                del self._postings[token]
+
+    def search(self, phrase: str) -> list[tuple[Hashable, Hashable]]:
+        """Find the lines containing a phrase
+
+        :param phrase: the words to look for, in order
+        :type phrase: str
+
+        :return: the (``key``, ``location``) of each matching line, in the
+            order in which the lines were added
+        :rtype: list[tuple[Hashable, Hashable]]
+        """
+        phrase_tokens = self.tokens(phrase)
+        if len(phrase_tokens) == 0:
+            return []
+
+        postings = [self._postings.get(x, {}) for x in phrase_tokens]
+
+        # Start from the rarest word to keep the candidate lines few
+        candidates = set(min(postings, key=len))
+        for token_postings in postings:
+            candidates.intersection_update(token_postings)
+
+        results = []
+        for line_id in sorted(candidates):
+            following = [set(x[line_id]) for x in postings[1:]]
+
+            for start in postings[0][line_id]:
+                if all(start + offset in x for offset, x in enumerate(following, start=1)):
+                    results += [self._lines[line_id]]
+                    break
+
+        return results
+
+class SequenceIndex:
+    """Represents an n-gram index for searching runs of tokens in sequences
+
+    Each sequence added to the index is split into its n-grams (runs
+    of ``n`` consecutive tokens). The index maps each n-gram to the
+    sequences containing it, so a query only needs to check the
+    sequences sharing every one of its n-grams. Tokens can be any
+    hashable value; ``None`` tokens never match anything.
+    """
+    def __init__(self, n: int=3):
+        """Instantiate an object of this class
+
+        This method will instantiate a new, empty :py:class:`SequenceIndex`.
+
+        :param n: the number of tokens in each n-gram
+        :type n: int
+        """
+        self.n = n
+        self._postings = {}
+        self._sequences = {}
+
+    def _ngrams(self, sequence: Sequence[Hashable]) -> set[tuple]:
+        """Get the n-grams of a sequence that do not contain ``None``
+
+        :param sequence: the tokens to split into n-grams
+        :type sequence: Sequence[Hashable]
+
+        :return: the n-grams of ``sequence``
+        :rtype: set[tuple]
+        """
+        ngrams = set()
+
+        for idx in range(len(sequence) - self.n + 1):
+            ngram = tuple(sequence[idx:idx + self.n])
+            if None not in ngram:
+                ngrams.add(ngram)
+
+        return ngrams
+
+    def add(self, key: Hashable, sequence: Sequence[Hashable]):
+        """Add a sequence to the index
+
+        If ``key`` is already in the index, its old sequence is replaced.
+
+        :param key: the key returned by :py:meth:`search` when ``sequence`` matches
+        :type key: Hashable
+        :param sequence: the tokens to index
+        :type sequence: Sequence[Hashable]
+        """
+        if key in self._sequences:
+            self.remove(key)
+
+        self._sequences[key] = tuple(sequence)
+
+        for ngram in self._ngrams(sequence):
+            self._postings.setdefault(ngram, set()).add(key)
+
+    def remove(self, key: Hashable):
+        """Remove a sequence from the index
+
+        Keys not in the index are ignored.
+
+        :param key: the key used when the sequence was added
+        :type key: Hashable
+        """
+        sequence = self._sequences.pop(key, None)
+        if sequence is None:
+            return
+
+        for ngram in self._ngrams(sequence):
+            postings = self._postings[ngram]
+            postings.discard(key)
+
+            if len(postings) == 0:
+                del self._postings[ngram]
+
+    def search(self, query: Sequence[Hashable], match_first: Callable[[Hashable, Hashable], bool]=None) -> list[tuple[Hashable, int]]:
+        """Find the sequences containing a run of tokens
+
+        If ``match_first`` is given, the first token of ``query`` is compared
+        with ``match_first(query_token, sequence_token)`` instead of ``==``.
+        This allows the first token to be partially specified.
+
+        :param query: the tokens to look for, in order
+        :type query: Sequence[Hashable]
+        :param match_first: comparison used for the first token of ``query``
+        :type match_first: Callable[[Hashable, Hashable], bool]
+
+        :return: the (``key``, ``start``) of each match, where ``start`` is
+            the index in the sequence where ``query`` begins
+        :rtype: list[tuple[Hashable, int]]
+        """
+        query = tuple(query)
+        if len(query) == 0 or None in query[1:]:
+            return []
+
+        # The n-grams only need to cover the fully-specified tokens
+        exact = query[1:] if match_first is not None else query
+
+        if len(exact) >= self.n:
+            postings = [self._postings.get(x, set()) for x in self._ngrams(exact)]
+            candidates = set(min(postings, key=len))
+            for ngram_postings in postings:
+                candidates.intersection_update(ngram_postings)
+        elif len(exact) > 0:
+            # Short queries are looked up through the (few) distinct n-grams
+            candidates = set()
+            for ngram, ngram_postings in self._postings.items():
+                if any(ngram[x:x + len(exact)] == exact for x in range(self.n - len(exact) + 1)):
+                    candidates.update(ngram_postings)
+        else:
+            candidates = set(self._sequences)
+
+        first_matches = match_first if match_first is not None else (lambda x, y: x == y)
+
+        results = []
+        for key in candidates:
+            sequence = self._sequences[key]
+
+            for start in range(len(sequence) - len(query) + 1):
+                if sequence[start + 1:start + len(query)] == query[1:] and sequence[start] is not None \
+                    and first_matches(query[0], sequence[start]):
+                    results += [(key, start)]
+
+        return results
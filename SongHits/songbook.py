@@ -0,0 +1,40 @@
+# Built-in modules
+import argparse
+import sys
+
+# Local modules
+import song
+
+def write_songbook(song_coll: song.SongCollection, fh):
+    """Write every song in a collection to a text file
+
+    The lines from :py:meth:`song.SongCollection.render_lines` are written
+    as they are generated, so the songbook is never built in memory.
+
+    :param song_coll: the songs to write
+    :type song_coll: :py:class:`song.SongCollection`
+    :param fh: a file opened for writing text
+    :type fh: TextIO
+    """
+    for line in song_coll.render_lines():
+        fh.write(line)
+        fh.write('\n')
+
+def main(argv: list[str]=None):
+    parser = argparse.ArgumentParser(description='Export a folder of .crd.yaml files as a text songbook.')
+    parser.add_argument('song_path', nargs='?', default='./songs', help='folder containing the .crd.yaml files')
+    parser.add_argument('-o', '--output', help='file to write the songbook to (default: stdout)')
+    parser.add_argument('--index', help='SQLite song index to use instead of keeping the songs in memory')
+    parser.add_argument('--archive', help='songbook archive to read the songs from instead of song_path')
+    args = parser.parse_args(argv)
+
+    song_coll = song.SongCollection(args.song_path, index_path=args.index, archive_path=args.archive)
+
+    if args.output is None:
+        write_songbook(song_coll, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            write_songbook(song_coll, fh)
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,47 @@
 from typing import Sequence
 
+import re
+import itertools
+import json
+import os
+import tempfile
+import wave
+from pathlib import Path
+
+# pip downlodeable modules
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class ChordedInstrument:
     """Represents a chorded instrument
 
     This class solely consists of class methods and is meant to be
     inherited by subclasses.
     """
-    # HINT: Erase these errors and populate these class properties
-    #       with the appropriate data:
-    #
-    # A_chroma - list of strings depicting the chroma scale starting at A
-    #            with notes in between written with a sharp (#)
-    # A_chroma_flat - same as A_chroma except that notes in between are
-    #                 flats (b)
-    # chord_maps - dict with key being the chord quality (e.g. m, M, 7)
-    #              and value a list of integers depicting the integer
-    #              notation for that chord
-    A_chroma = NotImplementedError('Stub code!')
-    A_chroma_flat = NotImplementedError('Stub code!')
-    chord_maps = NotImplementedError('Stub code!')
+    A_chroma = ['A', 'A#', 'B', 'C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#']
+    A_chroma_flat = ['A', 'Bb', 'B', 'C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab']
+    chord_maps = {
+        '': [0, 4, 7],
+        'M': [0, 4, 7],
+        'Maj': [0, 4, 7],
+        'm': [0, 3, 7],
+        'min': [0, 3, 7],
+        '7': [0, 4, 7, 10],
+        'M7': [0, 4, 7, 11],
+        'Maj7': [0, 4, 7, 11],
+        'm7': [0, 3, 7, 10],
+        'min7': [0, 3, 7, 10],
+        'sus': [0, 5, 7],
+        'sus4': [0, 5, 7],
+        'sus2': [0, 2, 7],
+        'dim': [0, 3, 6],
+        'aug': [0, 4, 8],
+        '+': [0, 4, 8],
+    }
+
+    _note_re = re.compile(r'([A-G])([#b]?)')
 
     @classmethod
     def split_chord(cls, chord: str) -> tuple[str, str, str]:
@@ -50,7 +73,12 @@ class ChordedInstrument:
 
         :classmethod:
         """
-        raise NotImplementedError('Stub code!')
+        match = cls._note_re.match(chord)
+
+        if match is None or chord[match.end():] not in cls.chord_maps:
+            raise ValueError(f'Invalid chord: {chord!r}')
+
+        return match.group(1), match.group(2), chord[match.end():]
 
     @classmethod
     def supported_chords(cls) -> list[str]:
@@ -64,7 +92,32 @@ class ChordedInstrument:
 
         :classmethod:
         """
-        raise NotImplementedError('Stub code!')
+        return list(cls.chord_maps.keys())
+
+    @classmethod
+    def get_note_index(cls, note: str) -> int:
+        """Get the position of a note in the chromatic scale starting at A
+
+        For example, ``C`` and ``B#`` are both at index 3 while ``Ab``
+        and ``G#`` are both at index 11.
+
+        :param note: the note, with an optional sharp (#) or flat (b)
+        :type note: str
+
+        :return: the index of the note in :py:attr:`A_chroma`, from 0 to 11
+        :rtyp: int
+
+        :raise: ValueError when the note is of an invalid format
+
+        :classmethod:
+        """
+        match = cls._note_re.fullmatch(note)
+
+        if match is None:
+            raise ValueError(f'Invalid note: {note!r}')
+
+        offset = {'': 0, '#': 1, 'b': -1}[match.group(2)]
+        return (cls.A_chroma.index(match.group(1)) + offset) % 12
 
     @classmethod
     def transpose_chord(cls, chord: str, semitones: int) -> str:
@@ -90,7 +143,13 @@ class ChordedInstrument:
 
         :classmethod:
         """
-        raise NotImplementedError('Stub code!')
+        root, accidental, chord_type = cls.split_chord(chord)
+        note_idx = (cls.get_note_index(root + accidental) + semitones) % 12
+
+        if accidental == 'b':
+            return cls.A_chroma_flat[note_idx] + chord_type
+
+        return cls.A_chroma[note_idx] + chord_type
 
     @classmethod
     def gen_chroma_scale(cls, base_note: str='A') -> list[str]:
@@ -127,7 +186,13 @@ class ChordedInstrument:
 
         :classmethod:
         """
-        raise NotImplementedError('Stub code!')
+        if cls._note_re.fullmatch(base_note) is None:
+            return []
+
+        chroma = cls.A_chroma_flat if base_note.endswith('b') else cls.A_chroma
+        note_idx = cls.get_note_index(base_note)
+
+        return chroma[note_idx:] + chroma[:note_idx]
 
     @classmethod
     def get_notes_from_intervals(cls, base_note: str, intervals: Sequence[int]) -> tuple[str]:
@@ -152,7 +217,8 @@ class ChordedInstrument:
 
         :classmethod:
         """
-        raise NotImplementedError('Stub code!')
+        chroma_scale = cls.gen_chroma_scale(base_note)
+        return tuple(chroma_scale[x % 12] for x in intervals)
 
     @classmethod
     def get_chord_notes(cls, chord: str) -> tuple[str]:
@@ -172,7 +238,147 @@ class ChordedInstrument:
 
         :classmethod:
         """
-        raise NotImplementedError('Stub code!')
+        root, accidental, chord_type = cls.split_chord(chord)
+        return cls.get_notes_from_intervals(root + accidental, cls.chord_maps[chord_type])
+
+
+class ChordTable:
+    """Represents the process-wide table of interned chords
+
+    Every chord name seen by the program is given a dense integer id
+    the first time it is interned. The result of
+    :py:meth:`ChordedInstrument.split_chord` is computed once and stored
+    with it, so that caches (e.g. of fingerings) can be keyed by small
+    integers instead of parsing the same chord names over and over.
+
+    This class solely consists of class methods.
+    """
+    _names = []
+    _ids = {}
+    _splits = []
+    _transpositions = []
+
+    @classmethod
+    def intern(cls, chord: str) -> int:
+        """Get the id of a chord, adding it to the table if needed
+
+        Invalid chords are also given an id, but have no split chord.
+
+        :param chord: the chord name
+        :type chord: str
+
+        :return: the id of ``chord``
+        :rtyp: int
+
+        :classmethod:
+        """
+        chord_id = cls._ids.get(chord)
+
+        if chord_id is None:
+            try:
+                split_chord = ChordedInstrument.split_chord(chord)
+            except ValueError:
+                split_chord = None
+
+            chord_id = len(cls._names)
+            cls._names.append(chord)
+            cls._splits.append(split_chord)
+            cls._transpositions.append(None)
+            cls._ids[chord] = chord_id
+
+        return chord_id
+
+    @classmethod
+    def lookup(cls, chord: str) -> int:
+        """Get the id of a chord without adding it to the table
+
+        :param chord: the chord name
+        :type chord: str
+
+        :return: the id of ``chord``, or ``None`` if it was never interned
+        :rtyp: int
+
+        :classmethod:
+        """
+        return cls._ids.get(chord)
+
+    @classmethod
+    def name(cls, chord_id: int) -> str:
+        """Get the name of an interned chord
+
+        :param chord_id: the id returned by :py:meth:`intern`
+        :type chord_id: int
+
+        :return: the chord name
+        :rtyp: str
+
+        :classmethod:
+        """
+        return cls._names[chord_id]
+
+    @classmethod
+    def split(cls, chord_id: int) -> tuple[str, str, str]:
+        """Get the root note, accidental, and chord type of an interned chord
+
+        :param chord_id: the id returned by :py:meth:`intern`
+        :type chord_id: int
+
+        :return: the split chord, see :py:meth:`ChordedInstrument.split_chord`
+        :rtyp: tuple[str, str, str]
+
+        :raise: ValueError when the chord is invalid
+
+        :classmethod:
+        """
+        split_chord = cls._splits[chord_id]
+
+        if split_chord is None:
+            raise ValueError(f'Invalid chord: {cls._names[chord_id]!r}')
+
+        return split_chord
+
+    @classmethod
+    def transpose(cls, chord_id: int, semitones: int) -> int:
+        """Get the id of an interned chord transposed to some amount of semitones
+
+        The ids of the chord transposed to each of the 12 semitones are
+        computed with :py:meth:`ChordedInstrument.transpose_chord` the first
+        time the chord is transposed, so later calls are a table lookup.
+        Invalid chords are left as they are.
+
+        :param chord_id: the id returned by :py:meth:`intern`
+        :type chord_id: int
+        :param semitones: the number of semitones to transpose the chord to
+        :type semitones: int
+
+        :return: the id of the transposed chord
+        :rtyp: int
+
+        :classmethod:
+        """
+        transposition = cls._transpositions[chord_id]
+
+        if transposition is None:
+            if cls._splits[chord_id] is None:
+                transposition = (chord_id,) * 12
+            else:
+                chord = cls._names[chord_id]
+                transposition = tuple(cls.intern(ChordedInstrument.transpose_chord(chord, x)) for x in range(12))
+
+            cls._transpositions[chord_id] = transposition
+
+        return transposition[semitones % 12]
+
+    @classmethod
+    def size(cls) -> int:
+        """Get the number of interned chords
+
+        :return: the number of interned chords
+        :rtyp: int
+
+        :classmethod:
+        """
+        return len(cls._names)
 
 
 class Ukulele(ChordedInstrument):
@@ -181,7 +387,18 @@ class Ukulele(ChordedInstrument):
     An ukulele is a :py:class:`ChordedInstrument` where we can extract
     the fingerings of a specific chord. We are also able to play a sound
     using this class.
+
+    The fingerings found are shared by every :py:class:`Ukulele` with the
+    same tuning, octaves, and number of frets. The fingerings of every
+    supported chord can be loaded at once from a cache file with
+    :py:meth:`load_fingering_table`, so that looking them up never needs
+    a search.
     """
+    FINGERING_CACHE_NAME = 'fingerings.json'
+    FINGERING_CACHE_VERSION = 1
+
+    # Fingerings keyed by chord id, for each (tuning, octaves, num_frets)
+    _fingering_tables = {}
     def __init__(self, tuning: Sequence[str]=['G', 'C', 'E', 'A'], octaves: Sequence[int]=[4, 4, 4, 4], num_frets: int=20):
         """Instantiate an object of this class
 
@@ -203,7 +420,23 @@ class Ukulele(ChordedInstrument):
         :param num_frets: number of frets in the ukulele
         :type num_frets: int
         """
-        raise NotImplementedError('Stub code!')
+        if len(tuning) != len(octaves):
+            raise ValueError('tuning and octaves should have the same number of elements')
+
+        self.tuning = list(tuning)
+        self.octaves = list(octaves)
+        self.num_frets = num_frets
+
+        self._fingerings = self._fingering_tables.setdefault(self.fingering_table_key(), {})
+        self._sounds = {}
+
+    def fingering_table_key(self) -> tuple[tuple[str], tuple[int], int]:
+        """Get the key of the fingering table of this :py:class:`Ukulele`
+
+        :return: the tuning, octaves, and number of frets
+        :rtyp: tuple[tuple[str], tuple[int], int]
+        """
+        return tuple(self.tuning), tuple(self.octaves), self.num_frets
 
     def gen_fret_notes(self) -> dict[str, list[str]]:
         """Generate a chromatic scale for each string in the :py:class:`Ukulele`
@@ -216,7 +449,13 @@ class Ukulele(ChordedInstrument):
             value of the dictionary should be equal to the number of frets
         :rtyp: dict[str, list[str]]
         """
-        raise NotImplementedError('Stub code!')
+        fret_notes = {}
+
+        for string_note in self.tuning:
+            chroma_scale = self.gen_chroma_scale(string_note)
+            fret_notes[string_note] = [chroma_scale[x % 12] for x in range(self.num_frets)]
+
+        return fret_notes
 
     def get_note_idxs_on_fret(self, notes: list[str]) -> dict[str, list[int]]:
         """Get the strings and frets where certain notes are located
@@ -242,7 +481,14 @@ class Ukulele(ChordedInstrument):
             Its values correspond to which frets a note in ``notes`` are located.
         :rtyp: dict[str, list[int]]
         """
-        raise NotImplementedError('Stub code!')
+        note_idxs = {self.get_note_index(x) for x in notes}
+        fret_idxs = {}
+
+        for string_note in self.tuning:
+            string_idx = self.get_note_index(string_note)
+            fret_idxs[string_note] = [x for x in range(self.num_frets) if (string_idx + x) % 12 in note_idxs]
+
+        return fret_idxs
 
     def get_chord_fingerings(self, chord_name: str) -> list[list[int]]:
         """Get the possible chord fingerings for a chord
@@ -275,11 +521,281 @@ class Ukulele(ChordedInstrument):
         :return: a list of the possible fingerings for the chord
         :rtyp: list[list[int]]
         """
-        raise NotImplementedError('Stub code!')
+        chord_id = ChordTable.lookup(chord_name)
+
+        # Only valid chords are interned, so typed names do not grow the table
+        if chord_id is None:
+            self.split_chord(chord_name)
+            chord_id = ChordTable.intern(chord_name)
+
+        if chord_id not in self._fingerings:
+            self._fingerings[chord_id] = self._find_fingerings(chord_id)
+
+        return [list(x) for x in self._fingerings[chord_id]]
+
+    def _find_fingerings(self, chord_id: int) -> list[tuple[int]]:
+        """Search for the fingerings of an interned chord
+
+        See :py:meth:`get_chord_fingerings` for the properties of the fingerings.
+        Fingerings are sorted by their highest fret, so the easiest ones come first.
+
+        If NumPy is installed, every candidate fingering is checked at once
+        with :py:meth:`_find_fingerings_np`. Otherwise, they are checked
+        one by one.
+
+        :param chord_id: the id of the chord in the :py:class:`ChordTable`
+        :type chord_id: int
+
+        :return: the possible fingerings for the chord
+        :rtyp: list[tuple[int]]
+        """
+        root, accidental, chord_type = ChordTable.split(chord_id)
+        chord_notes = self.get_notes_from_intervals(root + accidental, self.chord_maps[chord_type])
+
+        if np is not None:
+            return self._find_fingerings_np(chord_notes)
+
+        chord_idxs = {self.get_note_index(x) for x in chord_notes}
+
+        fret_idxs = self.get_note_idxs_on_fret(chord_notes)
+        string_idxs = [self.get_note_index(x) for x in self.tuning]
+
+        fingerings = []
+        for fingering in itertools.product(*[fret_idxs[x] for x in self.tuning]):
+            # Every note of the chord should be played
+            if {(x + y) % 12 for x, y in zip(string_idxs, fingering)} != chord_idxs:
+                continue
+
+            fretted = [x for x in fingering if x != 0]
+            if len(fretted) > 0:
+                mean_fret = sum(fretted) / len(fretted)
+
+                if min(fretted) > 7 or max(fretted) - min(fretted) > 4:
+                    continue
+
+                if any(abs(x - mean_fret) > 3 for x in fretted):
+                    continue
+
+            fingerings += [fingering]
+
+        fingerings.sort(key=lambda x: (max(x), x))
+        return fingerings
+
+    def _find_fingerings_np(self, chord_notes: Sequence[str]) -> list[tuple[int]]:
+        """Search for the fingerings of a chord with NumPy
+
+        The candidate fingerings are the cartesian product of the frets of
+        each string from :py:meth:`get_note_idxs_on_fret`, as rows of an
+        array. The properties in :py:meth:`get_chord_fingerings` are then
+        checked on every row at once with boolean masks.
+
+        :param chord_notes: the notes of the chord
+        :type chord_notes: list[str] or tuple[str]
+
+        :return: the possible fingerings for the chord, sorted like in
+            :py:meth:`_find_fingerings`
+        :rtyp: list[tuple[int]]
+        """
+        fret_idxs = self.get_note_idxs_on_fret(chord_notes)
+        string_idxs = np.array([self.get_note_index(x) for x in self.tuning])
+        chord_idxs = np.array(sorted({self.get_note_index(x) for x in chord_notes}))
+
+        # One row per candidate, in the same order as itertools.product
+        grids = np.meshgrid(*[np.array(fret_idxs[x], dtype=np.int64) for x in self.tuning], indexing='ij')
+        frets = np.stack(grids, axis=-1).reshape(-1, len(self.tuning))
+
+        # Every note of the chord should be played. The other notes
+        # cannot be played since only frets of chord notes are candidates
+        played = (string_idxs + frets) % 12
+        mask = (played[:, :, np.newaxis] == chord_idxs).any(axis=1).all(axis=1)
+
+        # Open strings do not count for the position of the fingers
+        fretted = frets != 0
+        num_fretted = fretted.sum(axis=1)
+        min_fret = np.where(fretted, frets, self.num_frets).min(axis=1)
+        max_fret = np.where(fretted, frets, 0).max(axis=1)
+        mean_fret = np.where(fretted, frets, 0).sum(axis=1) / np.maximum(num_fretted, 1)
+        near_mean = (~fretted | (np.abs(frets - mean_fret[:, np.newaxis]) <= 3)).all(axis=1)
+
+        mask &= (num_fretted == 0) | ((min_fret <= 7) & (max_fret - min_fret <= 4) & near_mean)
+        frets = frets[mask]
+
+        # Sort by the highest fret, then by the frets of each string
+        order = np.lexsort([frets[:, x] for x in reversed(range(frets.shape[1]))] + [frets.max(axis=1, initial=0)])
+        return [tuple(x) for x in frets[order].tolist()]
+
+    def gen_fingering_table(self) -> dict[str, list[tuple[int]]]:
+        """Generate the fingerings of every supported chord
+
+        The chords are every root note in :py:attr:`A_chroma` with every
+        chord type in :py:attr:`chord_maps`.
+
+        :return: a dictionary with the chord names as keys and the result of
+            :py:meth:`get_chord_fingerings` as values
+        :rtyp: dict[str, list[tuple[int]]]
+        """
+        table = {}
+
+        for root in self.A_chroma:
+            for chord_type in self.chord_maps:
+                chord_id = ChordTable.intern(root + chord_type)
+
+                if chord_id not in self._fingerings:
+                    self._fingerings[chord_id] = self._find_fingerings(chord_id)
+
+                table[root + chord_type] = self._fingerings[chord_id]
+
+        return table
+
+    def load_fingering_table(self, cache_path: str|Path=None, use_cache: bool=True):
+        """Load the fingerings of every supported chord
+
+        The table is read from the cache file if it has a valid one for this
+        tuning, octaves, and number of frets. Otherwise, it is generated with
+        :py:meth:`gen_fingering_table` and saved to the cache file. Chords
+        with a flat root (e.g. ``Bb``) share the fingerings of their sharp
+        counterpart.
+
+        :param cache_path: file where the tables are cached. By default,
+            this is :py:attr:`FINGERING_CACHE_NAME` inside :py:func:`song.user_cache_dir`
+        :type cache_path: str or Path
+        :param use_cache: whether to read and write the cache file
+        :type use_cache: bool
+        """
+        if cache_path is None:
+            # Imported here since song imports this module
+            import song
+            cache_path = song.user_cache_dir() / self.FINGERING_CACHE_NAME
+
+        cache_path = Path(cache_path)
+        key = json.dumps(self.fingering_table_key())
+
+        tables = self._load_fingering_cache(cache_path) if use_cache else {}
+        table = self._check_fingering_table(tables.get(key))
+
+        if table is None:
+            table = self.gen_fingering_table()
+
+            if use_cache:
+                tables[key] = {x: [list(y) for y in z] for x, z in table.items()}
+                self._save_fingering_cache(cache_path, tables)
+
+        for chord_name, fingerings in table.items():
+            self._fingerings[ChordTable.intern(chord_name)] = fingerings
+
+            root, accidental, chord_type = self.split_chord(chord_name)
+            flat_root = self.A_chroma_flat[self.get_note_index(root + accidental)]
+            self._fingerings[ChordTable.intern(flat_root + chord_type)] = fingerings
+
+    def _check_fingering_table(self, table: object) -> dict[str, list[tuple[int]]]:
+        """Check a fingering table read from a cache file
+
+        Every key should be a valid chord and every fingering should have
+        a fret within :py:attr:`num_frets` for each string.
+
+        :param table: the table, as read from the cache file
+        :type table: object
+
+        :return: the table with each fingering as a tuple, or ``None`` if the
+            table is missing or malformed
+        :rtyp: dict[str, list[tuple[int]]]
+        """
+        if not isinstance(table, dict):
+            return None
+
+        checked = {}
+
+        try:
+            for chord_name, fingerings in table.items():
+                self.split_chord(chord_name)
+                checked[chord_name] = [tuple(x) for x in fingerings]
+
+                for fingering in checked[chord_name]:
+                    if len(fingering) != len(self.tuning) or not all(type(x) is int and 0 <= x < self.num_frets for x in fingering):
+                        return None
+        except (ValueError, TypeError, AttributeError):
+            return None
+
+        return checked
+
+    def _load_fingering_cache(self, cache_path: Path) -> dict:
+        """Read a fingering cache file
+
+        :param cache_path: the cache file
+        :type cache_path: Path
+
+        :return: a dictionary with the JSON of :py:meth:`fingering_table_key`
+            as keys and fingering tables as values. An empty dictionary is
+            returned if the cache is missing, unreadable, or of a different
+            version. The tables are checked by :py:meth:`_check_fingering_table`.
+        :rtyp: dict
+        """
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as fh:
+                cache = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(cache, dict) or cache.get('version') != self.FINGERING_CACHE_VERSION or not isinstance(cache.get('tables'), dict):
+            return {}
+
+        return cache['tables']
+
+    def _save_fingering_cache(self, cache_path: Path, tables: dict):
+        """Write a fingering cache file
+
+        The cache is written to a new temporary file in the same folder
+        first and then moved in place, so that a partially-written cache is
+        never read and the temporary file cannot be created beforehand by
+        someone else.
+
+        :param cache_path: the cache file
+        :type cache_path: Path
+        :param tables: the fingering tables, see :py:meth:`_load_fingering_cache`
+        :type tables: dict
+        """
+        tmp_path = None
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=cache_path.name + '.', suffix='.tmp', dir=cache_path.parent)
+
+            with open(fd, 'w', encoding='utf-8') as fh:
+                json.dump({'version': self.FINGERING_CACHE_VERSION, 'tables': tables}, fh, separators=(',', ':'))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_fingering_notes(self, fingering: list[int]) -> tuple[list[str], list[int]]:
+        """Get the notes sounded by each string for a chord fingering
+
+        The octave of a note goes up after each B, so the open C string of
+        a standard ukulele is C4 while its fourth fret is E4.
+
+        :param fingering: the fingering of the chord on a :py:class:`Ukulele`
+        :type fingering: list[int]
+
+        :return: the note and the corresponding octave of each string
+        :rtyp: tuple[list[str], list[int]]
+        """
+        notes = []
+        octaves = []
+
+        for string_note, string_octave, fret in zip(self.tuning, self.octaves, fingering):
+            note_idx = self.get_note_index(string_note)
+            notes += [self.A_chroma[(note_idx + fret) % 12]]
+            octaves += [string_octave + ((note_idx - 3) % 12 + fret) // 12]
+
+        return notes, octaves
 
     def play_fingering(self, fingering: list[int], chord_name: str=None):
         """Play a strumming sound corresponding to a chord fingering
 
+        The sound of each fingering is generated once with the Simple SoX
+        Wrapper and played without waiting for it to finish. If the wrapper
+        or ``simpleaudio`` is not installed, nothing is played.
+
         :param fingering: the fingering of the chord on a :py:class:`Ukulele`
         :type fingering: list[int]
         :param chord_name: the name of the chord to play
@@ -290,12 +806,33 @@ class Ukulele(ChordedInstrument):
             base/root note of the chord.
         :rtyp: list[str]
         """
-        # HINT: Use the provided Simple SoX Wrapper library and
-        #       simpleaudio (from pip) to implement this function
-        # HINT: You can import modules inside this function itself, but
-        #       do not forget to catch ``ImportError``s in case you
-        #       did not install the wrapper
-        raise NotImplementedError('Stub code!')
+        notes, octaves = self.get_fingering_notes(fingering)
+
+        try:
+            from sox import sox
+            import simpleaudio
+        except ImportError:
+            sox = None
+
+        if sox is not None:
+            key = tuple(fingering)
+
+            if key not in self._sounds:
+                out_file_path = Path(tempfile.gettempdir()) / f'songhits_{"_".join(x + str(y) for x, y in zip(notes, octaves))}.wavpcm'
+
+                try:
+                    self._sounds[key] = simpleaudio.WaveObject.from_wave_file(str(sox.gen_chord_sample(notes, octaves, out_file_path)))
+                except (OSError, NotImplementedError, wave.Error):
+                    # SoX is not supported or could not write the sound
+                    self._sounds[key] = None
+
+            if self._sounds[key] is not None:
+                self._sounds[key].play()
+
+        if chord_name is not None:
+            return list(self.get_chord_notes(chord_name))
+
+        return notes
 
 
 class UkulelePrinter:
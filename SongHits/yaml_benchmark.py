@@ -0,0 +1,41 @@
+# Built-in modules
+import argparse
+import timeit
+from pathlib import Path
+
+# Local modules
+import song
+
+CHORD_FILES = Path(__file__).resolve().parent.parent / 'ChordFiles'
+
+def load_all(file_paths: list[Path]):
+    """Parse every file with the current YAML backend
+
+    :param file_paths: the ``.crd.yaml`` files to parse
+    :type file_paths: list[Path]
+    """
+    for file_path in file_paths:
+        with open(file_path, 'r', encoding='utf-8') as fh:
+            song.load_yaml(fh)
+
+def main(argv: list[str]=None):
+    parser = argparse.ArgumentParser(description='Time loading .crd.yaml files with each available YAML backend.')
+    parser.add_argument('song_path', nargs='?', default=CHORD_FILES, help='folder containing the .crd.yaml files')
+    parser.add_argument('-n', '--number', type=int, default=20, help='number of times to load every file')
+    args = parser.parse_args(argv)
+
+    file_paths = sorted(Path(args.song_path).glob('*.crd.yaml'))
+    old_backend = song.yaml_backend()
+
+    print(f'{len(file_paths)} file(s), loaded {args.number} time(s) each (default backend: {old_backend})')
+
+    try:
+        for backend in song.YAML_LOADERS:
+            song.set_yaml_backend(backend)
+            best = min(timeit.repeat(lambda: load_all(file_paths), number=args.number, repeat=3))
+            print(f'{backend:>8}: {best * 1000 / args.number:8.2f} ms per pass')
+    finally:
+        song.set_yaml_backend(old_backend)
+
+if __name__ == '__main__':
+    main()
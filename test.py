@@ -380,7 +380,7 @@ file_path = './ChordFiles/everytime_we_touch.crd.yaml'
 
 if os.path.isfile(file_path):
     with open(file_path, 'r') as fh:
-        song_dict = yaml.safe_load(fh)
+        song_dict = yaml.load(fh, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
 
 w = Song('sample0', 'sample1', file_path)
 w._load_lyrics(song_dict['lyrics'])